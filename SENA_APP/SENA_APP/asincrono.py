@@ -0,0 +1,44 @@
+"""
+Consultas concurrentes para vistas asíncronas.
+
+Los métodos asíncronos del ORM (`aget`, `acount`, `async for`...) envuelven la
+versión síncrona con `sync_to_async(thread_sensitive=True)`: todas las
+llamadas de una petición pasan por el mismo hilo y la misma conexión, así que
+un `asyncio.gather` sobre ellas se ejecuta en serie. `en_paralelo` corre cada
+función en un hilo del pool del bucle de eventos, cada uno con su propia
+conexión, de modo que consultas independientes esperan a la base de datos al
+mismo tiempo.
+
+Cada función debe evaluar por completo sus querysets (`list()`, `count()`,
+`first()`...) y no debe depender de una transacción abierta por quien llama:
+corre en otra conexión. Por eso las pruebas con `TestCase`, cuya transacción
+no ven las demás conexiones, deben usar CONSULTAS_EN_PARALELO = False; así las
+funciones se ejecutan una tras otra en el hilo de la petición.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+
+def _con_conexion_propia(funcion):
+    def ejecutar():
+        # Igual que al empezar y terminar una petición: descartar conexiones
+        # caducadas (CONN_MAX_AGE) o con errores del hilo del pool
+        close_old_connections()
+        try:
+            return funcion()
+        finally:
+            close_old_connections()
+    return ejecutar
+
+
+async def en_paralelo(*funciones):
+    """Ejecuta las funciones (sin argumentos) a la vez y devuelve sus resultados en orden."""
+    if not settings.CONSULTAS_EN_PARALELO:
+        return [await sync_to_async(funcion)() for funcion in funciones]
+    return await asyncio.gather(*(
+        sync_to_async(_con_conexion_propia(funcion), thread_sensitive=False)()
+        for funcion in funciones
+    ))
@@ -0,0 +1,63 @@
+"""
+Peticiones condicionales (ETag / Last-Modified) para las páginas de detalle.
+
+Cada vista de detalle declara una función que, con una sola consulta barata,
+devuelve la marca de actualización más reciente de lo que muestra la página
+(ver `fecha_actualizacion` y las señales de `aprendices.signals`). Si el
+cliente ya tiene esa versión se responde 304 sin ejecutar la vista ni
+renderizar la plantilla.
+
+Con vistas asíncronas la marca se calcula con `sync_to_async` antes de entrar
+a `condition`, que llama a sus funciones sin esperar.
+"""
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+
+def detalle_condicional(marca):
+    """
+    Decorador para vistas de detalle. `marca(**kwargs)` recibe los argumentos
+    de la URL y devuelve un datetime, o None si el objeto no existe (en cuyo
+    caso la vista se ejecuta normalmente y responde 404).
+    """
+    def decorador(vista):
+        def ultima_modificacion(request, *args, **kwargs):
+            if not hasattr(request, 'marca_actualizacion'):
+                request.marca_actualizacion = marca(**kwargs)
+            return request.marca_actualizacion
+
+        def etag(request, *args, **kwargs):
+            valor = ultima_modificacion(request, *args, **kwargs)
+            if valor is None:
+                return None
+            # La versión de plantillas invalida las copias tras un despliegue, y
+            # la fecha del día cubre lo que las plantillas calculan con {% now %}
+            hoy = timezone.localdate().isoformat()
+            return f'{vista.__name__}-{settings.VERSION_PLANTILLAS}-{hoy}-{valor.timestamp():.6f}'
+
+        def revalidar(response):
+            if response.status_code in (200, 304):
+                # Los navegadores y el proxy pueden guardar la página pero deben revalidarla
+                patch_cache_control(response, no_cache=True, public=True)
+            return response
+
+        vista_condicional = condition(etag_func=etag, last_modified_func=ultima_modificacion)(vista)
+
+        if iscoroutinefunction(vista):
+            @wraps(vista)
+            async def envoltura(request, *args, **kwargs):
+                if not hasattr(request, 'marca_actualizacion'):
+                    request.marca_actualizacion = await sync_to_async(marca)(**kwargs)
+                return revalidar(await vista_condicional(request, *args, **kwargs))
+            return envoltura
+
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            return revalidar(vista_condicional(request, *args, **kwargs))
+        return envoltura
+    return decorador
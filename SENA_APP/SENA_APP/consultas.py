@@ -0,0 +1,143 @@
+"""
+Instrumentación de consultas SQL por petición.
+
+`PresupuestoConsultasMiddleware` registra cada consulta que ejecuta una vista,
+agrupa las que tienen la misma forma (mismo SQL salvo parámetros) para
+detectar patrones N+1 y compara el total con el presupuesto configurado para
+el nombre de la URL en PRESUPUESTO_CONSULTAS.
+
+Los registros activos se guardan en una variable de contexto y cada conexión
+los consulta desde su propio envoltorio (`instrumentar`), de modo que se
+cuentan también las consultas que una vista asíncrona o `en_paralelo`
+(ver SENA_APP/asincrono.py) ejecutan en otros hilos: asgiref copia el
+contexto al hilo que atiende cada llamada.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+
+class PresupuestoConsultasExcedido(Exception):
+    pass
+
+
+def forma_consulta(sql):
+    """Normaliza el SQL para que consultas que solo difieren en parámetros coincidan."""
+    forma = re.sub(r'\bIN \((?:%s, )*%s\)', 'IN (...)', sql)
+    forma = re.sub(r"'(?:[^']|'')*'", '?', forma)
+    forma = re.sub(r'\b\d+\b', '?', forma)
+    return re.sub(r'\s+', ' ', forma).strip()
+
+
+class RegistroConsultas:
+    """Envoltorio para `connection.execute_wrapper` que guarda cada consulta."""
+
+    def __init__(self):
+        self.consultas = []
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.consultas.append({
+                'sql': sql,
+                'duracion': time.perf_counter() - inicio,
+            })
+
+    def __len__(self):
+        return len(self.consultas)
+
+    @property
+    def tiempo_total(self):
+        return sum(consulta['duracion'] for consulta in self.consultas)
+
+    def repetidas(self, umbral=None):
+        """Formas de consulta que se ejecutaron al menos `umbral` veces."""
+        umbral = umbral or settings.UMBRAL_CONSULTAS_REPETIDAS
+        conteo = Counter(forma_consulta(consulta['sql']) for consulta in self.consultas)
+        return {forma: veces for forma, veces in conteo.items() if veces >= umbral}
+
+
+_registros_activos = ContextVar('registros_consultas', default=())
+
+
+def _registrar(execute, sql, params, many, context):
+    for registro in _registros_activos.get():
+        execute = partial(registro, execute)
+    return execute(sql, params, many, context)
+
+
+@receiver(connection_created)
+def instrumentar(sender, connection, **kwargs):
+    if _registrar not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_registrar)
+
+
+@contextmanager
+def registrando(registro):
+    """Cuenta en `registro` las consultas del contexto actual, en cualquier hilo o conexión."""
+    # Las conexiones de este hilo abiertas antes de importar el módulo no emitieron la señal
+    for conexion in connections.all(initialized_only=True):
+        instrumentar(None, conexion)
+    token = _registros_activos.set(_registros_activos.get() + (registro,))
+    try:
+        yield registro
+    finally:
+        _registros_activos.reset(token)
+
+
+def presupuesto_para(nombre_url):
+    return settings.PRESUPUESTO_CONSULTAS.get(nombre_url, settings.PRESUPUESTO_CONSULTAS_DEFECTO)
+
+
+class PresupuestoConsultasMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with registrando(RegistroConsultas()) as registro:
+            response = self.get_response(request)
+        return self.terminar(request, registro, response)
+
+    async def __acall__(self, request):
+        with registrando(RegistroConsultas()) as registro:
+            response = await self.get_response(request)
+        return self.terminar(request, registro, response)
+
+    def terminar(self, request, registro, response):
+        request.consultas = registro
+        if request.resolver_match is not None:
+            self.revisar(request.resolver_match.view_name, registro)
+        return response
+
+    def revisar(self, nombre_url, registro):
+        for forma, veces in registro.repetidas().items():
+            logger.warning("Posible N+1 en %s: %d consultas con la forma %s", nombre_url, veces, forma)
+
+        presupuesto = presupuesto_para(nombre_url)
+        if presupuesto is None or len(registro) <= presupuesto:
+            return
+        mensaje = f"{nombre_url} ejecutó {len(registro)} consultas (presupuesto: {presupuesto})"
+        if settings.PRESUPUESTO_CONSULTAS_ESTRICTO:
+            raise PresupuestoConsultasExcedido(mensaje)
+        logger.warning(mensaje)
@@ -0,0 +1,20 @@
+"""
+Columnas derivadas que los modelos calculan en save() a partir de otros
+campos: los extractos de textos largos (SENA_APP/extractos.py) y las claves
+de búsqueda normalizadas (busqueda/claves.py).
+
+Cada modelo declara sus derivados como un diccionario
+`{campo derivado: campos de los que se calcula}`, por ejemplo
+`{'clave_nombre': ('nombre', 'apellido')}`. Con él, `campos_a_guardar`
+completa los `update_fields` de save(). Las migraciones de datos que
+llenaron estas columnas tienen su propia copia del cálculo.
+"""
+
+
+def campos_a_guardar(update_fields, derivados):
+    """`update_fields` de save() más los derivados de los campos que se guardan."""
+    if update_fields is None:
+        return None
+    guardados = set(update_fields)
+    return guardados | {destino for destino, origenes in derivados.items() if guardados & set(origenes)}
+
@@ -0,0 +1,23 @@
+"""
+Extractos guardados de los textos largos.
+
+Los listados solo muestran el comienzo de un TextField. Guardarlo en una
+columna corta cuando se guarda el objeto permite que el listado no lea el
+texto completo de cada fila (ver CAMPOS_LISTA en programas y proyectos).
+
+El extracto es lo que produce `truncatechars:LONGITUD_EXTRACTO`, así que
+aplicarle un truncatechars menor da el mismo resultado que aplicarlo al
+texto original.
+
+`bulk_create` y `update()` no pasan por `save()`: quien los use con el
+texto debe calcular también el extracto. El extracto es un campo derivado
+(ver SENA_APP/derivados.py).
+"""
+from django.utils.text import Truncator
+
+LONGITUD_EXTRACTO = 200
+
+
+def extracto(texto):
+    return Truncator(texto or '').chars(LONGITUD_EXTRACTO)
+
@@ -0,0 +1,72 @@
+"""
+Caché de fragmentos por fila para los listados grandes.
+
+Cada fila de una tabla se guarda renderizada bajo la clave del objeto
+(`fila:<app.modelo>:<pk>`) junto con su versión: la `fecha_actualizacion`
+del objeto más VERSION_PLANTILLAS. Si la versión guardada coincide se
+reutiliza el HTML; si no, la fila se vuelve a renderizar y se reemplaza.
+Las señales de guardado y borrado (aprendices/signals.py) además eliminan la
+entrada para liberar memoria de inmediato.
+
+El almacenamiento es la caché 'fragmentos' (LocMemCache con MAX_ENTRIES): las
+lecturas mueven la entrada al final y al llenarse se descartan las menos
+usadas recientemente. Los contadores de aciertos y fallos son por proceso.
+"""
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+
+ALIAS_CACHE = 'fragmentos'
+
+_candado = threading.Lock()
+_contadores = {'aciertos': 0, 'fallos': 0, 'invalidaciones': 0}
+
+
+def _sumar(contador):
+    with _candado:
+        _contadores[contador] += 1
+
+
+def clave(objeto):
+    return f'fila:{objeto._meta.label_lower}:{objeto.pk}'
+
+
+def version(objeto):
+    return f'{settings.VERSION_PLANTILLAS}:{objeto.fecha_actualizacion.timestamp()}'
+
+
+def obtener(nombre, objeto, renderizar):
+    """Devuelve el fragmento `nombre` de `objeto`, llamando a `renderizar()` si no está vigente."""
+    cache = caches[ALIAS_CACHE]
+    llave, vigente = clave(objeto), version(objeto)
+    fragmentos = cache.get(llave) or {}
+    guardado = fragmentos.get(nombre)
+    if guardado is not None and guardado[0] == vigente:
+        _sumar('aciertos')
+        return guardado[1]
+
+    _sumar('fallos')
+    html = renderizar()
+    fragmentos[nombre] = (vigente, html)
+    cache.set(llave, fragmentos, None)
+    return html
+
+
+def invalidar(objeto):
+    caches[ALIAS_CACHE].delete(clave(objeto))
+    _sumar('invalidaciones')
+
+
+def estadisticas():
+    with _candado:
+        datos = dict(_contadores)
+    consultas = datos['aciertos'] + datos['fallos']
+    datos['tasa_aciertos'] = round(datos['aciertos'] / consultas, 3) if consultas else None
+    return datos
+
+
+def reiniciar_estadisticas():
+    with _candado:
+        for contador in _contadores:
+            _contadores[contador] = 0
@@ -0,0 +1,344 @@
+"""
+Métricas de peticiones en el formato de texto de Prometheus.
+
+`MetricasMiddleware` registra, por nombre de URL, el número de peticiones,
+un histograma de su duración, las consultas SQL y su tiempo, y el tiempo
+de render de plantillas. `exponer_metricas` las publica en /metrics.
+
+Cada hilo acumula en sus propios diccionarios, así que registrar una
+petición no toma ningún lock; /metrics suma los de todos los hilos. Cuando
+un hilo termina (los servidores de un hilo por petición crean uno por
+petición), sus valores se pasan a un acumulado común y se suelta su registro,
+así que la memoria no crece con el número de hilos. Con
+varios procesos (gunicorn, uwsgi) cada uno vuelca su instantánea en
+METRICAS_DIRECTORIO cada METRICAS_INTERVALO segundos y al terminar, y
+/metrics suma los archivos de los demás procesos a los valores en vivo del
+que atiende. Los archivos de procesos terminados se conservan para que los
+contadores no retrocedan: el directorio se vacía al desplegar, igual que el
+directorio multiproceso de prometheus_client.
+
+El tiempo de plantillas lo mide el backend `DjangoTemplatesMedidas`
+configurado en TEMPLATES.
+"""
+import atexit
+import bisect
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+import weakref
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.template.backends.django import DjangoTemplates, Template
+
+from .consultas import registrando
+
+METODOS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+
+# nombre: (tipo, ayuda)
+FAMILIAS = {
+    'sena_peticiones_total': ('counter', "Peticiones atendidas por vista, método y código de estado."),
+    'sena_peticion_duracion_segundos': ('histogram', "Duración de las peticiones por vista."),
+    'sena_consultas_total': ('counter', "Consultas SQL ejecutadas por vista."),
+    'sena_consultas_segundos_total': ('counter', "Tiempo en consultas SQL por vista."),
+    'sena_plantillas_segundos_total': ('counter', "Tiempo de render de plantillas por vista."),
+}
+
+_medicion_actual = ContextVar('medicion_metricas', default=None)
+
+
+class Medicion:
+    """
+    Lo acumulado durante una petición; es mutable para que los hilos de
+    sync_to_async sumen aquí. `en_paralelo` ejecuta consultas de la misma
+    petición en varios hilos a la vez, así que cada suma toma el lock.
+    """
+
+    def __init__(self):
+        self.consultas = 0
+        self.tiempo_consultas = 0.0
+        self.tiempo_plantillas = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duracion = time.perf_counter() - inicio
+            with self._lock:
+                self.consultas += 1
+                self.tiempo_consultas += duracion
+
+    def sumar_plantilla(self, duracion):
+        with self._lock:
+            self.tiempo_plantillas += duracion
+
+
+class _Testigo:
+    """Vive en el threading.local de un hilo: se libera cuando el hilo termina."""
+
+
+class Metricas:
+    def __init__(self, limites, directorio=None, intervalo=5):
+        self.limites = tuple(sorted(map(float, limites)))
+        self.directorio = Path(directorio) if directorio else None
+        self.intervalo = intervalo
+        self._volcando = threading.Lock()
+        self._reiniciar()
+        os.register_at_fork(after_in_child=self._reiniciar)
+        if self.directorio:
+            self.directorio.mkdir(parents=True, exist_ok=True)
+            atexit.register(self.volcar)
+
+    def _reiniciar(self):
+        # Tras un fork el hijo no debe volver a contar lo que atendió el padre
+        self._locales = threading.local()
+        # Valores de los hilos vivos, por id de su testigo, y suma de los terminados.
+        # Reentrante: el recolector puede retirar un hilo mientras este tiene el lock
+        self._registro = threading.RLock()
+        self._hilos = {}
+        self._terminados = ({}, {})
+        self._ultimo_volcado = time.monotonic()
+
+    def _propios(self):
+        try:
+            return self._locales.valores
+        except AttributeError:
+            valores = self._locales.valores = ({}, {})
+            testigo = self._locales.testigo = _Testigo()
+            with self._registro:
+                self._hilos[id(testigo)] = valores
+            weakref.finalize(testigo, self._retirar, id(testigo), valores)
+            return valores
+
+    def _retirar(self, clave, valores):
+        # El hilo terminó: nadie más escribe en sus diccionarios
+        contadores, histogramas = valores
+        with self._registro:
+            if self._hilos.pop(clave, None) is None:
+                return
+            _sumar_valores(self._terminados, contadores, histogramas)
+
+    def sumar(self, familia, etiquetas, valor=1):
+        contadores, _ = self._propios()
+        clave = (familia, etiquetas)
+        contadores[clave] = contadores.get(clave, 0) + valor
+
+    def observar(self, familia, etiquetas, valor):
+        _, histogramas = self._propios()
+        clave = (familia, etiquetas)
+        # Un contador por límite más +Inf, sin acumular, y la suma al final
+        cubetas = histogramas.get(clave)
+        if cubetas is None:
+            cubetas = histogramas[clave] = [0] * (len(self.limites) + 2)
+        cubetas[bisect.bisect_left(self.limites, valor)] += 1
+        cubetas[-1] += valor
+
+    def instantanea(self):
+        """Suma de todos los hilos de este proceso: ({clave: valor}, {clave: cubetas})."""
+        total = ({}, {})
+        with self._registro:
+            _sumar_valores(total, *self._terminados)
+            vivos = list(self._hilos.values())
+        for propios_contadores, propios_histogramas in vivos:
+            # dict.copy y list() se ejecutan sin soltar el GIL
+            _sumar_valores(total, propios_contadores.copy(), propios_histogramas.copy())
+        return total
+
+    # Varios procesos
+
+    def _archivo(self, pid=None):
+        return self.directorio / f"metricas-{pid or os.getpid()}.json"
+
+    def volcar_si_corresponde(self):
+        if not self.directorio or time.monotonic() - self._ultimo_volcado < self.intervalo:
+            return
+        # Si otro hilo ya está volcando no se espera
+        if self._volcando.acquire(blocking=False):
+            try:
+                self.volcar()
+            finally:
+                self._volcando.release()
+
+    def volcar(self):
+        self._ultimo_volcado = time.monotonic()
+        contadores, histogramas = self.instantanea()
+        datos = {
+            'contadores': [[familia, etiquetas, valor] for (familia, etiquetas), valor in contadores.items()],
+            'histogramas': [[familia, etiquetas, cubetas] for (familia, etiquetas), cubetas in histogramas.items()],
+        }
+        # Escritura atómica: quien lea nunca ve un archivo a medias
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as archivo:
+            json.dump(datos, archivo)
+        os.replace(temporal, self._archivo())
+
+    def agregadas(self):
+        """Valores en vivo de este proceso más los últimos volcados de los demás."""
+        contadores, histogramas = self.instantanea()
+        if not self.directorio:
+            return contadores, histogramas
+        propio = self._archivo()
+        for ruta in self.directorio.glob('metricas-*.json'):
+            if ruta == propio:
+                continue
+            try:
+                datos = json.loads(ruta.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                continue
+            for familia, etiquetas, valor in datos['contadores']:
+                clave = (familia, _etiquetas(etiquetas))
+                contadores[clave] = contadores.get(clave, 0) + valor
+            for familia, etiquetas, cubetas in datos['histogramas']:
+                if len(cubetas) == len(self.limites) + 2:
+                    _sumar_cubetas(histogramas, (familia, _etiquetas(etiquetas)), cubetas)
+        return contadores, histogramas
+
+    # Formato de texto de Prometheus
+
+    def exponer(self):
+        contadores, histogramas = self.agregadas()
+        lineas = []
+        for familia, (tipo, ayuda) in FAMILIAS.items():
+            lineas += [f"# HELP {familia} {ayuda}", f"# TYPE {familia} {tipo}"]
+            if tipo == 'histogram':
+                for (nombre, etiquetas), cubetas in sorted(histogramas.items()):
+                    if nombre == familia:
+                        lineas += self._lineas_histograma(familia, etiquetas, cubetas)
+            else:
+                for (nombre, etiquetas), valor in sorted(contadores.items()):
+                    if nombre == familia:
+                        lineas.append(f"{familia}{_formato_etiquetas(etiquetas)} {_numero(valor)}")
+        return '\n'.join(lineas) + '\n'
+
+    def _lineas_histograma(self, familia, etiquetas, cubetas):
+        lineas, acumulado = [], 0
+        for limite, cantidad in zip([*map(_numero, self.limites), '+Inf'], cubetas):
+            acumulado += cantidad
+            lineas.append(f"{familia}_bucket{_formato_etiquetas(etiquetas + (('le', limite),))} {acumulado}")
+        lineas.append(f"{familia}_sum{_formato_etiquetas(etiquetas)} {_numero(cubetas[-1])}")
+        lineas.append(f"{familia}_count{_formato_etiquetas(etiquetas)} {acumulado}")
+        return lineas
+
+
+def _sumar_valores(destino, contadores, histogramas):
+    destino_contadores, destino_histogramas = destino
+    for clave, valor in contadores.items():
+        destino_contadores[clave] = destino_contadores.get(clave, 0) + valor
+    for clave, cubetas in histogramas.items():
+        _sumar_cubetas(destino_histogramas, clave, list(cubetas))
+
+
+def _sumar_cubetas(histogramas, clave, cubetas):
+    existentes = histogramas.get(clave)
+    histogramas[clave] = cubetas if existentes is None else [a + b for a, b in zip(existentes, cubetas)]
+
+
+def _etiquetas(pares):
+    # JSON convierte las tuplas en listas
+    return tuple(tuple(par) for par in pares)
+
+
+def _formato_etiquetas(etiquetas):
+    if not etiquetas:
+        return ''
+    pares = ','.join(f'{nombre}="{_escapar(valor)}"' for nombre, valor in etiquetas)
+    return f'{{{pares}}}'
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _numero(valor):
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+@functools.cache
+def metricas():
+    return Metricas(settings.METRICAS_LIMITES, settings.METRICAS_DIRECTORIO, settings.METRICAS_INTERVALO)
+
+
+class MetricasMiddleware:
+    """Va primero en MIDDLEWARE para que la duración incluya al resto de middleware."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        medicion, inicio = Medicion(), time.perf_counter()
+        token = _medicion_actual.set(medicion)
+        try:
+            with registrando(medicion):
+                response = self.get_response(request)
+        finally:
+            _medicion_actual.reset(token)
+        return self.terminar(request, response, medicion, inicio)
+
+    async def __acall__(self, request):
+        medicion, inicio = Medicion(), time.perf_counter()
+        token = _medicion_actual.set(medicion)
+        try:
+            with registrando(medicion):
+                response = await self.get_response(request)
+        finally:
+            _medicion_actual.reset(token)
+        return self.terminar(request, response, medicion, inicio)
+
+    def terminar(self, request, response, medicion, inicio):
+        # En las respuestas en streaming (exportaciones) la duración no incluye el envío del cuerpo
+        duracion = time.perf_counter() - inicio
+        # Nombre de URL y no la ruta: las rutas con ids dispararían las series
+        vista = request.resolver_match.view_name if request.resolver_match else 'sin_ruta'
+        metodo = request.method if request.method in METODOS else 'otro'
+        registro = metricas()
+        registro.sumar('sena_peticiones_total', (('vista', vista), ('metodo', metodo), ('estado', response.status_code)))
+        registro.observar('sena_peticion_duracion_segundos', (('vista', vista),), duracion)
+        registro.sumar('sena_consultas_total', (('vista', vista),), medicion.consultas)
+        registro.sumar('sena_consultas_segundos_total', (('vista', vista),), medicion.tiempo_consultas)
+        registro.sumar('sena_plantillas_segundos_total', (('vista', vista),), medicion.tiempo_plantillas)
+        registro.volcar_si_corresponde()
+        return response
+
+
+def exponer_metricas(request):
+    permitidas = settings.METRICAS_IPS_PERMITIDAS
+    if permitidas is not None and request.META.get('REMOTE_ADDR') not in permitidas:
+        return HttpResponseForbidden()
+    return HttpResponse(metricas().exponer(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class PlantillaMedida(Template):
+    def render(self, context=None, request=None):
+        medicion = _medicion_actual.get()
+        if medicion is None:
+            return super().render(context, request)
+        inicio = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            medicion.sumar_plantilla(time.perf_counter() - inicio)
+
+
+class DjangoTemplatesMedidas(DjangoTemplates):
+    """El backend de Django, con el render de cada plantilla medido para MetricasMiddleware."""
+
+    def from_string(self, template_code):
+        return PlantillaMedida(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name):
+        return PlantillaMedida(super().get_template(template_name).template, self)
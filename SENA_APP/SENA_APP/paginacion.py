@@ -0,0 +1,195 @@
+"""
+Paginación por cursor (keyset) para las vistas de listado.
+
+En lugar de usar OFFSET, cada página se pide a partir de los valores de
+ordenamiento de la última (o primera) fila mostrada, de modo que la base de
+datos puede saltar directamente a esa posición usando un índice compuesto
+sobre los mismos campos. Los campos de `orden` deben ser NOT NULL y terminar
+en una columna única (normalmente `id`) para que el orden sea total.
+"""
+import base64
+import binascii
+import datetime
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+class CursorInvalido(ValueError):
+    pass
+
+
+class _CodificadorCursor(DjangoJSONEncoder):
+    """
+    DjangoJSONEncoder recorta fechas y horas a milisegundos; el cursor debe
+    conservar los microsegundos para que el límite coincida con la fila.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def codificar_cursor(valores):
+    datos = json.dumps(valores, cls=_CodificadorCursor, separators=(',', ':'))
+    return base64.urlsafe_b64encode(datos.encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(cursor, modelo, orden):
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise CursorInvalido(cursor)
+    if not isinstance(valores, list) or len(valores) != len(orden):
+        raise CursorInvalido(cursor)
+    # Convertir de nuevo cada valor al tipo Python del campo (fechas, decimales...)
+    return [
+        modelo._meta.get_field(campo.lstrip('-')).to_python(valor)
+        for campo, valor in zip(orden, valores)
+    ]
+
+
+def filtro_keyset(orden, valores, hacia_adelante=True):
+    """
+    Construye (a > x) OR (a = x AND b > y) OR ... respetando la dirección
+    de cada campo del ordenamiento.
+    """
+    condiciones = Q()
+    for i, campo in enumerate(orden):
+        nombre = campo.lstrip('-')
+        descendente = campo.startswith('-')
+        lookup = 'lt' if descendente == hacia_adelante else 'gt'
+        condicion = Q(**{f'{nombre}__{lookup}': valores[i]})
+        for previo, valor in zip(orden[:i], valores[:i]):
+            condicion &= Q(**{previo.lstrip('-'): valor})
+        condiciones |= condicion
+    return condiciones
+
+
+def _invertir(orden):
+    return [campo[1:] if campo.startswith('-') else f'-{campo}' for campo in orden]
+
+
+def _valores_fila(fila, orden):
+    nombres = [campo.lstrip('-') for campo in orden]
+    if isinstance(fila, dict):
+        return [fila[nombre] for nombre in nombres]
+    return [getattr(fila, nombre) for nombre in nombres]
+
+
+class Pagina:
+    """Resultado de una página: las filas y los cursores para navegar."""
+
+    def __init__(self, objetos, cursor_anterior=None, cursor_siguiente=None):
+        self.objetos = objetos
+        self.cursor_anterior = cursor_anterior
+        self.cursor_siguiente = cursor_siguiente
+
+    def __iter__(self):
+        return iter(self.objetos)
+
+    def __len__(self):
+        return len(self.objetos)
+
+    def __bool__(self):
+        return bool(self.objetos)
+
+    def tiene_anterior(self):
+        return self.cursor_anterior is not None
+
+    def tiene_siguiente(self):
+        return self.cursor_siguiente is not None
+
+
+def paginar_queryset(queryset, orden, despues=None, antes=None, por_pagina=None):
+    """
+    Devuelve una `Pagina` de `queryset` ordenado por `orden`.
+
+    `despues` y `antes` son cursores opacos; si ninguno es válido se devuelve
+    la primera página, igual que `Paginator.get_page`.
+    """
+    por_pagina = por_pagina or settings.PAGINACION_POR_PAGINA
+    modelo = queryset.model
+    hacia_adelante = True
+    valores = None
+
+    try:
+        if antes:
+            valores = decodificar_cursor(antes, modelo, orden)
+            hacia_adelante = False
+        elif despues:
+            valores = decodificar_cursor(despues, modelo, orden)
+    except (CursorInvalido, ValidationError):
+        valores, hacia_adelante = None, True
+
+    orden_consulta = list(orden) if hacia_adelante else _invertir(orden)
+    qs = queryset.order_by(*orden_consulta)
+    if valores is not None:
+        qs = qs.filter(filtro_keyset(orden, valores, hacia_adelante))
+
+    # Se pide una fila extra para saber si hay más en la dirección recorrida
+    filas = list(qs[:por_pagina + 1])
+    hay_mas = len(filas) > por_pagina
+    filas = filas[:por_pagina]
+    if not hacia_adelante:
+        filas.reverse()
+
+    if not filas:
+        return Pagina(filas)
+
+    cursor_primera = codificar_cursor(_valores_fila(filas[0], orden))
+    cursor_ultima = codificar_cursor(_valores_fila(filas[-1], orden))
+    if hacia_adelante:
+        anterior = cursor_primera if valores is not None else None
+        siguiente = cursor_ultima if hay_mas else None
+    else:
+        anterior = cursor_primera if hay_mas else None
+        siguiente = cursor_ultima
+    return Pagina(filas, anterior, siguiente)
+
+
+def paginar(request, queryset, orden, por_pagina=None):
+    return paginar_queryset(
+        queryset,
+        orden,
+        despues=request.GET.get('despues'),
+        antes=request.GET.get('antes'),
+        por_pagina=por_pagina,
+    )
+
+
+def total_aproximado(queryset, clave):
+    """
+    Conteo cacheado durante PAGINACION_TTL_TOTAL segundos para no ejecutar
+    un COUNT(*) completo en cada visita al listado.
+    """
+    clave_cache = f'total:{clave}'
+    total = cache.get(clave_cache)
+    if total is None:
+        total = queryset.count()
+        cache.set(clave_cache, total, settings.PAGINACION_TTL_TOTAL)
+    return total
+
+
+class PaginadorTotalCacheado(Paginator):
+    """
+    Paginator para los listados del admin sobre tablas grandes: el total sale
+    de `total_aproximado` en lugar de un COUNT(*) por visita. La clave es la
+    consulta con sus parámetros, así que cada combinación de filtros y
+    búsqueda tiene su propio total.
+    """
+
+    @cached_property
+    def count(self):
+        sql, params = self.object_list.query.sql_with_params()
+        clave = hashlib.sha1(f'{sql}{params!r}'.encode()).hexdigest()
+        return total_aproximado(self.object_list, f'admin:{clave}')
@@ -0,0 +1,146 @@
+"""
+Ayudas para pruebas: afirmar el número máximo de consultas de una vista y
+crear filas mínimas válidas de cada modelo.
+
+Uso en cualquier `tests.py`:
+
+    class ListaCursosTests(PresupuestoConsultasMixin, TestCase):
+        def test_presupuesto(self):
+            self.assertVistaDentroDePresupuesto('aprendices:lista_cursos')
+
+Las vistas asíncronas deben probarse con CONSULTAS_EN_PARALELO = False: las
+conexiones de otros hilos no ven la transacción de TestCase.
+"""
+import datetime
+import itertools
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import caches
+from django.urls import reverse
+
+from aprendices.models import Aprendiz, Curso
+from instructores.models import Instructor
+from programas.models import Programa
+from proyectos.models import Proyecto
+
+from .consultas import RegistroConsultas, forma_consulta, presupuesto_para, registrando
+
+
+class PresupuestoConsultasMixin:
+
+    @contextmanager
+    def assertMaxConsultas(self, maximo):
+        """
+        Como `assertNumQueries`, pero admite cualquier número <= maximo y cuenta
+        también las consultas que las vistas asíncronas ejecutan en otros hilos.
+        """
+        with registrando(RegistroConsultas()) as registro:
+            yield registro
+        ejecutadas = len(registro)
+        if ejecutadas > maximo:
+            detalle = '\n'.join(consulta['sql'] for consulta in registro.consultas)
+            self.fail(f"Se ejecutaron {ejecutadas} consultas (máximo {maximo}):\n{detalle}")
+
+    def assertVistaDentroDePresupuesto(self, nombre_url, args=None, kwargs=None, maximo=None, umbral_repetidas=None):
+        """
+        Pide la vista con `self.client` y comprueba que no supere su presupuesto
+        de PRESUPUESTO_CONSULTAS ni repita la misma consulta `umbral_repetidas`
+        veces o más (si se indica).
+        """
+        maximo = maximo if maximo is not None else presupuesto_para(nombre_url)
+        if maximo is None:
+            self.fail(f"No hay presupuesto de consultas configurado para {nombre_url}")
+
+        with self.assertMaxConsultas(maximo) as contexto:
+            response = self.client.get(reverse(nombre_url, args=args, kwargs=kwargs))
+        response.consultas = contexto
+
+        if umbral_repetidas:
+            formas = [forma_consulta(consulta['sql']) for consulta in contexto.consultas]
+            repetidas = {forma for forma in formas if formas.count(forma) >= umbral_repetidas}
+            if repetidas:
+                self.fail(f"Consultas repetidas (posible N+1) en {nombre_url}: {repetidas}")
+        return response
+
+    def assertConsultasConstantes(self, nombre_url, preparar, cantidades=(10, 100)):
+        """
+        Para cada cantidad, `preparar(cantidad)` crea esa cantidad de filas
+        relacionadas y devuelve los args de la URL. La vista debe respetar su
+        presupuesto y ejecutar las mismas consultas con cualquier cantidad.
+        Las cachés se vacían antes de cada petición para contar el caso frío.
+        """
+        conteos = {}
+        for cantidad in cantidades:
+            args = preparar(cantidad)
+            for alias in settings.CACHES:
+                caches[alias].clear()
+            response = self.assertVistaDentroDePresupuesto(
+                nombre_url, args=args, umbral_repetidas=settings.UMBRAL_CONSULTAS_REPETIDAS,
+            )
+            self.assertEqual(response.status_code, 200)
+            conteos[cantidad] = len(response.consultas)
+        if len(set(conteos.values())) > 1:
+            self.fail(f"Las consultas de {nombre_url} crecen con las filas relacionadas: {conteos}")
+
+
+_secuencia = itertools.count(1)
+
+
+def crear_programa(**campos):
+    numero = next(_secuencia)
+    datos = {
+        'codigo': f'P{numero:05d}', 'nombre': f'Programa {numero}', 'nivel_formacion': 'TGL',
+        'duracion_meses': 24, 'duracion_horas': 3120, 'descripcion': 'Descripción del programa',
+        'competencias': '-', 'perfil_egreso': '-', 'requisitos_ingreso': '-',
+        'centro_formacion': 'Centro de Servicios Financieros', 'regional': 'Distrito Capital',
+        'fecha_creacion': datetime.date(2020, 1, 1),
+    }
+    return Programa.objects.create(**{**datos, **campos})
+
+
+def crear_instructor(**campos):
+    numero = next(_secuencia)
+    datos = {
+        'documento_identidad': f'8{numero:08d}', 'nombre': f'Instructor{numero}', 'apellido': 'Pérez',
+        'fecha_nacimiento': datetime.date(1980, 1, 1), 'especialidad': 'Software', 'anos_experiencia': 5,
+        'fecha_vinculacion': datetime.date(2015, 1, 1),
+    }
+    return Instructor.objects.create(**{**datos, **campos})
+
+
+def crear_aprendiz(**campos):
+    numero = next(_secuencia)
+    datos = {
+        'documento_identidad': f'1{numero:09d}', 'nombre': f'Aprendiz{numero}', 'apellido': 'Gómez',
+        'fecha_nacimiento': datetime.date(2000, 1, 1), 'ciudad': 'Bogotá',
+    }
+    return Aprendiz.objects.create(**{**datos, **campos})
+
+
+def crear_curso(**campos):
+    """Curso en un aula propia, para que no choque con otros salvo que se pida."""
+    numero = next(_secuencia)
+    datos = {
+        'codigo': f'C{numero:05d}', 'nombre': f'Curso {numero}', 'fecha_inicio': datetime.date(2025, 2, 3),
+        'fecha_fin': datetime.date(2025, 6, 30), 'horario': 'Lunes a Viernes 7:00-13:00', 'aula': f'Aula {numero}',
+        'cupos_maximos': 30,
+    }
+    datos.update(campos)
+    if 'programa' not in datos and 'programa_id' not in datos:
+        datos['programa'] = crear_programa()
+    if 'instructor_coordinador' not in datos and 'instructor_coordinador_id' not in datos:
+        datos['instructor_coordinador'] = crear_instructor()
+    return Curso.objects.create(**datos)
+
+
+def crear_proyecto(**campos):
+    numero = next(_secuencia)
+    datos = {
+        'titulo': f'Proyecto {numero}', 'descripcion_detallada': 'Descripción', 'area_proponente': 'Área',
+        'responsable': 'Responsable', 'objetivos_generales': '-', 'objetivos_especificos': '-',
+        'alcance_limitaciones': '-', 'presupuesto_estimado': Decimal('1000.00'), 'cronograma_tentativo': '-',
+        'recursos_necesarios': '-', 'beneficiarios_esperados': '-', 'indicadores_exito': '-',
+    }
+    return Proyecto.objects.create(**{**datos, **campos})
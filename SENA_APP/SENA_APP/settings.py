@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from .sqlite import desde_entorno, init_command, pragmas_desde_entorno
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -41,9 +44,13 @@ INSTALLED_APPS = [
     'instructores',
     'programas',
     'proyectos',
+    'busqueda',
+    'api',
 ]
 
 MIDDLEWARE = [
+    'SENA_APP.metricas.MetricasMiddleware',
+    'SENA_APP.consultas.PresupuestoConsultasMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -57,8 +64,11 @@ ROOT_URLCONF = 'SENA_APP.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
+        # DjangoTemplates con el tiempo de render medido (SENA_APP/metricas.py)
+        'BACKEND': 'SENA_APP.metricas.DjangoTemplatesMedidas',
+        # Las apps guardan sus plantillas en "Templates", que APP_DIRS solo
+        # encuentra en sistemas de archivos que no distinguen mayúsculas
+        'DIRS': sorted(BASE_DIR.glob('*/Templates')),
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -77,10 +87,35 @@ WSGI_APPLICATION = 'SENA_APP.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# PRAGMA que se ejecutan al abrir cada conexión (ver SENA_APP/sqlite.py); se
+# sobrescriben por entorno con SENA_SQLITE_<NOMBRE>, y un valor vacío lo omite.
+# - WAL: los lectores no bloquean al escritor ni el escritor a los lectores.
+# - synchronous NORMAL: en WAL no corrompe la base ante un corte de energía;
+#   solo puede perder las últimas transacciones confirmadas.
+# - busy_timeout: milisegundos que una escritura espera el bloqueo antes de
+#   fallar con "database is locked".
+# - cache_size negativo: KiB de caché de páginas por conexión.
+SQLITE_PRAGMAS = pragmas_desde_entorno({
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -20000,
+    'mmap_size': 268435456,
+    'temp_store': 'MEMORY',
+})
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'init_command': init_command(SQLITE_PRAGMAS),
+            # Las transacciones toman el bloqueo de escritura al empezar: una
+            # transacción que lee y luego escribe (formularios, list_editable del
+            # admin) espera su turno con busy_timeout en vez de fallar al
+            # intentar pasar de lectura a escritura.
+            'transaction_mode': desde_entorno('modo_transacciones', 'IMMEDIATE'),
+        },
     }
 }
 
@@ -125,3 +160,128 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Cachés: la de fragmentos guarda las filas renderizadas de los listados
+# (SENA_APP/fragmentos.py). Con CULL_FREQUENCY igual a MAX_ENTRIES, al llenarse
+# se descarta solo la entrada usada menos recientemente (LRU). Sus claves
+# incluyen la fecha de actualización de cada fila, así que cada proceso puede
+# tener la suya.
+#
+# La compartida guarda lo que las señales invalidan borrando la entrada (las
+# estadísticas de inicio): en una caché en memoria el borrado solo llegaría al
+# proceso que hizo el cambio. Por defecto son archivos en
+# SENA_CACHE_DIRECTORIO, que comparten los procesos de un mismo servidor; con
+# varios servidores debe apuntar a Redis o Memcached.
+
+FRAGMENTOS_MAX_FILAS = 20000
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'fragmentos': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'fragmentos',
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': FRAGMENTOS_MAX_FILAS,
+            'CULL_FREQUENCY': FRAGMENTOS_MAX_FILAS,
+        },
+    },
+    'compartida': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('SENA_CACHE_DIRECTORIO') or BASE_DIR / '.cache',
+    },
+}
+
+# Paginación por cursor de los listados (ver SENA_APP/paginacion.py)
+
+PAGINACION_POR_PAGINA = 50
+
+# Segundos que se reutiliza el total de registros mostrado en los listados
+PAGINACION_TTL_TOTAL = 300
+
+# Segundos que se reutilizan las opciones de los filtros laterales del admin
+# que se calculan desde los datos (ver CiudadFilter en aprendices/admin.py)
+FILTROS_ADMIN_TTL = 600
+
+# Las vistas asíncronas ejecutan sus consultas independientes a la vez, cada una
+# en su propia conexión (SENA_APP/asincrono.py). Desactivar en pruebas con
+# TestCase, cuya transacción no es visible desde otras conexiones.
+CONSULTAS_EN_PARALELO = True
+
+# Segundos que se conserva la instantánea de estadísticas de la página de inicio
+# (se invalida antes si cambian aprendices, instructores, programas o cursos).
+# Está en la caché 'compartida': si se cambia a una caché por proceso, los
+# demás procesos muestran conteos viejos hasta que vence.
+ESTADISTICAS_TTL = 600
+
+# Se incluye en el ETag de las páginas de detalle; cambiarlo al desplegar
+# plantillas nuevas obliga a los clientes a descargarlas de nuevo
+VERSION_PLANTILLAS = '1'
+
+# Filas máximas por página que acepta la API (?limite=, ver api/views.py)
+API_LIMITE_MAXIMO = 500
+
+# Presupuesto de consultas SQL por nombre de URL (ver SENA_APP/consultas.py).
+# Si una vista lo supera se registra una advertencia, o se lanza una excepción
+# cuando PRESUPUESTO_CONSULTAS_ESTRICTO es True. Las páginas de detalle
+# incluyen la consulta de su marca de actualización (SENA_APP/condicional.py);
+# cuando responden 304 solo ejecutan esa.
+
+PRESUPUESTO_CONSULTAS = {
+    'aprendices:inicio': 1,
+    'aprendices:lista_aprendices': 2,
+    'aprendices:lista_cursos': 2,
+    'aprendices:detalle_curso': 4,
+    'aprendices:detalle_aprendiz': 3,
+    'instructores:lista_instructores': 2,
+    'instructores:detalle_instructor': 4,
+    'programas:lista_programas': 2,
+    'programas:detalle_programa': 4,
+    'proyectos:lista_proyectos': 2,
+    'proyectos:detalle_proyecto': 2,
+    'busqueda:buscar': 1,
+    'api:lista': 1,
+    'api:detalle': 1,
+    'metricas': 0,
+}
+
+# Presupuesto para las URL que no aparecen arriba (None = sin límite)
+PRESUPUESTO_CONSULTAS_DEFECTO = None
+
+PRESUPUESTO_CONSULTAS_ESTRICTO = False
+
+# Veces que debe repetirse una misma forma de consulta para avisar de un N+1
+UMBRAL_CONSULTAS_REPETIDAS = 5
+
+# Métricas de peticiones en /metrics, formato de texto de Prometheus (ver
+# SENA_APP/metricas.py). Con varios procesos, cada uno vuelca sus contadores
+# en METRICAS_DIRECTORIO cada METRICAS_INTERVALO segundos y /metrics los suma;
+# el directorio se vacía al desplegar. Sin directorio solo se ven los del
+# proceso que atiende la petición.
+METRICAS_DIRECTORIO = os.environ.get('SENA_METRICAS_DIRECTORIO') or None
+
+METRICAS_INTERVALO = 5
+
+# Límites en segundos de las cubetas del histograma de duración
+METRICAS_LIMITES = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Direcciones que pueden leer /metrics (None = cualquiera)
+METRICAS_IPS_PERMITIDAS = ['127.0.0.1', '::1']
+
+# Registro de las aplicaciones del proyecto, que usan logging.getLogger(__name__).
+# Por defecto solo se escriben advertencias y errores, para no escribir en la
+# consola en cada petición; SENA_LOG_NIVEL=INFO o DEBUG muestra el detalle de
+# los formularios. El logger 'django' conserva la configuración de Django.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'consola': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        aplicacion: {'handlers': ['consola'], 'level': os.environ.get('SENA_LOG_NIVEL', 'WARNING')}
+        for aplicacion in ['SENA_APP', 'aprendices', 'instructores', 'programas', 'proyectos', 'busqueda', 'api']
+    },
+}
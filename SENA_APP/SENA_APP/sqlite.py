@@ -0,0 +1,41 @@
+"""
+Ajustes de conexión para SQLite.
+
+Django ejecuta `OPTIONS['init_command']` cada vez que abre una conexión, así
+que los PRAGMA de SQLITE_PRAGMAS se aplican a todas (vistas, admin, comandos
+y pruebas). Cada uno se puede cambiar por entorno con la variable
+SENA_SQLITE_<NOMBRE> (por ejemplo SENA_SQLITE_SYNCHRONOUS=FULL); con un valor
+vacío ese PRAGMA no se ejecuta y queda el valor por defecto de SQLite.
+
+Este módulo lo importa settings.py: no debe importar nada que lea la
+configuración de Django.
+"""
+import os
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+
+PREFIJO_ENTORNO = 'SENA_SQLITE_'
+
+_VALOR_VALIDO = re.compile(r'-?\w+')
+
+
+def desde_entorno(nombre, valor, entorno=os.environ):
+    return entorno.get(PREFIJO_ENTORNO + nombre.upper(), valor)
+
+
+def pragmas_desde_entorno(pragmas, entorno=os.environ):
+    """Copia de `pragmas` con los valores sobrescritos por el entorno, sin los vacíos."""
+    resultado = {}
+    for nombre, valor in pragmas.items():
+        valor = str(desde_entorno(nombre, valor, entorno)).strip()
+        if not valor:
+            continue
+        if not _VALOR_VALIDO.fullmatch(valor):
+            raise ImproperlyConfigured(f"Valor inválido para PRAGMA {nombre}: {valor!r}")
+        resultado[nombre] = valor
+    return resultado
+
+
+def init_command(pragmas):
+    return ';'.join(f'PRAGMA {nombre} = {valor}' for nombre, valor in pragmas.items())
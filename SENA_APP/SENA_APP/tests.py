@@ -0,0 +1,52 @@
+import gc
+import sys
+import threading
+
+from django.test import SimpleTestCase
+
+from .metricas import Medicion, Metricas
+
+
+def en_hilos(cantidad, funcion):
+    hilos = [threading.Thread(target=funcion) for _ in range(cantidad)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+
+class MetricasTests(SimpleTestCase):
+
+    def test_los_hilos_terminados_se_sueltan_sin_perder_sus_valores(self):
+        registro = Metricas(limites=[0.1, 1])
+
+        def atender():
+            registro.sumar('sena_peticiones_total', (('vista', 'inicio'),))
+            registro.observar('sena_peticion_duracion_segundos', (('vista', 'inicio'),), 0.05)
+
+        en_hilos(200, atender)
+        gc.collect()
+        self.assertEqual(registro._hilos, {})
+        contadores, histogramas = registro.instantanea()
+        self.assertEqual(contadores[('sena_peticiones_total', (('vista', 'inicio'),))], 200)
+        self.assertEqual(histogramas[('sena_peticion_duracion_segundos', (('vista', 'inicio'),))][0], 200)
+
+        atender()
+        contadores, _ = registro.instantanea()
+        self.assertEqual(contadores[('sena_peticiones_total', (('vista', 'inicio'),))], 201)
+
+    def test_medicion_no_pierde_consultas_de_otros_hilos(self):
+        medicion = Medicion()
+
+        def consultar():
+            for _ in range(2000):
+                medicion(lambda *args: None, 'SELECT 1', (), False, {})
+
+        intervalo = sys.getswitchinterval()
+        # Cambiar de hilo muy seguido hace visible cualquier suma sin lock
+        sys.setswitchinterval(1e-6)
+        try:
+            en_hilos(8, consultar)
+        finally:
+            sys.setswitchinterval(intervalo)
+        self.assertEqual(medicion.consultas, 16000)
@@ -17,6 +17,8 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from .metricas import exponer_metricas
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -24,6 +26,9 @@ urlpatterns = [
     path('instructores', include('instructores.urls')),
     path('programas', include('programas.urls')),
     path('proyectos/', include('proyectos.urls')),
+    path('buscar/', include('busqueda.urls')),
+    path('api/v1/', include('api.urls')),
+    path('metrics', exponer_metricas, name='metricas'),
 ]
 
 # Personalización del panel administrativo
@@ -0,0 +1,137 @@
+"""
+Recursos expuestos por la API de solo lectura.
+
+Cada recurso declara los campos que se pueden pedir con `?fields=` (nombre
+público -> ruta del ORM), el ordenamiento usado por la paginación por cursor
+(respaldado por un índice) y los filtros permitidos (parámetro -> lookup).
+Los filtros solo apuntan a columnas indexadas para que ninguna combinación
+obligue a recorrer la tabla completa.
+"""
+from django.db.models import F
+
+from aprendices.models import Aprendiz, AprendizCurso, Curso, InstructorCurso
+from instructores.models import Instructor
+from programas.models import Programa
+from proyectos.models import Proyecto
+
+
+class Recurso:
+
+    def __init__(self, modelo, campos, orden, filtros=None, por_defecto=None):
+        self.modelo = modelo
+        self.campos = campos
+        self.orden = orden
+        self.filtros = filtros or {}
+        self.por_defecto = por_defecto or list(campos)
+
+    def proyeccion(self, nombres):
+        """
+        Argumentos para `values()`: columnas propias por nombre y columnas
+        relacionadas como alias. Se agregan los campos del orden, que el
+        cursor necesita aunque no se hayan pedido.
+        """
+        columnas, alias = [], {}
+        for nombre in dict.fromkeys([*nombres, *(campo.lstrip('-') for campo in self.orden)]):
+            ruta = self.campos.get(nombre, nombre)
+            if ruta == nombre:
+                columnas.append(nombre)
+            else:
+                alias[nombre] = F(ruta)
+        return columnas, alias
+
+
+RECURSOS = {
+    'aprendices': Recurso(
+        Aprendiz,
+        campos={
+            'id': 'id', 'documento_identidad': 'documento_identidad', 'nombre': 'nombre', 'apellido': 'apellido',
+            'telefono': 'telefono', 'correo': 'correo', 'fecha_nacimiento': 'fecha_nacimiento', 'ciudad': 'ciudad',
+            'programa_id': 'programa_id', 'programa_nombre': 'programa__nombre',
+        },
+        orden=['id'],
+        filtros={'documento_identidad': 'documento_identidad', 'programa': 'programa_id'},
+        por_defecto=['id', 'documento_identidad', 'nombre', 'apellido', 'telefono', 'correo', 'fecha_nacimiento',
+                     'ciudad', 'programa_id'],
+    ),
+    'cursos': Recurso(
+        Curso,
+        campos={
+            'id': 'id', 'codigo': 'codigo', 'nombre': 'nombre', 'programa_id': 'programa_id',
+            'programa_nombre': 'programa__nombre', 'instructor_coordinador_id': 'instructor_coordinador_id',
+            'fecha_inicio': 'fecha_inicio', 'fecha_fin': 'fecha_fin', 'horario': 'horario', 'aula': 'aula',
+            'cupos_maximos': 'cupos_maximos', 'inscritos': 'inscritos', 'estado': 'estado',
+            'observaciones': 'observaciones',
+        },
+        orden=['fecha_inicio', 'id'],
+        filtros={
+            'estado': 'estado',
+            'programa': 'programa_id',
+            'instructor_coordinador': 'instructor_coordinador_id',
+            'codigo': 'codigo',
+            'fecha_inicio_desde': 'fecha_inicio__gte',
+            'fecha_inicio_hasta': 'fecha_inicio__lte',
+        },
+        por_defecto=['id', 'codigo', 'nombre', 'programa_id', 'instructor_coordinador_id', 'fecha_inicio',
+                     'fecha_fin', 'cupos_maximos', 'inscritos', 'estado'],
+    ),
+    'instructores': Recurso(
+        Instructor,
+        campos={
+            'id': 'id', 'documento_identidad': 'documento_identidad', 'tipo_documento': 'tipo_documento',
+            'nombre': 'nombre', 'apellido': 'apellido', 'telefono': 'telefono', 'correo': 'correo',
+            'ciudad': 'ciudad', 'nivel_educativo': 'nivel_educativo', 'especialidad': 'especialidad',
+            'anos_experiencia': 'anos_experiencia', 'activo': 'activo', 'fecha_vinculacion': 'fecha_vinculacion',
+        },
+        orden=['id'],
+        filtros={'documento_identidad': 'documento_identidad'},
+    ),
+    'programas': Recurso(
+        Programa,
+        campos={
+            'id': 'id', 'codigo': 'codigo', 'nombre': 'nombre', 'nivel_formacion': 'nivel_formacion',
+            'modalidad': 'modalidad', 'duracion_meses': 'duracion_meses', 'duracion_horas': 'duracion_horas',
+            'descripcion': 'descripcion', 'competencias': 'competencias', 'perfil_egreso': 'perfil_egreso',
+            'requisitos_ingreso': 'requisitos_ingreso', 'centro_formacion': 'centro_formacion',
+            'regional': 'regional', 'estado': 'estado', 'fecha_creacion': 'fecha_creacion',
+        },
+        orden=['nombre', 'id'],
+        filtros={'codigo': 'codigo'},
+        por_defecto=['id', 'codigo', 'nombre', 'nivel_formacion', 'modalidad', 'duracion_meses',
+                     'duracion_horas', 'centro_formacion', 'regional', 'estado'],
+    ),
+    'proyectos': Recurso(
+        Proyecto,
+        campos={
+            'id': 'id', 'titulo': 'titulo', 'descripcion_detallada': 'descripcion_detallada',
+            'area_proponente': 'area_proponente', 'responsable': 'responsable',
+            'objetivos_generales': 'objetivos_generales', 'objetivos_especificos': 'objetivos_especificos',
+            'alcance_limitaciones': 'alcance_limitaciones', 'presupuesto_estimado': 'presupuesto_estimado',
+            'cronograma_tentativo': 'cronograma_tentativo', 'recursos_necesarios': 'recursos_necesarios',
+            'beneficiarios_esperados': 'beneficiarios_esperados', 'indicadores_exito': 'indicadores_exito',
+            'fecha_creacion': 'fecha_creacion',
+        },
+        orden=['-fecha_creacion', '-id'],
+        filtros={'fecha_creacion_desde': 'fecha_creacion__gte', 'fecha_creacion_hasta': 'fecha_creacion__lte'},
+        por_defecto=['id', 'titulo', 'area_proponente', 'responsable', 'presupuesto_estimado', 'fecha_creacion'],
+    ),
+    'instructores-cursos': Recurso(
+        InstructorCurso,
+        campos={
+            'id': 'id', 'instructor_id': 'instructor_id', 'curso_id': 'curso_id', 'rol': 'rol',
+            'fecha_asignacion': 'fecha_asignacion',
+        },
+        orden=['id'],
+        filtros={'instructor': 'instructor_id', 'curso': 'curso_id'},
+    ),
+    'aprendices-cursos': Recurso(
+        AprendizCurso,
+        campos={
+            'id': 'id', 'aprendiz_id': 'aprendiz_id', 'curso_id': 'curso_id',
+            'fecha_inscripcion': 'fecha_inscripcion', 'estado': 'estado', 'nota_final': 'nota_final',
+            'observaciones': 'observaciones',
+        },
+        orden=['id'],
+        filtros={'aprendiz': 'aprendiz_id', 'curso': 'curso_id'},
+        por_defecto=['id', 'aprendiz_id', 'curso_id', 'fecha_inscripcion', 'estado', 'nota_final'],
+    ),
+}
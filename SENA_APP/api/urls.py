@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+app_name = 'api'
+
+urlpatterns = [
+    path('<slug:recurso>/', views.lista, name='lista'),
+    path('<slug:recurso>/<int:objeto_id>/', views.detalle, name='detalle'),
+]
@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from SENA_APP.paginacion import paginar_queryset
+
+from .recursos import RECURSOS
+
+
+class ErrorConsulta(ValueError):
+    pass
+
+
+def _error(mensaje, estado=400):
+    return JsonResponse({'error': mensaje}, status=estado)
+
+
+def _campos_pedidos(request, recurso):
+    if 'fields' not in request.GET:
+        return recurso.por_defecto
+    nombres = [nombre.strip() for nombre in request.GET['fields'].split(',') if nombre.strip()]
+    desconocidos = [nombre for nombre in nombres if nombre not in recurso.campos]
+    if desconocidos or not nombres:
+        raise ErrorConsulta(f"Campos no disponibles: {', '.join(desconocidos) or '(vacío)'}. "
+                            f"Campos válidos: {', '.join(recurso.campos)}")
+    return nombres
+
+
+def _filtros(request, recurso):
+    filtros = {}
+    for parametro, lookup in recurso.filtros.items():
+        if parametro not in request.GET:
+            continue
+        campo = recurso.modelo._meta.get_field(lookup.split('__')[0])
+        try:
+            filtros[lookup] = campo.to_python(request.GET[parametro])
+        except ValidationError as error:
+            raise ErrorConsulta(f"Valor inválido para {parametro}: {' '.join(error.messages)}")
+    return filtros
+
+
+def _limite(request):
+    try:
+        limite = int(request.GET.get('limite', settings.PAGINACION_POR_PAGINA))
+    except ValueError:
+        raise ErrorConsulta("limite debe ser un número entero")
+    return max(1, min(limite, settings.API_LIMITE_MAXIMO))
+
+
+def _url_pagina(request, parametro, cursor):
+    if cursor is None:
+        return None
+    consulta = request.GET.copy()
+    consulta.pop('despues', None)
+    consulta.pop('antes', None)
+    consulta[parametro] = cursor
+    return request.build_absolute_uri(f"{request.path}?{consulta.urlencode()}")
+
+
+def _recortar(filas, nombres):
+    # Quitar las columnas que solo se leyeron para el cursor
+    if not filas or len(filas[0]) == len(nombres):
+        return filas
+    return [{nombre: fila[nombre] for nombre in nombres} for fila in filas]
+
+
+@require_GET
+def lista(request, recurso):
+    if recurso not in RECURSOS:
+        return _error(f"Recurso desconocido: {recurso}", 404)
+    definicion = RECURSOS[recurso]
+    try:
+        nombres = _campos_pedidos(request, definicion)
+        filtros = _filtros(request, definicion)
+        limite = _limite(request)
+    except ErrorConsulta as error:
+        return _error(str(error))
+
+    columnas, alias = definicion.proyeccion(nombres)
+    queryset = definicion.modelo.objects.filter(**filtros).values(*columnas, **alias)
+    pagina = paginar_queryset(
+        queryset, definicion.orden,
+        despues=request.GET.get('despues'), antes=request.GET.get('antes'), por_pagina=limite,
+    )
+    return JsonResponse({
+        'resultados': _recortar(pagina.objetos, nombres),
+        'anterior': _url_pagina(request, 'antes', pagina.cursor_anterior),
+        'siguiente': _url_pagina(request, 'despues', pagina.cursor_siguiente),
+    })
+
+
+@require_GET
+def detalle(request, recurso, objeto_id):
+    if recurso not in RECURSOS:
+        return _error(f"Recurso desconocido: {recurso}", 404)
+    definicion = RECURSOS[recurso]
+    try:
+        nombres = _campos_pedidos(request, definicion)
+    except ErrorConsulta as error:
+        return _error(str(error))
+
+    columnas, alias = definicion.proyeccion(nombres)
+    fila = definicion.modelo.objects.filter(pk=objeto_id).values(*columnas, **alias).first()
+    if fila is None:
+        return _error("No encontrado", 404)
+    return JsonResponse(_recortar([fila], nombres)[0])
@@ -1,9 +1,73 @@
-from django.contrib import admin
+import io
+
+from django.conf import settings
+from django.contrib import admin, messages
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.db.models import Min
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
+from django.urls import path
+
+from busqueda.claves import BusquedaPorClaveMixin
+from SENA_APP.paginacion import PaginadorTotalCacheado
+
+from .forms import (
+    AsignacionesFormSet, CargarNotasForm, CursoAdminForm, ImportarAprendicesForm, InscribirAprendicesForm,
+)
+from .horarios import HorarioInvalido, leer_horario
+from .importacion import ArchivoInvalido, importar_aprendices
+from .inscripcion import inscribir_aprendices
+from .notas import cargar_notas
 from .models import Aprendiz, Curso, InstructorCurso, AprendizCurso
 
+
+def valores_distintos(queryset, campo, maximo=50):
+    """
+    Valores distintos de `campo` saltando por su índice: cada consulta busca el
+    menor valor mayor que el anterior, así que el costo depende de cuántos
+    valores hay y no del tamaño de la tabla (un DISTINCT la recorre completa).
+    """
+    valores = []
+    siguiente = queryset.aggregate(valor=Min(campo))['valor']
+    while siguiente is not None and len(valores) < maximo:
+        valores.append(siguiente)
+        siguiente = queryset.filter(**{f'{campo}__gt': siguiente}).aggregate(valor=Min(campo))['valor']
+    return valores
+
+
+class CiudadFilter(admin.SimpleListFilter):
+    """
+    Ciudades para el filtro lateral, guardadas FILTROS_ADMIN_TTL segundos; con
+    list_filter = ['ciudad'] el admin las leería en cada carga del listado.
+    Se leen con un solo DISTINCT que recorre aprendiz_ciudad_idx sin tocar la
+    tabla: saltar de ciudad en ciudad con valores_distintos sería una
+    consulta por ciudad.
+    """
+    title = 'ciudad'
+    parameter_name = 'ciudad'
+    maximo = 100
+
+    def lookups(self, request, model_admin):
+        ciudades = cache.get('admin:ciudades')
+        if ciudades is None:
+            ciudades = list(
+                Aprendiz.objects.exclude(ciudad=None).order_by('ciudad')
+                .values_list('ciudad', flat=True).distinct()[:self.maximo]
+            )
+            cache.set('admin:ciudades', ciudades, settings.FILTROS_ADMIN_TTL)
+        return [(ciudad, ciudad) for ciudad in ciudades]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(ciudad=self.value())
+        return queryset
+
+
 # Aprendiz Admin (actualizado)
 @admin.register(Aprendiz)
-class AprendizAdmin(admin.ModelAdmin):
+class AprendizAdmin(BusquedaPorClaveMixin, admin.ModelAdmin):
     list_display = [
         'documento_identidad', 
         'nombre_completo', 
@@ -11,15 +75,18 @@ class AprendizAdmin(admin.ModelAdmin):
         'telefono', 
         'ciudad'
     ]
-    list_filter = ['ciudad']
+    # El filtro por programa incluye la opción vacía: aprendices sin vincular
+    list_filter = [CiudadFilter, 'programa']
+    # '=' exacto por índice único, '^' prefijo de la clave normalizada (busqueda/claves.py)
     search_fields = [
-        'documento_identidad', 
-        'nombre', 
-        'apellido', 
-        'correo'
+        '=documento_identidad',
+        '^clave_nombre',
+        '^clave_apellido',
     ]
     list_per_page = 20
-    ordering = ['apellido', 'nombre']
+    # Con el id el orden es total y el admin no agrega '-pk', que mezclaría
+    # sentidos y obligaría a ordenar fuera de aprendiz_apellido_nombre_idx
+    ordering = ['apellido', 'nombre', 'id']
     
     fieldsets = (
         ('Información Personal', {
@@ -33,30 +100,112 @@ class AprendizAdmin(admin.ModelAdmin):
         ('Información de Contacto', {
             'fields': ('telefono', 'correo', 'ciudad')
         }),
+        ('Formación', {
+            'fields': ('programa', 'programa_texto')
+        }),
     )
+    readonly_fields = ['programa_texto']
 
     def nombre_completo(self, obj):
         return obj.nombre_completo()
     nombre_completo.short_description = 'Nombre Completo'
 
+    def get_urls(self):
+        urls = [
+            path('importar/', self.admin_site.admin_view(self.importar_csv), name='aprendices_aprendiz_importar'),
+        ]
+        return urls + super().get_urls()
+
+    def importar_csv(self, request):
+        # Carga masiva desde CSV (ver aprendices/importacion.py)
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        resultado = None
+        form = ImportarAprendicesForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            archivo = io.TextIOWrapper(form.cleaned_data['archivo'].file, encoding='utf-8-sig', newline='')
+            try:
+                resultado = importar_aprendices(archivo, simular=form.cleaned_data['simular'])
+            except (ArchivoInvalido, UnicodeDecodeError) as error:
+                messages.error(request, f"No se pudo leer el archivo: {error}")
+            else:
+                messages.success(request, f"{resultado.creadas} aprendices {'válidos' if form.cleaned_data['simular'] else 'creados'}, {resultado.rechazadas} filas rechazadas.")
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Importar aprendices desde CSV',
+            'form': form,
+            'resultado': resultado,
+        }
+        return TemplateResponse(request, 'admin/aprendices/aprendiz/importar.html', context)
+
+
+class InlinePaginado(admin.TabularInline):
+    """
+    Inline que muestra y guarda una página de `por_pagina` filas, elegida con
+    el parámetro `parametro_pagina` de la URL; el formulario se envía a la
+    misma URL, así que se guarda la misma página que se mostró.
+    """
+    template = 'admin/edit_inline/tabular_paginado.html'
+    por_pagina = 25
+    parametro_pagina = None
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        por_pagina = self.por_pagina
+        parametro = self.parametro_pagina or f'pagina_{self.model._meta.model_name}'
+
+        class FormSetPaginado(formset):
+            def get_queryset(self):
+                if not hasattr(self, 'pagina'):
+                    self.pagina = Paginator(super().get_queryset(), por_pagina).get_page(request.GET.get(parametro))
+                    self.urls_pagina = {}
+                    for nombre, disponible, numero in (
+                        ('anterior', self.pagina.has_previous, self.pagina.number - 1),
+                        ('siguiente', self.pagina.has_next, self.pagina.number + 1),
+                    ):
+                        if disponible():
+                            consulta = request.GET.copy()
+                            consulta[parametro] = numero
+                            self.urls_pagina[nombre] = f'?{consulta.urlencode()}'
+                return self.pagina.object_list
+
+        return FormSetPaginado
+
 
 # Inlines para el admin de Cursos: Los inlines permiten editar modelos relacionados dentro del formulario del modelo principal. 
 # Es como tener "mini-formularios" integrados.
-class InstructorCursoInline(admin.TabularInline):
+class InstructorCursoInline(InlinePaginado):
     model = InstructorCurso # ← Modelo de la tabla intermedia
     extra = 1 # ← Cuántas filas vacías mostrar por defecto
     fields = ['instructor', 'rol'] # ← Campos a mostrar en el inline
+    autocomplete_fields = ['instructor'] # ← Buscador en lugar de un <select> con todos los instructores
+    formset = AsignacionesFormSet # ← Rechaza instructores ocupados en el horario del curso
+
+    def get_queryset(self, request):
+        # El curso también: la columna de cada fila muestra str(), que incluye ambos
+        return super().get_queryset(request).select_related('instructor', 'curso')
 
 
-class AprendizCursoInline(admin.TabularInline):
+class AprendizCursoInline(InlinePaginado):
     model = AprendizCurso
     extra = 0 # ← No mostrar filas vacías
     fields = ['aprendiz', 'estado', 'nota_final', 'observaciones']
+    # Las inscripciones nuevas se hacen con "Inscribir aprendices" (una lista de
+    # documentos), así el inline no necesita un selector de aprendices
+    readonly_fields = ['aprendiz']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('aprendiz', 'curso')
+
+    def has_add_permission(self, request, obj=None):
+        return False
 
 
 # Admin principal de Cursos
 @admin.register(Curso)
-class CursoAdmin(admin.ModelAdmin):
+class CursoAdmin(BusquedaPorClaveMixin, admin.ModelAdmin):
     list_display = [
         'codigo',
         'nombre',
@@ -67,6 +216,9 @@ class CursoAdmin(admin.ModelAdmin):
         'estado',
         'cupos_info'
     ]
+    list_select_related = ['programa', 'instructor_coordinador']
+    # Sin date_hierarchy: sus enlaces salen de un DISTINCT sobre todas las
+    # fechas de inicio; el filtro por fecha_inicio tiene opciones fijas
     list_filter = [
         'estado',
         'programa__nivel_formacion',
@@ -74,16 +226,19 @@ class CursoAdmin(admin.ModelAdmin):
         'programa'
     ]
     search_fields = [
-        'codigo',
-        'nombre',
-        'programa__nombre',
-        'instructor_coordinador__nombre',
-        'instructor_coordinador__apellido'
+        '=codigo',
+        '^clave_nombre',
+        '^instructor_coordinador__clave_nombre',
+        '^instructor_coordinador__clave_apellido',
     ]
     list_per_page = 15
     ordering = ['-fecha_inicio']
-    date_hierarchy = 'fecha_inicio'
-    
+    paginator = PaginadorTotalCacheado
+    show_full_result_count = False
+    autocomplete_fields = ['programa', 'instructor_coordinador']
+    # Horario legible y sin choques de aula ni de coordinador (aprendices/horarios.py)
+    form = CursoAdminForm
+
     inlines = [InstructorCursoInline, AprendizCursoInline]
 
     fieldsets = (
@@ -110,29 +265,117 @@ class CursoAdmin(admin.ModelAdmin):
         }),
     )
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        try:
+            leer_horario(obj.horario)
+        except HorarioInvalido as error:
+            self.message_user(
+                request,
+                f"El horario «{obj.horario}» no tiene el formato de días y horas ({error}), así que no se "
+                f"revisan los choques de aula ni de instructores de este curso.",
+                messages.WARNING,
+            )
+
     def cupos_info(self, obj):
-        ocupados = obj.aprendices.count()
-        disponibles = obj.cupos_disponibles()
         porcentaje = obj.porcentaje_ocupacion()
-        return f"{ocupados}/{obj.cupos_maximos} ({porcentaje:.1f}%)"
+        return f"{obj.inscritos}/{obj.cupos_maximos} ({porcentaje:.1f}%)"
     cupos_info.short_description = 'Ocupación'
 
+    def get_urls(self):
+        urls = [
+            path('<int:object_id>/inscribir/', self.admin_site.admin_view(self.inscribir), name='aprendices_curso_inscribir'),
+            path('<int:object_id>/notas/', self.admin_site.admin_view(self.notas), name='aprendices_curso_notas'),
+        ]
+        return urls + super().get_urls()
+
+    def inscribir(self, request, object_id):
+        # Inscripción de un grupo en una sola operación (ver aprendices/inscripcion.py)
+        curso = get_object_or_404(Curso, pk=object_id)
+        if not self.has_change_permission(request, curso) or not request.user.has_perm('aprendices.add_aprendizcurso'):
+            raise PermissionDenied
+        resultado = None
+        form = InscribirAprendicesForm(request.POST or None)
+        if request.method == 'POST' and form.is_valid():
+            resultado = inscribir_aprendices(
+                curso.pk, form.cleaned_data['valores'], por=form.cleaned_data['por'], estado=form.cleaned_data['estado'],
+            )
+            if resultado.sin_cupo:
+                messages.error(request, f"No hay cupo para todo el grupo: quedan {resultado.cupos_disponibles} cupos. No se inscribió a nadie.")
+            else:
+                messages.success(request, f"{resultado.inscritos} aprendices inscritos, {resultado.rechazados} rechazados.")
+            curso.refresh_from_db(fields=['inscritos'])
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'original': curso,
+            'title': f'Inscribir aprendices en {curso}',
+            'form': form,
+            'resultado': resultado,
+        }
+        return TemplateResponse(request, 'admin/aprendices/curso/inscribir.html', context)
+
+    def notas(self, request, object_id):
+        # Notas de todo el curso desde un CSV (ver aprendices/notas.py)
+        curso = get_object_or_404(Curso, pk=object_id)
+        if not self.has_view_permission(request, curso) or not request.user.has_perm('aprendices.change_aprendizcurso'):
+            raise PermissionDenied
+        resultado = None
+        form = CargarNotasForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            archivo = io.TextIOWrapper(form.cleaned_data['archivo'].file, encoding='utf-8-sig', newline='')
+            try:
+                resultado = cargar_notas(curso.pk, archivo, simular=form.cleaned_data['simular'])
+            except (ArchivoInvalido, UnicodeDecodeError) as error:
+                messages.error(request, f"No se pudo leer el archivo: {error}")
+            else:
+                messages.success(request, f"{len(resultado.cambiadas)} inscripciones {'por cambiar' if form.cleaned_data['simular'] else 'actualizadas'}, {len(resultado.sin_cambios)} sin cambios, {len(resultado.rechazadas)} filas rechazadas.")
+
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'original': curso,
+            'title': f'Cargar notas de {curso}',
+            'form': form,
+            'resultado': resultado,
+        }
+        return TemplateResponse(request, 'admin/aprendices/curso/notas.html', context)
+
+
+class RolFilter(admin.SimpleListFilter):
+    title = 'rol en el curso'
+    parameter_name = 'rol'
+
+    def lookups(self, request, model_admin):
+        return [(rol, rol) for rol in valores_distintos(InstructorCurso.objects.all(), 'rol')]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(rol=self.value())
+        return queryset
+
 
 # Admin para las relaciones
 @admin.register(InstructorCurso)
-class InstructorCursoAdmin(admin.ModelAdmin):
+class InstructorCursoAdmin(BusquedaPorClaveMixin, admin.ModelAdmin):
     list_display = ['instructor', 'curso', 'rol', 'fecha_asignacion']
-    list_filter = ['rol', 'fecha_asignacion']
+    list_select_related = ['instructor', 'curso']
+    list_filter = [RolFilter, 'fecha_asignacion']
+    paginator = PaginadorTotalCacheado
+    show_full_result_count = False
+    autocomplete_fields = ['instructor', 'curso']
     search_fields = [
-        'instructor__nombre',
-        'instructor__apellido',
-        'curso__nombre',
-        'curso__codigo'
+        '=instructor__documento_identidad',
+        '=curso__codigo',
+        '^instructor__clave_nombre',
+        '^instructor__clave_apellido',
+        '^curso__clave_nombre',
     ]
 
 
 @admin.register(AprendizCurso)
-class AprendizCursoAdmin(admin.ModelAdmin):
+class AprendizCursoAdmin(BusquedaPorClaveMixin, admin.ModelAdmin):
     list_display = [
         'aprendiz',
         'curso',
@@ -140,12 +383,20 @@ class AprendizCursoAdmin(admin.ModelAdmin):
         'nota_final',
         'fecha_inscripcion'
     ]
+    list_select_related = ['aprendiz', 'curso']
     list_filter = ['estado', 'fecha_inscripcion']
+    paginator = PaginadorTotalCacheado
+    show_full_result_count = False
+    # El buscador de aprendices haría un LIKE sobre toda la tabla por cada tecla
+    raw_id_fields = ['aprendiz']
+    autocomplete_fields = ['curso']
     search_fields = [
-        'aprendiz__nombre',
-        'aprendiz__apellido',
-        'aprendiz__documento_identidad',
-        'curso__nombre',
-        'curso__codigo'
+        '=aprendiz__documento_identidad',
+        '=curso__codigo',
+        '^aprendiz__clave_nombre',
+        '^aprendiz__clave_apellido',
+        '^curso__clave_nombre',
     ]
-    list_editable = ['estado', 'nota_final']
\ No newline at end of file
+    list_editable = ['estado', 'nota_final']
+    # Cada fila editable es un formulario: el render domina el tiempo de la página
+    list_per_page = 50
\ No newline at end of file
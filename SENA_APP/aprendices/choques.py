@@ -0,0 +1,54 @@
+"""
+Choques de aula e instructor entre cursos, sobre las ocupaciones indexadas
+de aprendices/horarios.py.
+
+`choques` revisa un curso antes de guardarlo (lo usan los formularios de
+CursoAdmin) con una consulta por el índice (recurso, fecha_fin);
+`todos_los_choques` recorre la tabla completa una vez, ordenada, para el
+comando `choques_horario`. `actualizar_ocupaciones` la usan las señales.
+"""
+from .horarios import Intervalo, buscar_choques, intervalos, reconstruir_ocupaciones, recurso_aula, se_cruzan
+from .models import Curso, InstructorCurso, Ocupacion
+
+
+def actualizar_ocupaciones(curso_id):
+    reconstruir_ocupaciones(Curso, InstructorCurso, Ocupacion, ids=[curso_id])
+
+
+def choques(curso, aula=True, instructores=()):
+    """
+    Ocupaciones de otros cursos que chocan con `curso`, que puede no estar
+    guardado, en su aula (si `aula`) o en alguno de `instructores` (ids).
+    Devuelve pares (recurso, ocupación) con el código y el nombre del otro
+    curso cargados. El horario de `curso` se asume válido.
+    """
+    propios = intervalos(curso, instructores)
+    if not aula:
+        propios = [intervalo for intervalo in propios if intervalo.recurso != recurso_aula(curso.aula)]
+    if not propios:
+        return []
+    candidatas = Ocupacion.objects.filter(
+        recurso__in={intervalo.recurso for intervalo in propios},
+        fecha_fin__gte=curso.fecha_inicio,
+        fecha_inicio__lte=curso.fecha_fin,
+    ).select_related('curso').only(*Intervalo._fields[2:], 'recurso', 'curso__codigo', 'curso__nombre')
+    if curso.pk is not None:
+        candidatas = candidatas.exclude(curso_id=curso.pk)
+    return [
+        (ocupacion.recurso, ocupacion)
+        for ocupacion in candidatas
+        if any(intervalo.recurso == ocupacion.recurso and se_cruzan(intervalo, ocupacion) for intervalo in propios)
+    ]
+
+
+def todos_los_choques(desde=None):
+    """
+    Pares (anterior, ocupación) de Intervalo que chocan, solo entre
+    ocupaciones que terminan desde la fecha `desde` si se indica.
+    """
+    filas = Ocupacion.objects.order_by('recurso', 'fecha_inicio')
+    if desde is not None:
+        filas = filas.filter(fecha_fin__gte=desde)
+    filas = filas.values_list(*Intervalo._fields).iterator(chunk_size=5000)
+    return buscar_choques(Intervalo._make(fila) for fila in filas)
+
@@ -0,0 +1,45 @@
+"""
+Contador desnormalizado de aprendices inscritos por curso.
+
+`Curso.inscritos` se mantiene con UPDATE atómicos (F expressions) desde las
+señales de `AprendizCurso`; las inserciones masivas que no disparan señales
+deben llamar a `recalcular_inscritos` con los cursos afectados.
+"""
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import AprendizCurso, Curso
+
+
+def sumar_inscritos(curso_id, cantidad=1):
+    Curso.objects.filter(pk=curso_id).update(inscritos=F('inscritos') + cantidad)
+
+
+def restar_inscritos(curso_id, cantidad=1):
+    Curso.objects.filter(pk=curso_id, inscritos__gte=cantidad).update(inscritos=F('inscritos') - cantidad)
+
+
+def subconsulta_inscritos():
+    conteo = (
+        AprendizCurso.objects.filter(curso=OuterRef('pk'))
+        .order_by()
+        .values('curso')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    return Coalesce(Subquery(conteo), Value(0))
+
+
+def recalcular_inscritos(cursos=None):
+    """
+    Recalcula el contador de todos los cursos (o de los ids indicados) con un
+    único UPDATE ... SET inscritos = (SELECT COUNT(*) ...). Solo se tocan los
+    cursos cuyo contador no coincide, para no cambiar la marca de
+    actualización de los demás. Devuelve las filas corregidas.
+    """
+    queryset = Curso.objects.all()
+    if cursos is not None:
+        queryset = queryset.filter(pk__in=cursos)
+    queryset = queryset.annotate(contados=subconsulta_inscritos()).exclude(inscritos=F('contados'))
+    return queryset.update(inscritos=subconsulta_inscritos(), fecha_actualizacion=timezone.now())
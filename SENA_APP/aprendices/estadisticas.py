@@ -0,0 +1,70 @@
+"""
+Instantánea de las estadísticas de la página de inicio.
+
+Los cinco conteos se obtienen en una sola consulta con subconsultas escalares
+y se guardan durante ESTADISTICAS_TTL segundos en la caché 'compartida'. Las
+señales de `aprendices.signals` borran la entrada cuando cambia alguno de los
+modelos contados, así que en estado estable la página de inicio no consulta
+la base de datos. La caché debe ser común a todos los procesos: en una por
+proceso (LocMemCache) el borrado no llegaría a los demás.
+
+`aobtener_estadisticas` es la versión para la vista asíncrona: los cinco
+conteos siguen yendo en una sola sentencia, que cuesta un único viaje a la
+base de datos (menos que cinco consultas concurrentes en conexiones
+distintas).
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+
+from instructores.models import Instructor
+from programas.models import Programa
+
+from .models import Aprendiz, Curso
+
+CLAVE_CACHE = 'estadisticas:inicio'
+
+
+def _cache():
+    return caches['compartida']
+
+
+def calcular_estadisticas():
+    activos = ', '.join(['%s'] * len(Curso.ESTADOS_ACTIVOS))
+    sql = f"""
+        SELECT
+            (SELECT COUNT(*) FROM {Aprendiz._meta.db_table}),
+            (SELECT COUNT(*) FROM {Instructor._meta.db_table}),
+            (SELECT COUNT(*) FROM {Programa._meta.db_table}),
+            (SELECT COUNT(*) FROM {Curso._meta.db_table}),
+            (SELECT COUNT(*) FROM {Curso._meta.db_table} WHERE estado IN ({activos}))
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, Curso.ESTADOS_ACTIVOS)
+        fila = cursor.fetchone()
+
+    return dict(zip(
+        ['total_aprendices', 'total_instructores', 'total_programas', 'total_cursos', 'cursos_activos'],
+        fila,
+    ))
+
+
+def obtener_estadisticas():
+    estadisticas = _cache().get(CLAVE_CACHE)
+    if estadisticas is None:
+        estadisticas = calcular_estadisticas()
+        _cache().set(CLAVE_CACHE, estadisticas, settings.ESTADISTICAS_TTL)
+    return estadisticas
+
+
+def invalidar_estadisticas():
+    _cache().delete(CLAVE_CACHE)
+
+
+async def aobtener_estadisticas():
+    estadisticas = await _cache().aget(CLAVE_CACHE)
+    if estadisticas is None:
+        estadisticas = await sync_to_async(calcular_estadisticas)()
+        await _cache().aset(CLAVE_CACHE, estadisticas, settings.ESTADISTICAS_TTL)
+    return estadisticas
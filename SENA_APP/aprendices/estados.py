@@ -0,0 +1,134 @@
+"""
+Avance de los estados de cursos e inscripciones según las fechas del curso.
+
+Cada transición es un queryset con las filas que deben cambiar y el estado
+nuevo. `avanzar_estados` las aplica en orden, por lotes de `tamano_lote`
+filas con una transacción por lote: cada lote se lee por el índice (estado,
+id), se actualiza con un solo `UPDATE ... WHERE id IN (...)` y se marcan las
+páginas que lo muestran, como harían las señales (update() no las emite).
+
+Cursos (salvo cancelados y suspendidos):
+
+- PRO/INI/EJE -> FIN cuando pasó fecha_fin.
+- PRO/INI -> EJE cuando empezó hace más de DIAS_INICIO días.
+- PRO -> INI cuando empezó hace menos.
+
+Inscripciones:
+
+- INS/ACT -> GRA con nota_final aprobatoria en un curso finalizado.
+- INS -> ACT en un curso que ya empezó.
+
+Las condiciones sobre el curso de las inscripciones valen igual antes y
+después de avanzar los cursos, así que simular (contar sin cambiar nada) da
+los mismos números que ejecutar. Las inscripciones de cursos finalizados sin
+nota aprobatoria quedan como están y se informan como pendientes. Las
+ocupaciones de horario (aprendices/horarios.py) no cambian: de los estados
+solo depende si el curso está cancelado.
+"""
+import datetime
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from instructores.models import Instructor
+from programas.models import Programa
+
+from .estadisticas import invalidar_estadisticas
+from .models import Aprendiz, AprendizCurso, Curso, InstructorCurso
+from .signals import tocar
+
+TAMANO_LOTE = 2000
+# Días desde fecha_inicio en que un curso pasa de Iniciado a En Ejecución
+DIAS_INICIO = 30
+NOTA_APROBATORIA = Decimal('3.0')
+
+
+@dataclass
+class ResultadoAvance:
+    # descripción de la transición -> filas
+    cambios: dict = field(default_factory=dict)
+    pendientes_de_nota: int = 0
+
+    @property
+    def total(self):
+        return sum(self.cambios.values())
+
+
+def _cursos_iniciados(hoy):
+    return Curso.objects.filter(Q(estado__in=['INI', 'EJE', 'FIN']) | Q(estado='PRO', fecha_inicio__lte=hoy))
+
+
+def _cursos_finalizados(hoy):
+    return Curso.objects.filter(Q(estado='FIN') | Q(estado__in=['PRO', 'INI', 'EJE'], fecha_fin__lt=hoy))
+
+
+def transiciones(hoy):
+    """(descripción, filas que cambian, estado nuevo), en el orden en que se aplican."""
+    hace_dias_inicio = hoy - datetime.timedelta(days=DIAS_INICIO)
+    aprobados = Q(nota_final__gte=NOTA_APROBATORIA, curso__in=_cursos_finalizados(hoy).values('pk'))
+    return [
+        ("Cursos terminados -> FIN",
+         Curso.objects.filter(estado__in=['PRO', 'INI', 'EJE'], fecha_fin__lt=hoy), 'FIN'),
+        (f"Cursos iniciados hace más de {DIAS_INICIO} días -> EJE",
+         Curso.objects.filter(estado__in=['PRO', 'INI'], fecha_inicio__lte=hace_dias_inicio, fecha_fin__gte=hoy), 'EJE'),
+        ("Cursos iniciados -> INI",
+         Curso.objects.filter(estado='PRO', fecha_inicio__lte=hoy, fecha_inicio__gt=hace_dias_inicio, fecha_fin__gte=hoy), 'INI'),
+        ("Inscripciones aprobadas en cursos finalizados -> GRA",
+         AprendizCurso.objects.filter(aprobados, estado__in=['INS', 'ACT']), 'GRA'),
+        ("Inscripciones en cursos iniciados -> ACT",
+         AprendizCurso.objects.filter(estado='INS', curso__in=_cursos_iniciados(hoy).values('pk')).exclude(aprobados), 'ACT'),
+    ]
+
+
+def _marcar(modelo, ids):
+    if modelo is Curso:
+        # detalle_programa y detalle_instructor listan sus cursos con el estado
+        tocar(Programa.objects.filter(curso__in=ids))
+        # Dos subconsultas IN: el OR de dos joins recorría todas las asignaciones
+        tocar(Instructor.objects.filter(
+            Q(pk__in=Curso.objects.filter(pk__in=ids).values('instructor_coordinador'))
+            | Q(pk__in=InstructorCurso.objects.filter(curso__in=ids).values('instructor'))
+        ))
+    else:
+        # detalle_curso y detalle_aprendiz muestran el estado de cada inscripción
+        tocar(Curso.objects.filter(aprendizcurso__in=ids))
+        tocar(Aprendiz.objects.filter(aprendizcurso__in=ids))
+
+
+def _actualizar_por_lotes(filas, estado, tamano_lote):
+    modelo = filas.model
+    cambios = {'estado': estado}
+    if modelo is Curso:
+        cambios['fecha_actualizacion'] = timezone.now()
+    actualizadas = 0
+    ultimo = 0
+    while True:
+        with transaction.atomic():
+            ids = list(filas.filter(pk__gt=ultimo).order_by('pk').values_list('pk', flat=True)[:tamano_lote])
+            if not ids:
+                return actualizadas
+            ultimo = ids[-1]
+            actualizadas += modelo.objects.filter(pk__in=ids).update(**cambios)
+            _marcar(modelo, ids)
+
+
+def avanzar_estados(hoy=None, simular=False, tamano_lote=TAMANO_LOTE):
+    """
+    Aplica las transiciones con la fecha de referencia `hoy` (por defecto, la
+    fecha local). Con `simular=True` solo cuenta las filas que cambiarían.
+    """
+    hoy = hoy or timezone.localdate()
+    resultado = ResultadoAvance()
+    for descripcion, filas, estado in transiciones(hoy):
+        resultado.cambios[descripcion] = filas.count() if simular else _actualizar_por_lotes(filas, estado, tamano_lote)
+    resultado.pendientes_de_nota = (
+        AprendizCurso.objects.filter(estado__in=['INS', 'ACT'], curso__in=_cursos_finalizados(hoy).values('pk'))
+        .exclude(nota_final__gte=NOTA_APROBATORIA)
+        .count()
+    )
+    if resultado.total and not simular:
+        invalidar_estadisticas()
+    return resultado
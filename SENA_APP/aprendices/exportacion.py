@@ -0,0 +1,204 @@
+"""
+Exportación de aprendices, cursos e inscripciones en CSV o XLSX.
+
+Las filas salen de `values_list(...).iterator(chunk_size=...)`, así que nunca
+se construyen instancias de modelo ni se carga la tabla completa: cada
+formato se genera como un iterador de bytes que `StreamingHttpResponse`
+envía a medida que se produce. El encabezado se envía antes de ejecutar la
+consulta, por lo que el primer byte llega de inmediato.
+
+El XLSX se escribe con `zipfile` sobre un búfer que se vacía en cada bloque
+(sin dependencias externas); las celdas de texto van como `inlineStr`, sin
+tabla de cadenas compartidas, para no tener que guardar nada en memoria.
+"""
+import csv
+import re
+import zipfile
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from django.db.models import Value
+from django.db.models.functions import Concat
+
+from .models import AprendizCurso, Aprendiz, Curso
+
+TAMANO_BLOQUE = 2000
+
+ESTADOS_CURSO = dict(Curso.ESTADO_CHOICES)
+ESTADOS_INSCRIPCION = dict(AprendizCurso.ESTADO_CHOICES)
+
+
+def _aprendices(filtros):
+    return Aprendiz.objects.order_by('id').values_list(
+        'documento_identidad', 'nombre', 'apellido', 'programa__nombre', 'telefono', 'correo', 'fecha_nacimiento', 'ciudad',
+    )
+
+
+def _cursos(filtros):
+    return Curso.objects.order_by('id').annotate(
+        coordinador=Concat('instructor_coordinador__nombre', Value(' '), 'instructor_coordinador__apellido'),
+    ).values_list(
+        'codigo', 'nombre', 'programa__codigo', 'programa__nombre', 'coordinador', 'fecha_inicio', 'fecha_fin',
+        'horario', 'aula', 'cupos_maximos', 'inscritos', 'estado',
+    )
+
+
+def _inscripciones(filtros):
+    queryset = AprendizCurso.objects.order_by('curso_id', 'id')
+    if filtros.get('curso', '').isdigit():
+        queryset = queryset.filter(curso_id=filtros['curso'])
+    return queryset.values_list(
+        'curso__codigo', 'curso__nombre', 'aprendiz__documento_identidad', 'aprendiz__nombre',
+        'aprendiz__apellido', 'estado', 'nota_final', 'fecha_inscripcion',
+    )
+
+
+# recurso: (función que arma el queryset, encabezados, {índice de columna: traducción})
+EXPORTACIONES = {
+    'aprendices': (
+        _aprendices,
+        ['Documento', 'Nombre', 'Apellido', 'Programa', 'Teléfono', 'Correo', 'Fecha de nacimiento', 'Ciudad'],
+        {},
+    ),
+    'cursos': (
+        _cursos,
+        ['Código', 'Nombre', 'Código programa', 'Programa', 'Coordinador', 'Fecha de inicio', 'Fecha de fin',
+         'Horario', 'Aula', 'Cupos máximos', 'Inscritos', 'Estado'],
+        {11: ESTADOS_CURSO},
+    ),
+    'inscripciones': (
+        _inscripciones,
+        ['Código curso', 'Curso', 'Documento', 'Nombre', 'Apellido', 'Estado', 'Nota final', 'Fecha de inscripción'],
+        {5: ESTADOS_INSCRIPCION},
+    ),
+}
+
+
+def filas(recurso, filtros=None, tamano_bloque=TAMANO_BLOQUE):
+    """Produce los encabezados y luego cada fila como tupla."""
+    construir, encabezados, traducciones = EXPORTACIONES[recurso]
+    yield encabezados
+    for fila in construir(filtros or {}).iterator(chunk_size=tamano_bloque):
+        if traducciones:
+            fila = list(fila)
+            for indice, etiquetas in traducciones.items():
+                fila[indice] = etiquetas.get(fila[indice], fila[indice])
+        yield fila
+
+
+class _Eco:
+    """Objeto tipo archivo que devuelve lo escrito en vez de guardarlo."""
+
+    def write(self, valor):
+        return valor
+
+
+def csv_en_bloques(filas, tamano_bloque=TAMANO_BLOQUE):
+    escritor = csv.writer(_Eco())
+    filas = iter(filas)
+    # BOM para que Excel reconozca UTF-8, junto con los encabezados
+    yield ('\ufeff' + escritor.writerow(next(filas))).encode()
+    bloque = []
+    for fila in filas:
+        bloque.append(escritor.writerow(fila))
+        if len(bloque) >= tamano_bloque:
+            yield ''.join(bloque).encode()
+            bloque = []
+    if bloque:
+        yield ''.join(bloque).encode()
+
+
+class _Bufer:
+    """Destino no posicionable para `zipfile`; se vacía después de cada escritura."""
+
+    def __init__(self):
+        self.partes = []
+
+    def write(self, datos):
+        self.partes.append(bytes(datos))
+        return len(datos)
+
+    def flush(self):
+        pass
+
+    def vaciar(self):
+        datos = b''.join(self.partes)
+        self.partes = []
+        return datos
+
+
+_CONTROL = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_ESTATICOS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        '</Relationships>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '</Relationships>'
+    ),
+}
+
+_LIBRO = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{hoja}" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+
+
+def _celda(valor):
+    if valor is None:
+        return '<c/>'
+    if isinstance(valor, (int, float, Decimal)) and not isinstance(valor, bool):
+        return f'<c><v>{valor}</v></c>'
+    texto = escape(_CONTROL.sub('', str(valor)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{texto}</t></is></c>'
+
+
+def xlsx_en_bloques(filas, hoja='Datos', tamano_bloque=TAMANO_BLOQUE):
+    bufer = _Bufer()
+    with zipfile.ZipFile(bufer, 'w', compression=zipfile.ZIP_DEFLATED) as libro:
+        for nombre, contenido in _ESTATICOS.items():
+            libro.writestr(nombre, contenido)
+        libro.writestr('xl/workbook.xml', _LIBRO.format(hoja=escape(hoja)))
+        yield bufer.vaciar()
+
+        with libro.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as hoja_xml:
+            hoja_xml.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            bloque = []
+            for fila in filas:
+                bloque.append('<row>' + ''.join(_celda(valor) for valor in fila) + '</row>')
+                if len(bloque) >= tamano_bloque:
+                    hoja_xml.write(''.join(bloque).encode())
+                    bloque = []
+                    yield bufer.vaciar()
+            hoja_xml.write(''.join(bloque).encode() + b'</sheetData></worksheet>')
+    yield bufer.vaciar()
+
+
+FORMATOS = {
+    'csv': (csv_en_bloques, 'text/csv; charset=utf-8'),
+    'xlsx': (xlsx_en_bloques, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
@@ -1,5 +1,15 @@
+import logging
+
 from django import forms
-from .models import Aprendiz
+from django.forms.models import BaseInlineFormSet
+from instructores.models import Instructor
+from programas.models import Programa
+from .choques import choques
+from .horarios import HorarioInvalido, describir, leer_horario, recurso_aula, recurso_instructor
+from .inscripcion import POR_DOCUMENTO, POR_ID, leer_identificadores
+from .models import Aprendiz, AprendizCurso, Curso, InstructorCurso
+
+logger = logging.getLogger(__name__)
 
 
 class AprendizForm(forms.Form):
@@ -27,12 +37,12 @@ class AprendizForm(forms.Form):
             'placeholder': 'Ingrese el apellido'
         })
     )
-    programa = forms.CharField(
-        max_length=100, 
+    programa = forms.ModelChoiceField(
+        queryset=Programa.objects.only('codigo', 'nombre'),
         label="Programa",
-        widget=forms.TextInput(attrs={
-            'class': 'form-control',
-            'placeholder': 'Ingrese el programa de formación'
+        empty_label="Seleccione el programa de formación",
+        widget=forms.Select(attrs={
+            'class': 'form-select'
         })
     )
     telefono = forms.CharField(
@@ -69,6 +79,12 @@ class AprendizForm(forms.Form):
         })
     )
     
+    def __init__(self, *args, verificar_duplicados=True, **kwargs):
+        # La importación masiva valida duplicados por lotes con una sola
+        # consulta IN (ver aprendices/importacion.py) y desactiva la de cada fila.
+        super().__init__(*args, **kwargs)
+        self.verificar_duplicados = verificar_duplicados
+
     #Validaciones personalizadas 
     def clean(self):
         cleaned_data = super().clean()
@@ -87,7 +103,7 @@ class AprendizForm(forms.Form):
             raise forms.ValidationError("El documento debe contener solo números.")
         
         # Verificar si ya existe
-        if Aprendiz.objects.filter(documento_identidad=documento).exists():
+        if self.verificar_duplicados and Aprendiz.objects.filter(documento_identidad=documento).exists():
             raise forms.ValidationError("Ya existe un aprendiz con este documento.")
         
         return documento
@@ -101,22 +117,193 @@ class AprendizForm(forms.Form):
     
     #Crear un método para guardar los datos del formulario en la base de datos
     def save(self):
-        print("=== EJECUTANDO save() EN AprendizForm ===")
-        print(f"Datos a guardar: {self.cleaned_data}")
-        
+        aprendiz = Aprendiz.objects.create(
+            documento_identidad=self.cleaned_data['documento_identidad'],
+            nombre=self.cleaned_data['nombre'],
+            apellido=self.cleaned_data['apellido'],
+            programa=self.cleaned_data['programa'],
+            telefono=self.cleaned_data.get('telefono'),
+            correo=self.cleaned_data.get('correo'),
+            fecha_nacimiento=self.cleaned_data['fecha_nacimiento'],
+            ciudad=self.cleaned_data.get('ciudad')
+        )
+        logger.info("Aprendiz %s creado", aprendiz.pk)
+        return aprendiz
+
+class AprendizImportForm(AprendizForm):
+    """
+    Una fila de la importación masiva (aprendices/importacion.py). El programa
+    se resuelve aparte con el índice de programas y los duplicados se buscan
+    por lotes, así que no se validan aquí.
+    """
+    programa = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, verificar_duplicados=False, **kwargs)
+
+
+class ImportarAprendicesForm(forms.Form):
+    archivo = forms.FileField(
+        label="Archivo CSV",
+        help_text="Columnas: documento_identidad, nombre, apellido, programa (nombre o código), telefono, correo, fecha_nacimiento, ciudad.",
+    )
+    simular = forms.BooleanField(
+        required=False,
+        label="Solo validar",
+        help_text="Revisa el archivo y muestra los errores sin crear aprendices.",
+    )
+
+
+class CargarNotasForm(forms.Form):
+    archivo = forms.FileField(
+        label="Archivo CSV",
+        help_text="Columnas: documento_identidad, nota_final (0.0 a 5.0) y, opcionalmente, estado (INS, ACT, DES, GRA, SUS). Una celda vacía deja el valor actual.",
+    )
+    simular = forms.BooleanField(
+        required=False,
+        label="Solo revisar",
+        help_text="Muestra los cambios que se harían sin guardarlos.",
+    )
+
+
+class InscribirAprendicesForm(forms.Form):
+    identificadores = forms.CharField(
+        label="Aprendices",
+        widget=forms.Textarea(attrs={'rows': 10, 'cols': 40}),
+        help_text="Un id o documento por línea (también separados por comas o espacios).",
+    )
+    por = forms.ChoiceField(
+        label="Identificar por",
+        choices=[(POR_DOCUMENTO, "Documento de identidad"), (POR_ID, "Id del aprendiz")],
+        initial=POR_DOCUMENTO,
+    )
+    estado = forms.ChoiceField(
+        label="Estado inicial",
+        choices=AprendizCurso.ESTADO_CHOICES,
+        initial='INS',
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        valores = leer_identificadores(cleaned_data.get('identificadores', ''))
+        if cleaned_data.get('por') == POR_ID:
+            invalidos = [valor for valor in valores if not valor.isdigit()]
+            if invalidos:
+                self.add_error('identificadores', f"Ids no numéricos: {', '.join(invalidos[:10])}")
+        if not valores:
+            self.add_error('identificadores', "Indique al menos un aprendiz.")
+        cleaned_data['valores'] = valores
+        return cleaned_data
+
+
+# Choques mostrados por campo; con más, se resume el resto
+MAX_CHOQUES_MOSTRADOS = 3
+
+
+def _mensajes_choques(quien, ocupaciones):
+    mensajes = [
+        f"{quien} choca con {ocupacion.curso} ({describir(ocupacion)})."
+        for ocupacion in ocupaciones[:MAX_CHOQUES_MOSTRADOS]
+    ]
+    if len(ocupaciones) > MAX_CHOQUES_MOSTRADOS:
+        mensajes.append(f"Y {len(ocupaciones) - MAX_CHOQUES_MOSTRADOS} choques más.")
+    return mensajes
+
+
+class CursoAdminForm(forms.ModelForm):
+    """Curso en el admin: el horario debe poder leerse y el aula y el coordinador estar libres."""
+
+    class Meta:
+        model = Curso
+        fields = '__all__'
+
+    def clean_horario(self):
+        horario = self.cleaned_data['horario']
+        # Los horarios en texto libre anteriores al formato estructurado se
+        # conservan mientras no se editen: el curso no ocupa aula ni instructores
+        # (ver CursoAdmin.save_model)
+        if 'horario' not in self.changed_data:
+            return horario
         try:
-            aprendiz = Aprendiz.objects.create(
-                documento_identidad=self.cleaned_data['documento_identidad'],
-                nombre=self.cleaned_data['nombre'],
-                apellido=self.cleaned_data['apellido'],
-                programa=self.cleaned_data['programa'],
-                telefono=self.cleaned_data.get('telefono'),
-                correo=self.cleaned_data.get('correo'),
-                fecha_nacimiento=self.cleaned_data['fecha_nacimiento'],
-                ciudad=self.cleaned_data.get('ciudad')
-            )
-            print(f"=== APRENDIZ CREADO CON ID: {aprendiz.id} ===")
-            return aprendiz
-        except Exception as e:
-            print(f"=== ERROR EN save() DE AprendizForm: {e} ===")
-            raise
\ No newline at end of file
+            leer_horario(horario)
+        except HorarioInvalido as error:
+            raise forms.ValidationError(f"{error} Ejemplo: «Lunes a Viernes 7:00-13:00; Sábados 8:00-12:00».")
+        return horario
+
+    def clean(self):
+        cleaned_data = super().clean()
+        campos = ['fecha_inicio', 'fecha_fin', 'horario', 'aula', 'estado', 'instructor_coordinador']
+        if any(cleaned_data.get(campo) is None for campo in campos):
+            return cleaned_data
+        if cleaned_data['fecha_fin'] < cleaned_data['fecha_inicio']:
+            self.add_error('fecha_fin', "La fecha de finalización no puede ser anterior a la de inicio.")
+            return cleaned_data
+
+        curso = Curso(pk=self.instance.pk, **{campo: cleaned_data[campo] for campo in campos})
+        coordinador = cleaned_data['instructor_coordinador']
+        por_recurso = {recurso_aula(curso.aula): [], recurso_instructor(coordinador.pk): []}
+        for recurso, ocupacion in choques(curso, instructores=[coordinador.pk]):
+            por_recurso[recurso].append(ocupacion)
+        for campo, quien, recurso in [
+            ('aula', f"El aula {curso.aula}", recurso_aula(curso.aula)),
+            ('instructor_coordinador', f"El instructor {coordinador}", recurso_instructor(coordinador.pk)),
+        ]:
+            for mensaje in _mensajes_choques(quien, por_recurso[recurso]):
+                self.add_error(campo, mensaje)
+        return cleaned_data
+
+
+class AsignacionesFormSet(BaseInlineFormSet):
+    """
+    Instructores del curso en CursoAdmin: ninguno puede estar ocupado en el
+    horario del curso. Se revisan los que quedarán asignados al guardar, no
+    solo los de la página que muestra el inline.
+    """
+
+    def clean(self):
+        super().clean()
+        curso = self.instance
+        if any(self.errors):
+            return
+        try:
+            leer_horario(curso.horario)
+        except HorarioInvalido:
+            # El formulario del curso ya muestra el error
+            return
+
+        asignados = {}
+        if curso.pk is not None:
+            asignados = dict(InstructorCurso.objects.filter(curso_id=curso.pk).values_list('pk', 'instructor_id'))
+        formularios = {}
+        for numero, form in enumerate(self.forms):
+            if form.instance.pk is None and not form.has_changed():
+                continue
+            if self.can_delete and self._should_delete_form(form):
+                asignados.pop(form.instance.pk, None)
+                continue
+            instructor = form.cleaned_data.get('instructor')
+            if instructor is not None:
+                asignados[form.instance.pk or f'nuevo-{numero}'] = instructor.pk
+                formularios[recurso_instructor(instructor.pk)] = (form, instructor)
+        # El coordinador lo revisa el formulario del curso
+        instructores = set(asignados.values()) - {curso.instructor_coordinador_id}
+
+        por_recurso = {}
+        for recurso, ocupacion in choques(curso, aula=False, instructores=instructores):
+            por_recurso.setdefault(recurso, []).append(ocupacion)
+        otros = {}
+        for recurso, ocupaciones in por_recurso.items():
+            if recurso in formularios:
+                form, instructor = formularios[recurso]
+                for mensaje in _mensajes_choques(f"El instructor {instructor}", ocupaciones):
+                    form.add_error('instructor', mensaje)
+            else:
+                otros[int(recurso.removeprefix(recurso_instructor('')))] = ocupaciones
+        if otros:
+            # Asignados en otra página del inline: chocan por el nuevo horario o las nuevas fechas del curso
+            nombres = Instructor.objects.in_bulk(list(otros))
+            raise forms.ValidationError([
+                mensaje
+                for instructor_id, ocupaciones in otros.items()
+                for mensaje in _mensajes_choques(f"El instructor {nombres.get(instructor_id)}", ocupaciones)
+            ])
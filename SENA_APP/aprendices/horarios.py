@@ -0,0 +1,240 @@
+"""
+Horarios estructurados y choques de aula e instructor entre cursos.
+
+`Curso.horario` es texto libre: "Lunes a Viernes 7:00-13:00", "Sábados
+8:00-17:00", "Lunes, Miércoles y Viernes 18:00 a 22:00; Sábados 8:00-12:00".
+`leer_horario` lo convierte en franjas: los días de la semana como máscara de
+bits (lunes = 1, martes = 2, ..., domingo = 64) y un rango de horas. Un texto
+que no tiene esa forma levanta `HorarioInvalido`.
+
+Un curso ocupa sus recursos (el aula y cada uno de sus instructores,
+coordinador incluido) en sus franjas entre fecha_inicio y fecha_fin. Esas
+ocupaciones se guardan en `Ocupacion`, una fila por recurso y franja, con el
+índice (recurso, fecha_fin). Dos ocupaciones del mismo recurso chocan si sus
+fechas se cruzan, tienen algún día en común y sus horas se cruzan.
+
+- Para un curso que se va a guardar (aprendices/choques.py) se buscan en el
+  índice, por cada recurso, las ocupaciones que terminan después de que el
+  curso empieza: las ya terminadas, casi todas en un aula con años de
+  historia, no se leen. El costo es O(log n) más las ocupaciones vigentes o
+  futuras de esos recursos.
+- `buscar_choques` encuentra todos los choques con un barrido por recurso en
+  orden de fecha_inicio, que guarda en un montículo (por fecha_fin) las
+  ocupaciones aún vigentes: O(n log n) más los pares que se comparan.
+
+Los cursos cancelados y los de horario ilegible no ocupan nada.
+`reconstruir_ocupaciones` recibe los modelos como argumento; la migración
+0014 tiene su propia copia de la lectura de horarios y de la reconstrucción.
+"""
+import heapq
+import re
+from collections import defaultdict, namedtuple
+from datetime import time
+
+from django.db import transaction
+
+from busqueda.normalizacion import normalizar_texto
+
+TAMANO_LOTE = 2000
+
+DIAS = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
+# Nombre, plural y abreviaturas de dos y tres letras: 'sabados', 'mie', 'ju'
+_DIAS = {}
+for _numero, _nombre in enumerate(DIAS):
+    _clave = normalizar_texto(_nombre)
+    for _forma in (_clave, _clave + 's', _clave[:3], _clave[:2]):
+        _DIAS.setdefault(_forma, _numero)
+_RANGO_DIAS = {'a', 'al', 'hasta'}
+_ENLACES = {'y', 'e', 'de', 'del', 'los', 'el', 'dia', 'dias'}
+
+_HORAS = re.compile(
+    r'(\d{1,2})(?:[:h](\d{2}))?\s*(am|pm)?\s*(?:-|a|hasta)\s*(\d{1,2})(?:[:h](\d{2}))?\s*(am|pm)?'
+)
+
+Franja = namedtuple('Franja', 'dias inicio fin')
+# Los mismos atributos que Ocupacion, para comparar filas leídas con values_list
+Intervalo = namedtuple('Intervalo', 'recurso curso_id dias hora_inicio hora_fin fecha_inicio fecha_fin')
+
+
+class HorarioInvalido(ValueError):
+    pass
+
+
+def _dias(texto):
+    if re.search(r'\d', texto):
+        raise HorarioInvalido(f"«{texto.strip()}» no es un rango de horas como 7:00-13:00.")
+    mascara = 0
+    anterior = None
+    en_rango = False
+    # Antes de las horas, el guion es un rango de días: 'lun-vie'
+    for palabra in re.findall(r'[a-z]+', texto.replace('-', ' a ')):
+        if palabra in _ENLACES:
+            continue
+        if palabra in _RANGO_DIAS:
+            if anterior is None:
+                raise HorarioInvalido("Un rango de días debe empezar por un día, como «Lunes a Viernes».")
+            en_rango = True
+            continue
+        if palabra not in _DIAS:
+            raise HorarioInvalido(f"No se reconoce «{palabra}» como día de la semana.")
+        dia = _DIAS[palabra]
+        if en_rango:
+            if dia < anterior:
+                raise HorarioInvalido(f"El rango de días «{DIAS[anterior]} a {DIAS[dia]}» está invertido.")
+            for numero in range(anterior, dia + 1):
+                mascara |= 1 << numero
+            en_rango = False
+        else:
+            mascara |= 1 << dia
+        anterior = dia
+    if en_rango:
+        raise HorarioInvalido("Falta el último día del rango de días.")
+    if not mascara:
+        raise HorarioInvalido("Cada rango de horas debe ir después de sus días, como «Sábados 8:00-12:00».")
+    return mascara
+
+
+def _hora(horas, minutos, sufijo):
+    horas, minutos = int(horas), int(minutos or 0)
+    if sufijo:
+        if not 1 <= horas <= 12:
+            raise HorarioInvalido(f"{horas} {sufijo} no es una hora válida.")
+        horas = horas % 12 + (12 if sufijo == 'pm' else 0)
+    try:
+        return time(horas, minutos)
+    except ValueError:
+        raise HorarioInvalido(f"{horas}:{minutos:02d} no es una hora válida.") from None
+
+
+def leer_horario(texto):
+    """
+    Franjas de `texto`, una por rango de horas distinto, con la unión de sus
+    días. Levanta HorarioInvalido si no se puede leer.
+    """
+    normalizado = normalizar_texto(texto).replace('.', '').replace('–', '-')
+    franjas = {}
+    posicion = 0
+    for rango in _HORAS.finditer(normalizado):
+        dias = _dias(normalizado[posicion:rango.start()])
+        # "2-5pm": el sufijo del final vale también para el inicio
+        inicio = _hora(rango[1], rango[2], rango[3] or rango[6])
+        fin = _hora(rango[4], rango[5], rango[6])
+        if fin <= inicio:
+            raise HorarioInvalido(f"La hora final de «{rango[0]}» debe ser posterior a la inicial.")
+        franjas[inicio, fin] = franjas.get((inicio, fin), 0) | dias
+        posicion = rango.end()
+    if not franjas:
+        raise HorarioInvalido("El horario debe tener días y horas, como «Lunes a Viernes 7:00-13:00».")
+    if re.search(r'\w', normalizado[posicion:]):
+        raise HorarioInvalido(f"Sobra «{normalizado[posicion:].strip()}» al final del horario.")
+    return [Franja(dias, inicio, fin) for (inicio, fin), dias in sorted(franjas.items())]
+
+
+def describir_dias(mascara):
+    """'Lunes a Viernes', 'Lunes, Miércoles y Viernes', 'Sábado'."""
+    tramos = []
+    for dia in range(len(DIAS)):
+        if mascara & 1 << dia:
+            if tramos and tramos[-1][1] == dia - 1:
+                tramos[-1][1] = dia
+            else:
+                tramos.append([dia, dia])
+    nombres = [DIAS[a] if a == b else f"{DIAS[a]} a {DIAS[b]}" if b > a + 1 else f"{DIAS[a]}, {DIAS[b]}"
+               for a, b in tramos]
+    nombres = ', '.join(nombres).rsplit(', ', 1)
+    return ' y '.join(nombres)
+
+
+def describir(intervalo):
+    """'Lunes a Viernes 7:00-13:00, del 03/02/2025 al 30/06/2025' de una ocupación."""
+    return (
+        f"{describir_dias(intervalo.dias)} {intervalo.hora_inicio.hour}:{intervalo.hora_inicio:%M}-"
+        f"{intervalo.hora_fin.hour}:{intervalo.hora_fin:%M}, "
+        f"del {intervalo.fecha_inicio:%d/%m/%Y} al {intervalo.fecha_fin:%d/%m/%Y}"
+    )
+
+
+def recurso_aula(aula):
+    aula = normalizar_texto(aula)
+    return f'aula:{aula}' if aula else None
+
+
+def recurso_instructor(instructor_id):
+    return f'instructor:{instructor_id}'
+
+
+def intervalos(curso, instructores):
+    """Ocupaciones de `curso` en su aula y en `instructores` (ids), como Intervalo."""
+    if curso.estado == 'CAN' or not (curso.fecha_inicio and curso.fecha_fin):
+        return []
+    try:
+        franjas = leer_horario(curso.horario)
+    except HorarioInvalido:
+        return []
+    recursos = [recurso_aula(curso.aula)] + [recurso_instructor(pk) for pk in sorted(set(instructores) - {None})]
+    return [
+        Intervalo(recurso, curso.pk, franja.dias, franja.inicio, franja.fin, curso.fecha_inicio, curso.fecha_fin)
+        for recurso in recursos if recurso
+        for franja in franjas
+    ]
+
+
+def se_cruzan(a, b):
+    return (
+        a.fecha_inicio <= b.fecha_fin and b.fecha_inicio <= a.fecha_fin
+        and a.dias & b.dias
+        and a.hora_inicio < b.hora_fin and b.hora_inicio < a.hora_fin
+    )
+
+
+def buscar_choques(ocupaciones):
+    """
+    Pares (anterior, ocupación) de cursos distintos que chocan en un mismo
+    recurso. `ocupaciones` debe venir ordenado por (recurso, fecha_inicio).
+    """
+    vigentes = []
+    recurso = None
+    for orden, ocupacion in enumerate(ocupaciones):
+        if ocupacion.recurso != recurso:
+            recurso, vigentes = ocupacion.recurso, []
+        # Las que terminaron antes de que esta empiece no chocan con ninguna de las siguientes
+        while vigentes and vigentes[0][0] < ocupacion.fecha_inicio:
+            heapq.heappop(vigentes)
+        for _, _, otra in vigentes:
+            if otra.curso_id != ocupacion.curso_id and se_cruzan(otra, ocupacion):
+                yield otra, ocupacion
+        heapq.heappush(vigentes, (ocupacion.fecha_fin, orden, ocupacion))
+
+
+def reconstruir_ocupaciones(Curso, InstructorCurso, Ocupacion, ids=None, tamano_lote=TAMANO_LOTE):
+    """
+    Recalcula las ocupaciones de los cursos `ids` (de todos si es None) por
+    lotes de id, con una transacción por lote. Devuelve las filas creadas.
+    """
+    cursos = Curso.objects.order_by('id').only(
+        'estado', 'horario', 'aula', 'fecha_inicio', 'fecha_fin', 'instructor_coordinador',
+    )
+    if ids is not None:
+        cursos = cursos.filter(id__in=ids)
+    creadas = 0
+    ultimo = 0
+    while True:
+        lote = list(cursos.filter(id__gt=ultimo)[:tamano_lote])
+        if not lote:
+            return creadas
+        ultimo = lote[-1].id
+        ids_lote = [curso.id for curso in lote]
+        instructores = defaultdict(list)
+        for curso_id, instructor_id in (
+            InstructorCurso.objects.filter(curso_id__in=ids_lote).values_list('curso_id', 'instructor_id')
+        ):
+            instructores[curso_id].append(instructor_id)
+        filas = [
+            Ocupacion(**intervalo._asdict())
+            for curso in lote
+            for intervalo in intervalos(curso, [curso.instructor_coordinador_id, *instructores[curso.id]])
+        ]
+        with transaction.atomic():
+            Ocupacion.objects.filter(curso_id__in=ids_lote).delete()
+            Ocupacion.objects.bulk_create(filas)
+        creadas += len(filas)
@@ -0,0 +1,159 @@
+"""
+Importación masiva de aprendices desde CSV.
+
+El archivo se lee fila a fila con `csv.DictReader` y se procesa por lotes de
+`tamano_lote` filas, así que la memoria no depende del tamaño del archivo.
+Cada fila se valida con las mismas reglas de `AprendizForm`; los documentos
+duplicados se detectan con una sola consulta `IN` por lote (más un conjunto
+para las repeticiones dentro del mismo lote) y las filas válidas se insertan
+con `bulk_create` en una transacción por lote. La columna programa trae el
+nombre o el código del programa y se resuelve con un índice en memoria
+(aprendices/vinculacion.py) cargado una vez por importación, en lugar de una
+consulta por fila.
+
+Las filas rechazadas se escriben en `reporte` (CSV con fila, documento y
+errores) a medida que aparecen; en memoria solo se guardan las primeras
+MAX_ERRORES_EN_MEMORIA para mostrarlas en el admin o en la consola.
+"""
+import csv
+from dataclasses import dataclass, field
+
+from django.db import transaction
+
+from busqueda import indice
+from programas.models import Programa
+
+from .estadisticas import invalidar_estadisticas
+from .forms import AprendizForm, AprendizImportForm
+from .models import Aprendiz
+from .signals import tocar
+from .vinculacion import AMBIGUO, MapaProgramas
+
+COLUMNAS = list(AprendizForm.base_fields)
+TAMANO_LOTE = 1000
+MAX_ERRORES_EN_MEMORIA = 100
+
+
+class ArchivoInvalido(ValueError):
+    pass
+
+
+@dataclass
+class ResultadoImportacion:
+    leidas: int = 0
+    creadas: int = 0
+    rechazadas: int = 0
+    errores: list = field(default_factory=list)
+
+    def registrar_error(self, fila, documento, mensajes, reporte=None):
+        self.rechazadas += 1
+        if reporte is not None:
+            reporte.writerow([fila, documento, ' | '.join(mensajes)])
+        if len(self.errores) < MAX_ERRORES_EN_MEMORIA:
+            self.errores.append((fila, documento, mensajes))
+
+
+def _mensajes(form):
+    return [f"{campo}: {error}" if campo != '__all__' else error
+            for campo, errores in form.errors.items() for error in errores]
+
+
+def _programa(texto, programas):
+    """Devuelve (programa, mensajes de error) para el texto de la columna programa."""
+    if not texto:
+        return None, ["programa: Este campo es obligatorio."]
+    programa, motivo = programas.buscar(texto)
+    if motivo == AMBIGUO:
+        return None, [f"programa: «{texto}» coincide con varios programas; use el código."]
+    if programa is None:
+        return None, [f"programa: No existe un programa con nombre o código «{texto}»."]
+    return programa, []
+
+
+def _validar_lote(lote, resultado, reporte, programas):
+    """Valida un lote de (número de fila, datos) y devuelve los aprendices a crear."""
+    validos = []
+    for numero, datos in lote:
+        form = AprendizImportForm(datos)
+        programa, errores_programa = _programa(datos.get('programa'), programas)
+        if form.is_valid() and not errores_programa:
+            validos.append((numero, {**form.cleaned_data, 'programa': programa}))
+        else:
+            mensajes = _mensajes(form) + errores_programa
+            resultado.registrar_error(numero, datos.get('documento_identidad', ''), mensajes, reporte)
+
+    existentes = set(
+        Aprendiz.objects.filter(documento_identidad__in=[datos['documento_identidad'] for _, datos in validos])
+        .values_list('documento_identidad', flat=True)
+    )
+    vistos = set()
+    aprendices = []
+    for numero, datos in validos:
+        documento = datos['documento_identidad']
+        if documento in existentes:
+            resultado.registrar_error(numero, documento, ["Ya existe un aprendiz con este documento."], reporte)
+        elif documento in vistos:
+            resultado.registrar_error(numero, documento, ["Documento repetido en el archivo."], reporte)
+        else:
+            vistos.add(documento)
+            aprendiz = Aprendiz(
+                documento_identidad=documento,
+                nombre=datos['nombre'],
+                apellido=datos['apellido'],
+                programa=datos['programa'],
+                telefono=datos.get('telefono') or None,
+                correo=datos.get('correo') or None,
+                fecha_nacimiento=datos['fecha_nacimiento'],
+                ciudad=datos.get('ciudad') or None,
+            )
+            # bulk_create no pasa por save(), que calcula las claves de búsqueda
+            aprendiz.calcular_claves()
+            aprendices.append(aprendiz)
+    return aprendices
+
+
+def _guardar_lote(lote, resultado, reporte, simular, programas):
+    with transaction.atomic():
+        aprendices = _validar_lote(lote, resultado, reporte, programas)
+        if aprendices and not simular:
+            creados = Aprendiz.objects.bulk_create(aprendices)
+            if indice.disponible():
+                indice.indexar_lote(creados)
+            # bulk_create no emite señales: detalle_programa muestra el conteo
+            tocar(Programa.objects.filter(pk__in={aprendiz.programa_id for aprendiz in creados}))
+        resultado.creadas += len(aprendices)
+
+
+def importar_aprendices(lineas, tamano_lote=TAMANO_LOTE, reporte=None, simular=False):
+    """
+    Importa aprendices desde un iterable de líneas CSV con encabezado.
+
+    `reporte` es un archivo de texto opcional donde se escribe cada fila
+    rechazada. Con `simular=True` se valida todo sin insertar nada.
+    """
+    lector = csv.DictReader(lineas)
+    faltantes = {'documento_identidad', 'nombre', 'apellido', 'fecha_nacimiento'} - set(lector.fieldnames or [])
+    if faltantes:
+        raise ArchivoInvalido(f"Faltan columnas obligatorias: {', '.join(sorted(faltantes))}")
+
+    escritor = None
+    if reporte is not None:
+        escritor = csv.writer(reporte)
+        escritor.writerow(['fila', 'documento_identidad', 'errores'])
+
+    resultado = ResultadoImportacion()
+    programas = MapaProgramas.desde_modelo(Programa)
+    lote = []
+    # La fila 1 es el encabezado
+    for numero, fila in enumerate(lector, start=2):
+        resultado.leidas += 1
+        lote.append((numero, {columna: (fila.get(columna) or '').strip() for columna in COLUMNAS}))
+        if len(lote) >= tamano_lote:
+            _guardar_lote(lote, resultado, escritor, simular, programas)
+            lote = []
+    if lote:
+        _guardar_lote(lote, resultado, escritor, simular, programas)
+
+    if resultado.creadas and not simular:
+        invalidar_estadisticas()
+    return resultado
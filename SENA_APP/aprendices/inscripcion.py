@@ -0,0 +1,126 @@
+"""
+Inscripción masiva de aprendices en un curso.
+
+`inscribir_aprendices` recibe un curso y una lista de ids o de documentos y
+resuelve todo con consultas por conjuntos: una para encontrar los aprendices,
+una para las inscripciones que ya existen (unique_together aprendiz-curso) y
+un único `bulk_create` para las nuevas, dentro de una transacción.
+
+Los cupos se verifican con la fila del curso bloqueada (SELECT ... FOR UPDATE;
+en SQLite las transacciones ya empiezan como IMMEDIATE y toman el candado de
+escritura, ver SENA_APP/sqlite.py), así que dos coordinadores que inscriben a
+la vez en el mismo curso se atienden uno detrás del otro y el segundo ve los
+inscritos del primero. Si el grupo no cabe completo no se inscribe a nadie.
+Las inscripciones que se crean o cambian de curso desde el admin verifican el
+cupo en `AprendizCurso.clean`.
+
+`bulk_create` no emite señales: el contador `inscritos` y las marcas de
+actualización del curso y de los aprendices se actualizan aquí, como harían
+las señales de `AprendizCurso`.
+"""
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Aprendiz, AprendizCurso, Curso
+from .signals import tocar
+
+POR_ID = 'id'
+POR_DOCUMENTO = 'documento'
+
+
+class InscripcionInvalida(ValueError):
+    pass
+
+
+@dataclass
+class ResultadoInscripcion:
+    inscritos: int = 0
+    ya_inscritos: list = field(default_factory=list)
+    no_encontrados: list = field(default_factory=list)
+    repetidos: list = field(default_factory=list)
+    # Cupos libres al momento de inscribir; si el grupo no cabía no se insertó nada
+    cupos_disponibles: int = 0
+    sin_cupo: bool = False
+
+    @property
+    def rechazados(self):
+        return len(self.ya_inscritos) + len(self.no_encontrados) + len(self.repetidos)
+
+
+def leer_identificadores(texto):
+    """Separa por comas, punto y coma, espacios o saltos de línea."""
+    return [valor for valor in texto.replace(',', ' ').replace(';', ' ').split() if valor]
+
+
+def _normalizar(identificadores, por):
+    """Devuelve (valores únicos en orden, repetidos) con el tipo de la columna."""
+    if por not in (POR_ID, POR_DOCUMENTO):
+        raise InscripcionInvalida(f"Tipo de identificador desconocido: {por}")
+    valores, vistos, repetidos = [], set(), []
+    for identificador in identificadores:
+        valor = str(identificador).strip()
+        if por == POR_ID:
+            if not valor.isdigit():
+                raise InscripcionInvalida(f"«{valor}» no es un id de aprendiz válido.")
+            valor = int(valor)
+        if valor in vistos:
+            repetidos.append(valor)
+            continue
+        vistos.add(valor)
+        valores.append(valor)
+    return valores, repetidos
+
+
+def inscribir_aprendices(curso_id, identificadores, por=POR_DOCUMENTO, estado='INS'):
+    """
+    Inscribe en el curso a los aprendices indicados por id o por documento.
+
+    Los que no existen, ya estaban inscritos o se repiten en la lista se
+    informan en el resultado y no impiden inscribir a los demás. Lanza
+    `Curso.DoesNotExist` si el curso no existe.
+    """
+    valores, repetidos = _normalizar(identificadores, por)
+    resultado = ResultadoInscripcion(repetidos=repetidos)
+    columna = 'id' if por == POR_ID else 'documento_identidad'
+
+    with transaction.atomic():
+        curso = Curso.objects.select_for_update().only('cupos_maximos', 'inscritos').get(pk=curso_id)
+
+        encontrados = dict(
+            Aprendiz.objects.filter(**{f'{columna}__in': valores}).values_list(columna, 'id')
+        )
+        resultado.no_encontrados = [valor for valor in valores if valor not in encontrados]
+        existentes = set(
+            AprendizCurso.objects.filter(curso_id=curso.pk, aprendiz_id__in=encontrados.values())
+            .values_list('aprendiz_id', flat=True)
+        )
+        nuevos = []
+        for valor in valores:
+            aprendiz_id = encontrados.get(valor)
+            if aprendiz_id is None:
+                continue
+            if aprendiz_id in existentes:
+                resultado.ya_inscritos.append(valor)
+            else:
+                nuevos.append(aprendiz_id)
+
+        resultado.cupos_disponibles = max(curso.cupos_maximos - curso.inscritos, 0)
+        if len(nuevos) > resultado.cupos_disponibles:
+            resultado.sin_cupo = True
+            return resultado
+        if not nuevos:
+            return resultado
+
+        AprendizCurso.objects.bulk_create([
+            AprendizCurso(aprendiz_id=aprendiz_id, curso_id=curso.pk, estado=estado) for aprendiz_id in nuevos
+        ])
+        # Lo que harían las señales de AprendizCurso, con un UPDATE por tabla
+        Curso.objects.filter(pk=curso.pk).update(
+            inscritos=F('inscritos') + len(nuevos), fecha_actualizacion=timezone.now(),
+        )
+        tocar(Aprendiz.objects.filter(pk__in=nuevos))
+        resultado.inscritos = len(nuevos)
+    return resultado
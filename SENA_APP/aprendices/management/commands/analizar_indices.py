@@ -0,0 +1,427 @@
+import json
+import re
+from collections import defaultdict
+from urllib.parse import urlencode
+
+from django.apps import apps
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models, transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from api.recursos import RECURSOS
+from SENA_APP.consultas import forma_consulta, registrando
+
+from .benchmark_rutas import CONSULTAS_EJEMPLO, PARAMETROS, recorrer_rutas
+
+_ESCANEO = re.compile(r'^SCAN (\w+)(?: AS (\w+))?$')
+_BUSQUEDA = re.compile(r'^(?:SEARCH|SCAN) (\w+)(?: AS (\w+))?')
+_TEMPORAL = re.compile(r'^USE TEMP B-TREE FOR (.+)$')
+_DISTINCT_CALCULADO = re.compile(r'^SELECT DISTINCT \w+\(')
+_SECCIONES = re.compile(r' (WHERE|GROUP BY|ORDER BY|LIMIT|HAVING) ')
+
+
+class Captura:
+    """Envoltorio para `connection.execute_wrapper` que guarda los SELECT con sus parámetros."""
+
+    def __init__(self):
+        self.consultas = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+            self.consultas.append((sql, tuple(params or ())))
+        return execute(sql, params, many, context)
+
+
+def plan(cursor, sql, params):
+    cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+    return [fila[3] for fila in cursor.fetchall()]
+
+
+def secciones(sql):
+    """Parte la consulta principal en FROM, WHERE, GROUP BY y ORDER BY (sin subconsultas)."""
+    partes, actual, inicio = {}, 'FROM', 0
+    profundidad = 0
+    for posicion, caracter in enumerate(sql):
+        if caracter == '(':
+            profundidad += 1
+        elif caracter == ')':
+            profundidad -= 1
+        elif caracter == ' ' and profundidad == 0 and (coincidencia := _SECCIONES.match(sql, posicion)):
+            partes[actual] = sql[inicio:posicion]
+            actual, inicio = coincidencia.group(1), coincidencia.end()
+    partes[actual] = sql[inicio:]
+    return partes
+
+
+def _cierre(texto, apertura):
+    """Posición del paréntesis que cierra el abierto en `apertura`."""
+    profundidad = 0
+    for posicion in range(apertura, len(texto)):
+        if texto[posicion] == '(':
+            profundidad += 1
+        elif texto[posicion] == ')':
+            profundidad -= 1
+            if profundidad == 0:
+                return posicion
+    return -1
+
+
+def _desenvolver(texto):
+    """Quita los paréntesis que envuelven todo el texto."""
+    texto = texto.strip()
+    while texto.startswith('(') and _cierre(texto, 0) == len(texto) - 1:
+        texto = texto[1:-1].strip()
+    return texto
+
+
+def _partir(texto, operador):
+    """Parte `texto` en el `operador` (AND u OR) fuera de paréntesis; el AND de BETWEEN no cuenta."""
+    partes, inicio, profundidad = [], 0, 0
+    separador = f' {operador} '
+    for posicion, caracter in enumerate(texto):
+        if caracter == '(':
+            profundidad += 1
+        elif caracter == ')':
+            profundidad -= 1
+        elif (profundidad == 0 and texto.startswith(separador, posicion)
+              and not (operador == 'AND' and re.search(r'\bBETWEEN \S+$', texto[inicio:posicion]))):
+            partes.append(texto[inicio:posicion])
+            inicio = posicion + len(separador)
+    partes.append(texto[inicio:])
+    return partes
+
+
+def conjunciones(donde):
+    """Condiciones unidas por AND en el nivel superior del WHERE, cada una sin paréntesis externos."""
+    texto = _desenvolver(donde)
+    partes = _partir(texto, 'AND')
+    if len(partes) == 1:
+        return [texto] if texto else []
+    return [condicion for parte in partes for condicion in conjunciones(parte)]
+
+
+def columnas_de(texto, tabla, patron=''):
+    return re.findall(rf'"{tabla}"\."(\w+)" {patron}', texto)
+
+
+def acotado(sql, detalles):
+    """
+    Si un recorrido completo en realidad se detiene pronto: sin filtro, en el
+    orden de la llave primaria y con LIMIT (paginación por cursor de la API).
+    """
+    partes = secciones(sql)
+    return 'LIMIT' in partes and 'WHERE' not in partes and not any(_TEMPORAL.match(d) for d in detalles)
+
+
+def proponer(sql, tabla, pk):
+    """
+    Devuelve (columnas, None) con un índice compuesto para `tabla` o (None,
+    motivo). Primero van las columnas comparadas por igualdad, luego las del
+    orden y al final las de rango, de modo que el índice filtre y entregue las
+    filas ya ordenadas; la llave primaria solo sirve como desempate final.
+
+    Las condiciones unidas por OR no aportan columnas: SQLite resuelve cada
+    rama con su propio índice (MULTI-INDEX OR) y ordena el resultado aparte,
+    así que un índice compuesto con las columnas de todas las ramas no sirve.
+    """
+    partes = secciones(sql)
+    condiciones = conjunciones(partes.get('WHERE', ''))
+    con_or = [c for c in condiciones if len(_partir(c, 'OR')) > 1]
+    donde = ' AND '.join(c for c in condiciones if c not in con_or)
+    igualdad = columnas_de(donde, tabla, r'(?:= |IN \(|IS NULL)')
+    rango = columnas_de(donde, tabla, r'(?:>|<|BETWEEN)')
+    orden_completo = re.findall(r'"(\w+)"\."(\w+)" (ASC|DESC)', partes.get('ORDER BY', ''))
+    if any(otra != tabla for otra, _, _ in orden_completo):
+        return None, "el orden usa columnas de otra tabla del JOIN"
+    orden = [(columna, direccion) for _, columna, direccion in orden_completo]
+    agrupacion = columnas_de(partes.get('GROUP BY', ''), tabla)
+    if _DISTINCT_CALCULADO.match(sql):
+        return None, "DISTINCT sobre una expresión calculada"
+
+    campos = []
+    for columna in igualdad + agrupacion + [c for c, _ in orden] + rango:
+        if columna not in campos:
+            campos.append(columna)
+    if pk in campos and pk not in igualdad:
+        # Después de un rango el índice ya no entrega el orden por llave primaria
+        campos.remove(pk)
+        if not rango:
+            campos.append(pk)
+    if con_or and not (igualdad or agrupacion or rango):
+        return None, "condiciones unidas con OR: SQLite usa un índice por rama y ordena aparte"
+    if not campos or campos == [pk]:
+        if re.search(r'\bLIKE\b', donde):
+            return None, "LIKE con comodín inicial: ningún índice B-tree lo resuelve"
+        return None, "sin columnas de filtro ni de orden"
+    # Un índice se recorre en ambos sentidos: solo hace falta DESC si el orden mezcla sentidos
+    direcciones = dict(reversed(orden))
+    primero = orden[0][1] if orden else 'ASC'
+    return [
+        ('-' if direcciones.get(columna, primero) != primero else '') + columna for columna in campos
+    ], None
+
+
+def cubierto(indices, columnas):
+    """Nombre del índice existente que empieza por esas columnas en sentidos compatibles."""
+    buscadas = [c.lstrip('-') for c in columnas]
+    descendentes = [c.startswith('-') for c in columnas]
+    for indice in indices:
+        if indice['columns'][:len(buscadas)] != buscadas:
+            continue
+        existentes = [orden == 'DESC' for orden in (indice['orders'] or ['ASC'] * len(buscadas))[:len(buscadas)]]
+        if existentes == descendentes or existentes == [not d for d in descendentes]:
+            return indice['name']
+    return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Recorre las vistas, la API y los listados del admin sobre la base sembrada, "
+        "captura sus SELECT y ejecuta EXPLAIN QUERY PLAN para señalar recorridos "
+        "completos de tablas y ordenamientos en B-tree temporales. Propone índices "
+        "compuestos y, con --verificar, los crea dentro de una transacción que se "
+        "revierte para comprobar que cambian el plan. No modifica la base."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-filas', type=int, default=1000,
+                            help="Ignorar tablas con menos filas: recorrerlas completas es barato")
+        parser.add_argument('--verificar', action='store_true',
+                            help="Crear los índices propuestos temporalmente y repetir EXPLAIN")
+        parser.add_argument('--sin-admin', action='store_true', help="No recorrer los listados del admin")
+        parser.add_argument('--mostrar-sql', action='store_true')
+        parser.add_argument('--salida', help="Guardar las propuestas en un JSON")
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError("EXPLAIN QUERY PLAN es propio de SQLite.")
+        self.tablas = {modelo._meta.db_table: modelo for modelo in apps.get_models()}
+        self.filas = {}
+
+        with transaction.atomic():
+            consultas = self.capturar(options)
+            with connection.cursor() as cursor:
+                hallazgos = self.analizar(cursor, consultas, options)
+                propuestas = self.agrupar(cursor, hallazgos)
+                if options['verificar'] and any(not propuesta['existente'] for propuesta in propuestas):
+                    self.verificar(cursor, propuestas)
+                self.imprimir(propuestas, options)
+            transaction.set_rollback(True)
+
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8') as archivo:
+                json.dump([
+                    {clave: valor for clave, valor in propuesta.items() if clave != 'consultas'}
+                    for propuesta in propuestas if propuesta.get('mejora') != 0
+                ], archivo, indent=2, ensure_ascii=False)
+            self.stdout.write(f"Propuestas guardadas en {options['salida']}")
+
+    # Recorrido de rutas
+
+    def casos(self, options):
+        ejemplos = {
+            parametro: modelo.objects.order_by('pk').values_list('pk', flat=True).first()
+            for parametro, modelo in PARAMETROS.items()
+        }
+        for nombre, parametros in recorrer_rutas():
+            if nombre.startswith('api:') or any(ejemplos.get(p) is None for p in parametros):
+                continue
+            ruta = reverse(nombre, kwargs={parametro: ejemplos[parametro] for parametro in parametros})
+            yield nombre, ruta
+            if nombre in CONSULTAS_EJEMPLO:
+                yield nombre, f"{ruta}?{urlencode(CONSULTAS_EJEMPLO[nombre])}"
+
+        # Cada recurso de la API, sin filtros y con cada filtro permitido
+        for clave, recurso in RECURSOS.items():
+            ruta = reverse('api:lista', args=[clave])
+            yield f'api:{clave}', ruta
+            for parametro, lookup in recurso.filtros.items():
+                valor = recurso.modelo.objects.values_list(lookup.split('__')[0], flat=True).first()
+                if valor is not None:
+                    yield f'api:{clave}', f"{ruta}?{urlencode({parametro: valor})}"
+
+    def recorrer_admin(self, cliente):
+        for modelo, modelo_admin in admin.site._registry.items():
+            opciones = modelo._meta
+            nombre = f'admin:{opciones.app_label}_{opciones.model_name}_changelist'
+            ruta = reverse(nombre)
+            respuesta = self.pedir(cliente, nombre, ruta)
+            listado = (getattr(respuesta, 'context_data', None) or {}).get('cl')
+            if listado is None:
+                continue
+            # La primera opción de cada filtro lateral después de "Todos"
+            for filtro in listado.filter_specs:
+                opciones_filtro = list(filtro.choices(listado))
+                if len(opciones_filtro) > 1:
+                    self.pedir(cliente, nombre, ruta + opciones_filtro[1]['query_string'])
+            if modelo_admin.search_fields:
+                self.pedir(cliente, nombre, f"{ruta}?{urlencode({'q': 'ana'})}")
+
+    def pedir(self, cliente, nombre, ruta):
+        with registrando(Captura()) as captura:
+            respuesta = cliente.get(ruta)
+        if respuesta.status_code >= 400:
+            self.stderr.write(f"{ruta}: respondió {respuesta.status_code}, sus consultas pueden estar incompletas")
+        for sql, params in captura.consultas:
+            _, _, rutas = self.consultas.setdefault(forma_consulta(sql), (sql, params, set()))
+            rutas.add(nombre)
+        return respuesta
+
+    @override_settings(CONSULTAS_EN_PARALELO=False, PRESUPUESTO_CONSULTAS_ESTRICTO=False,
+                       ALLOWED_HOSTS=['testserver'])
+    def capturar(self, options):
+        """Devuelve {forma: (sql, params, {rutas})} con un ejemplo de cada forma de consulta."""
+        cliente = Client(raise_request_exception=False)
+        self.consultas = {}
+        for nombre, ruta in self.casos(options):
+            self.pedir(cliente, nombre, ruta)
+        if not options['sin_admin']:
+            # Superusuario temporal: la transacción se revierte al terminar
+            usuario = get_user_model().objects.create_superuser('analizar_indices', password=None)
+            cliente.force_login(usuario)
+            self.recorrer_admin(cliente)
+        self.stdout.write(f"{len(self.consultas)} formas de consulta distintas capturadas")
+        return self.consultas
+
+    # Análisis de planes
+
+    def contar(self, cursor, tabla):
+        if tabla not in self.filas:
+            cursor.execute(f'SELECT COUNT(*) FROM "{tabla}"')
+            self.filas[tabla] = cursor.fetchone()[0]
+        return self.filas[tabla]
+
+    def analizar(self, cursor, consultas, options):
+        """Produce un hallazgo por cada recorrido completo u ordenamiento temporal relevante."""
+        hallazgos = []
+        for sql, params, rutas in consultas.values():
+            detalles = plan(cursor, sql, params)
+            # La tabla de la consulta principal es la primera que aparece en el plan;
+            # si se busca por llave primaria ordenar el resultado es trivial
+            principal = next((m for d in detalles if (m := _BUSQUEDA.match(d))), None)
+            for detalle in detalles:
+                if coincidencia := _ESCANEO.match(detalle):
+                    if acotado(sql, detalles):
+                        continue
+                    tabla, problema = coincidencia.group(1), 'recorrido completo'
+                elif (coincidencia := _TEMPORAL.match(detalle)) and principal and '(rowid=?)' not in principal.string:
+                    tabla, problema = principal.group(1), f'B-tree temporal para {coincidencia.group(1)}'
+                else:
+                    continue
+                if tabla not in self.tablas or self.contar(cursor, tabla) < options['min_filas']:
+                    continue
+                hallazgos.append({
+                    'tabla': tabla, 'problema': problema, 'sql': sql, 'params': params,
+                    'rutas': rutas, 'plan': detalles,
+                })
+                if options['mostrar_sql']:
+                    self.stdout.write(f"\n{problema} en {tabla} ({', '.join(sorted(rutas))})\n{sql}")
+                    for linea in detalles:
+                        self.stdout.write(f"    {linea}")
+        return hallazgos
+
+    def agrupar(self, cursor, hallazgos):
+        """Una propuesta por índice: las que son prefijo de otra de la misma tabla se funden en ella."""
+        candidatas = {}
+        sin_propuesta = defaultdict(set)
+        for hallazgo in hallazgos:
+            tabla = hallazgo['tabla']
+            columnas, motivo = proponer(hallazgo['sql'], tabla, self.tablas[tabla]._meta.pk.column)
+            if columnas is None:
+                sin_propuesta[tabla, hallazgo['problema'], motivo].update(hallazgo['rutas'])
+                continue
+            candidatas.setdefault((tabla, tuple(columnas)), []).append(hallazgo)
+
+        propuestas = {}
+        for (tabla, columnas), encontrados in candidatas.items():
+            destino = max(
+                (otras for otra_tabla, otras in candidatas if otra_tabla == tabla and otras[:len(columnas)] == columnas),
+                key=len,
+            )
+            indices = [
+                {'name': nombre, 'columns': datos['columns'], 'orders': datos.get('orders')}
+                for nombre, datos in connection.introspection.get_constraints(cursor, tabla).items()
+                if datos['index'] or datos['unique'] or datos['primary_key']
+            ]
+            existente = cubierto(indices, destino)
+            clave = (tabla, existente or destino)
+            propuesta = propuestas.setdefault(clave, {
+                'tabla': tabla, 'modelo': self.tablas[tabla]._meta.label, 'columnas': list(destino),
+                'existente': existente, 'indice': self.definicion(self.tablas[tabla], destino),
+                'filas': self.filas[tabla], 'problemas': set(), 'rutas': set(), 'consultas': [],
+            })
+            for hallazgo in encontrados:
+                propuesta['problemas'].add(hallazgo['problema'])
+                propuesta['rutas'].update(hallazgo['rutas'])
+                consulta = (hallazgo['sql'], hallazgo['params'], hallazgo['plan'])
+                if consulta not in propuesta['consultas']:
+                    propuesta['consultas'].append(consulta)
+
+        for (tabla, problema, motivo), rutas in sorted(sin_propuesta.items()):
+            self.stdout.write(f"- {problema} en {tabla} sin índice propuesto ({motivo}): {', '.join(sorted(rutas))}")
+        resultado = list(propuestas.values())
+        for propuesta in resultado:
+            propuesta['problemas'] = sorted(propuesta['problemas'])
+            propuesta['rutas'] = sorted(propuesta['rutas'])
+        resultado.sort(key=lambda p: (p['existente'] is not None, p['tabla'], p['columnas']))
+        return resultado
+
+    def definicion(self, modelo, columnas):
+        por_columna = {campo.column: campo.name for campo in modelo._meta.concrete_fields}
+        campos = [
+            ('-' if columna.startswith('-') else '') + por_columna[columna.lstrip('-')] for columna in columnas
+        ]
+        indice = models.Index(fields=campos, name='')
+        indice.set_name_with_model(modelo)
+        return f"models.Index(fields={campos!r}, name={indice.name!r})"
+
+    def imprimir(self, propuestas, options):
+        if not propuestas:
+            self.stdout.write(self.style.SUCCESS("Ningún recorrido completo ni ordenamiento temporal para proponer."))
+            return
+        for propuesta in propuestas:
+            encabezado = f"\n{propuesta['modelo']} ({propuesta['filas']} filas): {', '.join(propuesta['problemas'])}"
+            self.stdout.write(self.style.WARNING(encabezado))
+            self.stdout.write(f"  rutas: {', '.join(propuesta['rutas'])}")
+            if propuesta['existente']:
+                self.stdout.write(
+                    f"  ya hay un índice con esas columnas ({propuesta['existente']}): "
+                    "el problema no se resuelve con otro índice; revise el plan con --mostrar-sql"
+                )
+            elif propuesta.get('mejora') == 0:
+                self.stdout.write(
+                    f"  descartada: {propuesta['indice']} no cambia el plan de ninguna de sus consultas; "
+                    "revise el plan con --mostrar-sql"
+                )
+            elif 'mejora' in propuesta:
+                self.stdout.write(
+                    f"  propuesta: {propuesta['indice']} "
+                    f"(mejora {propuesta['mejora']} de {len(propuesta['consultas'])} consultas)"
+                )
+            else:
+                self.stdout.write(f"  propuesta: {propuesta['indice']}")
+
+    def verificar(self, cursor, propuestas):
+        """
+        Crea los índices propuestos (la transacción de handle() los revierte),
+        repite EXPLAIN y guarda en 'mejora' cuántas consultas de cada propuesta
+        dejan de recorrer la tabla o de ordenar en un B-tree temporal.
+        """
+        for numero, propuesta in enumerate(p for p in propuestas if not p['existente']):
+            columnas = ', '.join(
+                f'"{c[1:]}" DESC' if c.startswith('-') else f'"{c}"' for c in propuesta['columnas']
+            )
+            cursor.execute(f'CREATE INDEX "analizar_indices_{numero}" ON "{propuesta["tabla"]}" ({columnas})')
+        cursor.execute('ANALYZE')
+        for propuesta in propuestas:
+            if propuesta['existente']:
+                continue
+            propuesta['mejora'] = sum(
+                1 for sql, params, anterior in propuesta['consultas']
+                if len([d for d in plan(cursor, sql, params) if _ESCANEO.match(d) or _TEMPORAL.match(d)])
+                < len([d for d in anterior if _ESCANEO.match(d) or _TEMPORAL.match(d)])
+            )
@@ -0,0 +1,36 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from aprendices.estados import TAMANO_LOTE, avanzar_estados
+
+
+class Command(BaseCommand):
+    help = (
+        "Avanza por lotes el estado de cursos (PRO -> INI -> EJE -> FIN) e inscripciones "
+        "(INS -> ACT -> GRA) según las fechas de cada curso y la nota final. Pensado para "
+        "ejecutarse cada día; se puede repetir sin efecto."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fecha', type=datetime.date.fromisoformat, default=None,
+                            help="Fecha de referencia AAAA-MM-DD (por defecto, hoy)")
+        parser.add_argument('--simular', action='store_true', help="Solo contar las filas que cambiarían")
+        parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help="Filas por UPDATE y por transacción")
+
+    def handle(self, *args, **options):
+        hoy = options['fecha'] or timezone.localdate()
+        inicio = time.perf_counter()
+        resultado = avanzar_estados(hoy, simular=options['simular'], tamano_lote=options['lote'])
+        duracion = time.perf_counter() - inicio
+
+        for descripcion, filas in resultado.cambios.items():
+            self.stdout.write(f"  {filas:>8}  {descripcion}")
+        verbo = "cambiarían" if options['simular'] else "cambiadas"
+        self.stdout.write(self.style.SUCCESS(f"{resultado.total} filas {verbo} al {hoy:%d/%m/%Y} en {duracion:.1f} s."))
+        if resultado.pendientes_de_nota:
+            self.stdout.write(self.style.WARNING(
+                f"{resultado.pendientes_de_nota} inscripciones de cursos finalizados siguen sin nota aprobatoria."
+            ))
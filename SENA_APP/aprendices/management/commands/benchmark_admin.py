@@ -0,0 +1,86 @@
+import statistics
+import time
+from urllib.parse import quote
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from aprendices.models import AprendizCurso, Curso, InstructorCurso
+from SENA_APP.consultas import registrando
+
+from .analizar_indices import Captura
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide consultas SQL, tamaño de respuesta y tiempo de las páginas del admin de "
+        "aprendices, cursos, inscripciones y asignaciones de instructores (listados, filtros, "
+        "búsquedas y formularios de edición del objeto con más filas relacionadas)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticiones', type=int, default=5)
+
+    def paginas(self):
+        curso = Curso.objects.order_by('-inscritos', 'id').first()
+        inscripcion = AprendizCurso.objects.order_by('-id').first()
+        asignacion = InstructorCurso.objects.order_by('-id').first()
+        if not (curso and inscripcion and asignacion):
+            raise CommandError("La base no tiene datos: ejecute primero seed_sena.")
+        con_instructores = (
+            Curso.objects.annotate(asignados=Count('instructorcurso')).order_by('-asignados', 'id').first()
+        )
+        aprendiz = inscripcion.aprendiz
+        listado_aprendices = reverse('admin:aprendices_aprendiz_changelist')
+        listado_cursos = reverse('admin:aprendices_curso_changelist')
+        listado_inscripciones = reverse('admin:aprendices_aprendizcurso_changelist')
+        listado_asignaciones = reverse('admin:aprendices_instructorcurso_changelist')
+        return [
+            ('aprendices búsqueda', f'{listado_aprendices}?q={quote(aprendiz.apellido.split()[0])}'),
+            ('aprendices por documento', f'{listado_aprendices}?q={aprendiz.documento_identidad}'),
+            ('cursos', listado_cursos),
+            ('cursos por estado', f'{listado_cursos}?estado__exact=EJE'),
+            ('cursos por programa', f'{listado_cursos}?programa__id__exact={curso.programa_id}'),
+            ('cursos búsqueda', f'{listado_cursos}?q=ana'),
+            ('curso (más inscritos)', reverse('admin:aprendices_curso_change', args=[curso.pk])),
+            ('curso (más instructores)', reverse('admin:aprendices_curso_change', args=[con_instructores.pk])),
+            ('curso nuevo', reverse('admin:aprendices_curso_add')),
+            ('inscripciones', listado_inscripciones),
+            ('inscripciones por estado', f'{listado_inscripciones}?estado__exact=GRA'),
+            ('inscripciones por nombre', f'{listado_inscripciones}?q={quote(aprendiz.nombre)}'),
+            ('inscripciones por apellido', f'{listado_inscripciones}?q={quote(aprendiz.apellido)}'),
+            ('inscripciones por documento', f'{listado_inscripciones}?q={aprendiz.documento_identidad}'),
+            ('inscripciones por código', f'{listado_inscripciones}?q={curso.codigo}'),
+            ('inscripción', reverse('admin:aprendices_aprendizcurso_change', args=[inscripcion.pk])),
+            ('asignaciones', listado_asignaciones),
+            ('asignaciones búsqueda', f'{listado_asignaciones}?q=ana'),
+            ('asignación', reverse('admin:aprendices_instructorcurso_change', args=[asignacion.pk])),
+        ]
+
+    @override_settings(CONSULTAS_EN_PARALELO=False, PRESUPUESTO_CONSULTAS_ESTRICTO=False,
+                       ALLOWED_HOSTS=['testserver'])
+    def handle(self, *args, **options):
+        cliente = Client(raise_request_exception=False)
+        self.stdout.write(f"{'página':<28}{'estado':>7}{'consultas':>10}{'KiB':>10}{'p50 ms':>10}")
+        with transaction.atomic():
+            # Superusuario temporal: la transacción se revierte al terminar
+            usuario = get_user_model().objects.create_superuser('benchmark_admin', password=None)
+            cliente.force_login(usuario)
+            for nombre, ruta in self.paginas():
+                cliente.get(ruta)  # calentamiento: plantillas y caché de sesión
+                tiempos = []
+                for _ in range(options['repeticiones']):
+                    inicio = time.perf_counter()
+                    with registrando(Captura()) as captura:
+                        respuesta = cliente.get(ruta)
+                    tiempos.append((time.perf_counter() - inicio) * 1000)
+                self.stdout.write(
+                    f"{nombre:<28}{respuesta.status_code:>7}{len(captura.consultas):>10}"
+                    f"{len(respuesta.content) / 1024:>10.1f}{statistics.median(tiempos):>10.1f}"
+                )
+            transaction.set_rollback(True)
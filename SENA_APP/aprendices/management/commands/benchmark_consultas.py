@@ -0,0 +1,104 @@
+import datetime
+import secrets
+import statistics
+import time
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.urls import resolve, reverse
+
+from aprendices.contadores import recalcular_inscritos
+from aprendices.models import Aprendiz, AprendizCurso, Curso, InstructorCurso
+from instructores.models import Instructor
+from programas.models import Programa
+from SENA_APP.consultas import RegistroConsultas, registrando
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide consultas SQL y latencia de las vistas de detalle con distintos "
+        "tamaños de curso. Los datos se crean dentro de una transacción que se "
+        "revierte al terminar, así que las vistas asíncronas ejecutan sus consultas "
+        "en serie (CONSULTAS_EN_PARALELO) para verlos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tamanos', nargs='+', type=int, default=[10, 1000, 10000],
+                            help="Inscripciones por curso a medir")
+        parser.add_argument('--repeticiones', type=int, default=5)
+
+    def handle(self, *args, **options):
+        self.factory = RequestFactory()
+        self.stdout.write(f"{'vista':<36}{'inscritos':>10}{'consultas':>11}{'p50 ms':>10}{'máx ms':>10}")
+
+        for tamano in options['tamanos']:
+            with transaction.atomic():
+                curso = self.crear_curso(tamano)
+                urls = [
+                    reverse('aprendices:detalle_curso', args=[curso.id]),
+                    reverse('aprendices:lista_cursos'),
+                    reverse('instructores:detalle_instructor', args=[curso.instructor_coordinador_id]),
+                    reverse('programas:detalle_programa', args=[curso.programa_id]),
+                    reverse('aprendices:detalle_aprendiz', args=[curso.aprendices.values_list('id', flat=True).first()]),
+                ]
+                for url in urls:
+                    self.medir(url, tamano, options['repeticiones'])
+                transaction.set_rollback(True)
+
+    @override_settings(CONSULTAS_EN_PARALELO=False)
+    def medir(self, url, tamano, repeticiones):
+        coincidencia = resolve(url)
+        vista = coincidencia.func
+        if iscoroutinefunction(vista):
+            vista = async_to_sync(vista)
+        tiempos = []
+        for _ in range(repeticiones):
+            request = self.factory.get(url)
+            with registrando(RegistroConsultas()) as registro:
+                inicio = time.perf_counter()
+                vista(request, *coincidencia.args, **coincidencia.kwargs)
+                tiempos.append((time.perf_counter() - inicio) * 1000)
+        self.stdout.write(
+            f"{coincidencia.view_name:<36}{tamano:>10}{len(registro):>11}"
+            f"{statistics.median(tiempos):>10.1f}{max(tiempos):>10.1f}"
+        )
+
+    def crear_curso(self, tamano):
+        hoy = datetime.date.today()
+        sufijo = f"{tamano}{secrets.token_hex(2)}"
+        programa = Programa.objects.create(
+            codigo=f"BP{sufijo}", nombre="Programa de prueba", nivel_formacion='TGL',
+            duracion_meses=24, duracion_horas=3000, descripcion="-", competencias="-",
+            perfil_egreso="-", requisitos_ingreso="-", centro_formacion="-", regional="-",
+            fecha_creacion=hoy,
+        )
+        instructores = Instructor.objects.bulk_create([
+            Instructor(
+                documento_identidad=f"BI{i}-{sufijo}", nombre=f"Instructor{i}", apellido="Prueba",
+                fecha_nacimiento=hoy, especialidad="Software", anos_experiencia=5, fecha_vinculacion=hoy,
+            )
+            for i in range(5)
+        ])
+        curso = Curso.objects.create(
+            codigo=f"BC{sufijo}", nombre="Curso de prueba", programa=programa,
+            instructor_coordinador=instructores[0], fecha_inicio=hoy, fecha_fin=hoy,
+            horario="Lunes a Viernes 7:00-13:00", aula="101", cupos_maximos=tamano,
+        )
+        InstructorCurso.objects.bulk_create([
+            InstructorCurso(instructor=instructor, curso=curso, rol="Técnico") for instructor in instructores
+        ])
+        aprendices = Aprendiz.objects.bulk_create([
+            Aprendiz(
+                documento_identidad=f"B{i}-{sufijo}", nombre=f"Aprendiz{i}", apellido="Prueba",
+                fecha_nacimiento=hoy,
+            )
+            for i in range(tamano)
+        ], batch_size=1000)
+        AprendizCurso.objects.bulk_create([
+            AprendizCurso(aprendiz=aprendiz, curso=curso) for aprendiz in aprendices
+        ], batch_size=1000)
+        recalcular_inscritos([curso.id])
+        return curso
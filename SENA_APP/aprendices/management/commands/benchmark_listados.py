@@ -0,0 +1,122 @@
+import datetime
+import statistics
+import time
+import tracemalloc
+from decimal import Decimal
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from django.urls import resolve, reverse
+
+from programas import views as vistas_programas
+from proyectos import views as vistas_proyectos
+from SENA_APP.consultas import registrando
+from SENA_APP.fragmentos import ALIAS_CACHE
+
+from .analizar_indices import Captura
+
+# Nombre de URL: (módulo de la vista con CAMPOS_LISTA, modelo)
+LISTADOS = {
+    'programas:lista_programas': (vistas_programas, vistas_programas.Programa),
+    'proyectos:lista_proyectos': (vistas_proyectos, vistas_proyectos.Proyecto),
+}
+
+
+def tamano(valor):
+    """Bytes aproximados de un valor devuelto por SQLite."""
+    if valor is None:
+        return 0
+    if isinstance(valor, bytes):
+        return len(valor)
+    if isinstance(valor, (int, float, Decimal)):
+        return 8
+    if isinstance(valor, (datetime.date, datetime.datetime)):
+        return len(valor.isoformat())
+    return len(str(valor).encode())
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide consultas, bytes leídos de la base y memoria pico por petición de los "
+        "listados de programas y proyectos, cargando solo CAMPOS_LISTA (como la vista) "
+        "y todas las columnas (como antes de los extractos). La caché de filas se vacía "
+        "antes de cada petición para que todas las filas se rendericen. 'KiB filas' es la "
+        "memoria de los objetos de una página; la de la petición la dominan el HTML y la caché."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeticiones', type=int, default=10)
+        parser.add_argument('--listados', nargs='+', choices=list(LISTADOS), default=list(LISTADOS))
+
+    def handle(self, *args, **options):
+        self.factory = RequestFactory()
+        self.stdout.write(f"{'listado':<28}{'columnas':<10}{'consultas':>10}{'KiB leídos':>12}"
+                          f"{'KiB filas':>11}{'KiB memoria':>13}{'p50 ms':>9}")
+        for nombre in options['listados']:
+            modulo, modelo = LISTADOS[nombre]
+            todas = tuple(campo.attname for campo in modelo._meta.concrete_fields if not campo.primary_key)
+            resultados = {}
+            for modo, campos in (('todas', todas), ('listado', modulo.CAMPOS_LISTA)):
+                with mock.patch.object(modulo, 'CAMPOS_LISTA', campos):
+                    resultados[modo] = self.medir(nombre, options['repeticiones'])
+                resultados[modo]['filas'] = self.memoria_filas(modelo, campos)
+                self.imprimir(nombre, modo, resultados[modo])
+            antes, despues = resultados['todas'], resultados['listado']
+            self.stdout.write(
+                f"  bytes leídos -{1 - despues['bytes'] / antes['bytes']:.0%}, "
+                f"memoria de filas -{1 - despues['filas'] / antes['filas']:.0%}, "
+                f"memoria pico -{1 - despues['memoria'] / antes['memoria']:.0%}"
+            )
+
+    # Con DEBUG = False las plantillas se compilan una vez (cargador con caché),
+    # como en producción; si no, la compilación domina la memoria medida
+    @override_settings(DEBUG=False)
+    def medir(self, nombre, repeticiones):
+        url = reverse(nombre)
+        vista = resolve(url).func
+        vista(self.factory.get(url))  # calentamiento
+        tiempos, memorias = [], []
+        for _ in range(repeticiones):
+            caches[ALIAS_CACHE].clear()
+            request = self.factory.get(url)
+            tracemalloc.start()
+            inicio = time.perf_counter()
+            with registrando(Captura()) as captura:
+                vista(request)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+            memorias.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        return {
+            'consultas': len(captura.consultas),
+            'bytes': self.bytes_leidos(captura.consultas),
+            'memoria': statistics.median(memorias),
+            'ms': statistics.median(tiempos),
+        }
+
+    def memoria_filas(self, modelo, campos):
+        tracemalloc.start()
+        filas = list(modelo.objects.only(*campos)[:settings.PAGINACION_POR_PAGINA])
+        memoria = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del filas
+        return memoria
+
+    def bytes_leidos(self, consultas):
+        # Se repiten las consultas de la última petición para sumar lo que devolvieron
+        total = 0
+        with connection.cursor() as cursor:
+            for sql, params in consultas:
+                cursor.execute(sql, params)
+                total += sum(tamano(valor) for fila in cursor.fetchall() for valor in fila)
+        return total
+
+    def imprimir(self, nombre, modo, datos):
+        self.stdout.write(
+            f"{nombre:<28}{modo:<10}{datos['consultas']:>10}{datos['bytes'] / 1024:>12.1f}"
+            f"{datos['filas'] / 1024:>11.1f}{datos['memoria'] / 1024:>13.1f}{datos['ms']:>9.2f}"
+        )
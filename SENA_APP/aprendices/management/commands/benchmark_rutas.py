@@ -0,0 +1,441 @@
+import asyncio
+import datetime
+import functools
+import io
+import itertools
+import json
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from aprendices.exportacion import EXPORTACIONES, FORMATOS
+from aprendices.models import Aprendiz, Curso
+from api.recursos import RECURSOS
+from instructores.models import Instructor
+from programas.models import Programa
+from proyectos.models import Proyecto
+from SENA_APP.consultas import RegistroConsultas, registrando
+
+# Modelo del que se toma un id de ejemplo para cada parámetro de URL
+PARAMETROS = {
+    'aprendiz_id': Aprendiz,
+    'curso_id': Curso,
+    'instructor_id': Instructor,
+    'programa_id': Programa,
+    'proyecto_id': Proyecto,
+}
+
+# Valores de los parámetros que no son ids; se mide la ruta con cada combinación
+VALORES = {
+    'aprendices:exportar': {'recurso': list(EXPORTACIONES), 'formato': list(FORMATOS)},
+    'api:lista': {'recurso': list(RECURSOS)},
+    'api:detalle': {'recurso': list(RECURSOS)},
+}
+
+# Query string de ejemplo para las rutas cuyas consultas dependen de ella; sin
+# `q` la búsqueda no consulta el índice de texto completo
+CONSULTAS_EJEMPLO = {
+    'busqueda:buscar': {'q': 'sistemas'},
+}
+
+# Espacios de nombres que no se recorren automáticamente
+EXCLUIDOS = {'admin'}
+
+_secuencia = itertools.count(1)
+_base = int(time.time()) % 10 ** 8
+
+
+def _unico():
+    return f"{_base}{next(_secuencia):06d}"
+
+
+@functools.cache
+def _programa_de_ejemplo():
+    return Programa.objects.order_by('pk').values_list('pk', flat=True).first()
+
+
+def datos_aprendiz():
+    return {
+        'documento_identidad': _unico(), 'nombre': 'Carga', 'apellido': 'Prueba',
+        'programa': _programa_de_ejemplo(), 'fecha_nacimiento': '2000-01-01',
+    }
+
+
+def datos_instructor():
+    return {
+        'documento_identidad': _unico(), 'tipo_documento': 'CC', 'nombre': 'Carga', 'apellido': 'Prueba',
+        'fecha_nacimiento': '1985-01-01', 'nivel_educativo': 'MAE', 'especialidad': 'Software',
+        'anos_experiencia': '5', 'activo': 'on', 'fecha_vinculacion': '2020-01-01', 'fecha_registro': '2020-01-01',
+    }
+
+
+def datos_programa():
+    return {
+        'codigo': f"C{_unico()}", 'nombre': 'Programa de carga', 'nivel_formacion': 'TGL', 'modalidad': 'PRE',
+        'duracion_meses': '24', 'duracion_horas': '3000', 'descripcion': 'Descripción', 'competencias': 'Competencias',
+        'perfil_egreso': 'Perfil', 'requisitos_ingreso': 'Requisitos', 'centro_formacion': 'Centro',
+        'regional': 'Regional', 'estado': 'ACT', 'fecha_creacion': '2020-01-01',
+    }
+
+
+def datos_proyecto():
+    texto = 'Texto de prueba de carga'
+    return {
+        'titulo': f"Proyecto {_unico()}", 'descripcion_detallada': texto, 'area_proponente': 'Área',
+        'responsable': 'Responsable', 'objetivos_generales': texto, 'objetivos_especificos': texto,
+        'alcance_limitaciones': texto, 'presupuesto_estimado': '1000000', 'cronograma_tentativo': texto,
+        'recursos_necesarios': texto, 'beneficiarios_esperados': texto, 'indicadores_exito': texto,
+        'fecha_creacion': '2025-01-01',
+    }
+
+
+# Vistas de formulario que además se miden con POST
+FORMULARIOS = {
+    'aprendices:agregar_aprendiz': datos_aprendiz,
+    'instructores:crear_instructor': datos_instructor,
+    'programas:agregar_programa': datos_programa,
+    'proyectos:agregar_proyecto': datos_proyecto,
+}
+
+
+def percentil(valores, p):
+    ordenados = sorted(valores)
+    indice = min(int(round(p / 100 * (len(ordenados) - 1))), len(ordenados) - 1)
+    return ordenados[indice]
+
+
+def recorrer_rutas(patrones=None, espacio=''):
+    """Produce (nombre, parámetros) para cada ruta con nombre del URLconf."""
+    for patron in patrones if patrones is not None else get_resolver().url_patterns:
+        if isinstance(patron, URLResolver):
+            if patron.namespace in EXCLUIDOS:
+                continue
+            prefijo = f"{espacio}{patron.namespace}:" if patron.namespace else espacio
+            yield from recorrer_rutas(patron.url_patterns, prefijo)
+        elif isinstance(patron, URLPattern) and patron.name:
+            yield f"{espacio}{patron.name}", list(getattr(patron.pattern, 'converters', {}))
+
+
+def combinaciones(nombre):
+    """Diccionarios con cada combinación de VALORES para la ruta `nombre`."""
+    valores = VALORES.get(nombre, {})
+    for elegidos in itertools.product(*valores.values()):
+        yield dict(zip(valores, elegidos))
+
+
+def modelo_de(parametro, valores):
+    """Modelo del que se toma el id de ejemplo de `parametro`."""
+    if parametro == 'objeto_id':
+        # El id de la API depende del recurso elegido
+        return RECURSOS[valores['recurso']].modelo
+    return PARAMETROS.get(parametro)
+
+
+class ClienteWSGI:
+    """Envía peticiones directamente al callable WSGI del proyecto."""
+
+    def __init__(self, application, host):
+        self.application = application
+        self.host = host
+
+    def entorno(self, metodo, ruta, cuerpo=b'', cabeceras=None):
+        path, _, query = ruta.partition('?')
+        environ = {
+            'REQUEST_METHOD': metodo,
+            'PATH_INFO': path,
+            'QUERY_STRING': query,
+            'SERVER_NAME': self.host,
+            'REMOTE_ADDR': '127.0.0.1',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'HTTP_HOST': self.host,
+            'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+            'CONTENT_LENGTH': str(len(cuerpo)),
+            'wsgi.input': io.BytesIO(cuerpo),
+            'wsgi.errors': sys.stderr,
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        environ.update(cabeceras or {})
+        return environ
+
+    def peticion(self, metodo, ruta, cuerpo=b'', cabeceras=None):
+        """Devuelve (estado, bytes, cookies, segundos, consultas)."""
+        resultado = {}
+
+        def start_response(estado, cabeceras_respuesta, exc_info=None):
+            resultado['estado'] = int(estado.split()[0])
+            resultado['cookies'] = [valor for nombre, valor in cabeceras_respuesta if nombre.lower() == 'set-cookie']
+
+        inicio = time.perf_counter()
+        with registrando(RegistroConsultas()) as registro:
+            respuesta = self.application(self.entorno(metodo, ruta, cuerpo, cabeceras), start_response)
+            try:
+                tamano = sum(len(fragmento) for fragmento in respuesta)
+            finally:
+                if hasattr(respuesta, 'close'):
+                    respuesta.close()
+        return resultado['estado'], tamano, resultado['cookies'], time.perf_counter() - inicio, len(registro)
+
+
+class ClienteASGI:
+    """
+    Envía peticiones al callable ASGI del proyecto. Todas se atienden en un
+    único bucle de eventos en segundo plano, como en un worker de uvicorn:
+    los hilos del benchmark solo esperan su resultado.
+    """
+
+    def __init__(self, application, host):
+        self.application = application
+        self.host = host
+        self.bucle = asyncio.new_event_loop()
+        threading.Thread(target=self.bucle.run_forever, daemon=True).start()
+
+    def alcance(self, metodo, ruta, cabeceras=None):
+        path, _, query = ruta.partition('?')
+        encabezados = [(b'host', self.host.encode()),
+                       (b'content-type', b'application/x-www-form-urlencoded')]
+        for nombre, valor in (cabeceras or {}).items():
+            # Mismas claves que el entorno WSGI: HTTP_X_CSRFTOKEN -> x-csrftoken
+            encabezados.append((nombre.removeprefix('HTTP_').replace('_', '-').lower().encode(), valor.encode()))
+        return {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': metodo,
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query.encode(),
+            'root_path': '',
+            'headers': encabezados,
+            'client': ('127.0.0.1', 0),
+            'server': (self.host, 80),
+        }
+
+    async def atender(self, metodo, ruta, cuerpo, cabeceras):
+        resultado = {'tamano': 0}
+        terminada = asyncio.Event()
+        pendiente = [{'type': 'http.request', 'body': cuerpo, 'more_body': False}]
+
+        async def receive():
+            if pendiente:
+                return pendiente.pop()
+            # Django escucha la desconexión del cliente mientras corre la vista
+            await terminada.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(mensaje):
+            if mensaje['type'] == 'http.response.start':
+                resultado['estado'] = mensaje['status']
+                resultado['cookies'] = [valor.decode() for nombre, valor in mensaje['headers']
+                                        if nombre.lower() == b'set-cookie']
+            elif mensaje['type'] == 'http.response.body':
+                resultado['tamano'] += len(mensaje.get('body', b''))
+
+        with registrando(RegistroConsultas()) as registro:
+            try:
+                await self.application(self.alcance(metodo, ruta, cabeceras), receive, send)
+            finally:
+                terminada.set()
+        return resultado, len(registro)
+
+    def peticion(self, metodo, ruta, cuerpo=b'', cabeceras=None):
+        """Devuelve (estado, bytes, cookies, segundos, consultas)."""
+        inicio = time.perf_counter()
+        futuro = asyncio.run_coroutine_threadsafe(self.atender(metodo, ruta, cuerpo, cabeceras), self.bucle)
+        resultado, consultas = futuro.result()
+        return resultado['estado'], resultado['tamano'], resultado['cookies'], time.perf_counter() - inicio, consultas
+
+
+def simular_latencia(segundos):
+    """Agrega `segundos` de espera a cada consulta de las conexiones nuevas, como una base de datos remota."""
+    def esperar(execute, sql, params, many, context):
+        time.sleep(segundos)
+        return execute(sql, params, many, context)
+
+    def instalar(sender, connection, **kwargs):
+        # La señal se repite en cada reconexión del mismo objeto de conexión
+        if esperar not in connection.execute_wrappers:
+            connection.execute_wrappers.insert(0, esperar)
+
+    connection_created.connect(instalar, weak=False)
+    # Las conexiones ya abiertas se reabren con la espera instalada
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Ejecuta una prueba de carga en proceso sobre todas las rutas del proyecto a "
+        "través de la aplicación WSGI o ASGI y guarda las métricas en JSON. Por defecto "
+        "solo pide GET; con --con-escrituras también mide los POST de los formularios, que "
+        "crean registros «Carga Prueba»: úsese sobre una copia sembrada con seed_sena. Para "
+        "comparar interfaces, guardar una ejecución con --interfaz wsgi y pasarla en "
+        "--comparar a otra con --interfaz asgi."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--peticiones', type=int, default=200, help="Peticiones medidas por ruta")
+        parser.add_argument('--concurrencia', type=int, default=4,
+                            help="Peticiones simultáneas (hilos del servidor en WSGI, tareas del bucle en ASGI)")
+        parser.add_argument('--interfaz', choices=['wsgi', 'asgi'], default='wsgi')
+        parser.add_argument('--latencia-bd', type=float, default=0,
+                            help="Milisegundos agregados a cada consulta para simular una base de datos remota")
+        parser.add_argument('--calentamiento', type=int, default=5, help="Peticiones previas sin medir")
+        parser.add_argument('--rutas', nargs='*', help="Limitar a estos nombres de URL")
+        parser.add_argument('--con-escrituras', action='store_true',
+                            help="Medir también los POST de formularios, que crean registros en la base de datos")
+        parser.add_argument('--host', default='localhost')
+        parser.add_argument('--salida', default='benchmark_rutas.json')
+        parser.add_argument('--comparar', help="JSON de una ejecución anterior para detectar regresiones")
+        parser.add_argument('--tolerancia', type=float, default=0.2,
+                            help="Aumento relativo de p95 o de consultas que se considera regresión")
+
+    def handle(self, *args, **options):
+        if options['interfaz'] == 'asgi':
+            from SENA_APP.asgi import application
+            self.cliente = ClienteASGI(application, options['host'])
+        else:
+            from SENA_APP.wsgi import application
+            self.cliente = ClienteWSGI(application, options['host'])
+        if options['latencia_bd']:
+            simular_latencia(options['latencia_bd'] / 1000)
+
+        casos = self.casos(options)
+        if not casos:
+            raise CommandError("No hay rutas para medir.")
+
+        resultados = {}
+        for nombre, metodo, ruta, generador in casos:
+            clave = f"{metodo} {nombre}"
+            resultados[clave] = self.medir(metodo, ruta, generador, options)
+            self.imprimir(clave, resultados[clave])
+
+        informe = {
+            'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+            'interfaz': options['interfaz'],
+            'peticiones': options['peticiones'],
+            'concurrencia': options['concurrencia'],
+            'latencia_bd_ms': options['latencia_bd'],
+            'rutas': resultados,
+        }
+        with open(options['salida'], 'w', encoding='utf-8') as archivo:
+            json.dump(informe, archivo, indent=2, ensure_ascii=False)
+        self.stdout.write(f"Resultados guardados en {options['salida']}")
+
+        if options['comparar']:
+            self.comparar(options['comparar'], resultados, options['tolerancia'])
+
+    def casos(self, options):
+        ejemplos = {}
+
+        def ejemplo(modelo):
+            if modelo not in ejemplos:
+                ejemplos[modelo] = modelo.objects.order_by('pk').values_list('pk', flat=True).first()
+            return ejemplos[modelo]
+
+        casos = []
+        for nombre, parametros in recorrer_rutas():
+            if options['rutas'] and nombre not in options['rutas']:
+                continue
+            for valores in combinaciones(nombre):
+                # Cada combinación se mide y se compara por separado
+                etiqueta = nombre + ''.join(f"[{valor}]" for valor in valores.values())
+                argumentos = dict(valores)
+                for parametro in parametros:
+                    if parametro not in argumentos:
+                        modelo = modelo_de(parametro, valores)
+                        argumentos[parametro] = ejemplo(modelo) if modelo else None
+                faltantes = [parametro for parametro, valor in argumentos.items() if valor is None]
+                if faltantes:
+                    self.stderr.write(f"Se omite {etiqueta}: no hay datos para {faltantes}")
+                    continue
+                ruta = reverse(nombre, kwargs=argumentos)
+                if nombre in CONSULTAS_EJEMPLO:
+                    ruta = f"{ruta}?{urlencode(CONSULTAS_EJEMPLO[nombre])}"
+                casos.append((etiqueta, 'GET', ruta, None))
+                if nombre in FORMULARIOS and options['con_escrituras']:
+                    casos.append((etiqueta, 'POST', ruta, FORMULARIOS[nombre]))
+        return casos
+
+    def cabeceras_csrf(self, ruta):
+        """Pide el formulario una vez para obtener la cookie CSRF que exigen los POST."""
+        _, _, cookies, _, _ = self.cliente.peticion('GET', ruta)
+        galleta = SimpleCookie()
+        for cookie in cookies:
+            galleta.load(cookie)
+        if 'csrftoken' not in galleta:
+            return {}
+        token = galleta['csrftoken'].value
+        return {'HTTP_COOKIE': f"csrftoken={token}", 'HTTP_X_CSRFTOKEN': token}
+
+    def medir(self, metodo, ruta, generador, options):
+        cabeceras = self.cabeceras_csrf(ruta) if metodo == 'POST' else None
+
+        def una_peticion(_):
+            cuerpo = urlencode(generador()).encode() if generador else b''
+            return self.cliente.peticion(metodo, ruta, cuerpo, cabeceras)
+
+        for indice in range(options['calentamiento']):
+            una_peticion(indice)
+
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrencia']) as ejecutor:
+            muestras = list(ejecutor.map(una_peticion, range(options['peticiones'])))
+        duracion = time.perf_counter() - inicio
+
+        latencias = [segundos * 1000 for _, _, _, segundos, _ in muestras]
+        return {
+            'ruta': ruta,
+            'peticiones': len(muestras),
+            'errores': sum(1 for estado, *_ in muestras if estado >= 400),
+            'estados': sorted({estado for estado, *_ in muestras}),
+            'rps': round(len(muestras) / duracion, 1),
+            'p50_ms': round(percentil(latencias, 50), 2),
+            'p95_ms': round(percentil(latencias, 95), 2),
+            'p99_ms': round(percentil(latencias, 99), 2),
+            'consultas': round(statistics.mean(consultas for *_, consultas in muestras), 1),
+            'bytes': round(statistics.mean(tamano for _, tamano, *_ in muestras)),
+        }
+
+    def imprimir(self, clave, datos):
+        self.stdout.write(
+            f"{clave:<44} {datos['rps']:>8} req/s  p50 {datos['p50_ms']:>8} ms  p95 {datos['p95_ms']:>8} ms  "
+            f"p99 {datos['p99_ms']:>8} ms  {datos['consultas']:>6} consultas  {datos['bytes']:>9} B  "
+            f"estados {datos['estados']}"
+        )
+
+    def comparar(self, archivo_anterior, resultados, tolerancia):
+        with open(archivo_anterior, encoding='utf-8') as archivo:
+            informe_anterior = json.load(archivo)
+        anteriores = informe_anterior['rutas']
+        self.stdout.write(f"Comparación con {archivo_anterior} ({informe_anterior.get('interfaz', 'wsgi')}):")
+
+        regresiones = []
+        for clave, datos in resultados.items():
+            anterior = anteriores.get(clave)
+            if anterior is None:
+                continue
+            self.stdout.write(
+                f"{clave:<44} {anterior['rps']:>8} -> {datos['rps']:>8} req/s  "
+                f"p95 {anterior['p95_ms']:>8} -> {datos['p95_ms']:>8} ms"
+            )
+            for metrica in ('p95_ms', 'consultas', 'bytes'):
+                if anterior[metrica] and datos[metrica] > anterior[metrica] * (1 + tolerancia):
+                    regresiones.append(f"{clave}: {metrica} {anterior[metrica]} -> {datos[metrica]}")
+
+        if regresiones:
+            raise CommandError("Regresiones detectadas:\n" + '\n'.join(regresiones))
+        self.stdout.write(self.style.SUCCESS("Sin regresiones respecto a la ejecución anterior."))
@@ -0,0 +1,159 @@
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+
+from aprendices.models import Aprendiz, AprendizCurso
+
+ALIAS = 'benchmark_sqlite'
+
+# nombre: (journal_mode a dejar en la copia, OPTIONS de la conexión)
+CONFIGURACIONES = {
+    'sin ajustes': ('DELETE', {}),
+    'configurada': ('WAL', None),  # None: las OPTIONS de settings.DATABASES
+}
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p / 100))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide lecturas y escrituras concurrentes sobre una copia de la base SQLite, "
+        "sin ajustes y con los PRAGMA de SQLITE_PRAGMAS, y cuenta los errores "
+        "'database is locked'. Las escrituras imitan el formulario de aprendices "
+        "(INSERT) y list_editable de inscripciones (leer y luego actualizar en una "
+        "transacción)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hilos', type=int, default=8)
+        parser.add_argument('--segundos', type=float, default=10, help="Duración de cada configuración")
+        parser.add_argument('--escrituras', type=float, default=0.2, help="Fracción de operaciones que escriben")
+        parser.add_argument('--configuraciones', nargs='+', choices=list(CONFIGURACIONES),
+                            default=list(CONFIGURACIONES))
+
+    def handle(self, *args, **options):
+        base = settings.DATABASES['default']
+        if base['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError("La base de datos por defecto no es SQLite.")
+
+        self.inscripciones = list(AprendizCurso.objects.values_list('id', flat=True)[:5000])
+        self.aprendices = list(Aprendiz.objects.values_list('id', flat=True)[:5000])
+        if not self.inscripciones:
+            raise CommandError("No hay inscripciones: siembre la base con seed_sena.")
+
+        with tempfile.TemporaryDirectory() as directorio:
+            copia = Path(directorio) / 'benchmark.sqlite3'
+            self.copiar(base['NAME'], copia)
+            self.stdout.write(
+                f"{'configuración':<14}{'ops/s':>9}{'lect p50':>10}{'lect p95':>10}"
+                f"{'escr p50':>10}{'escr p95':>10}{'bloqueos':>10}"
+            )
+            for nombre in options['configuraciones']:
+                journal_mode, opciones = CONFIGURACIONES[nombre]
+                self.preparar(copia, journal_mode, base['OPTIONS'] if opciones is None else opciones)
+                try:
+                    self.imprimir(nombre, self.ejecutar(options))
+                finally:
+                    del connections.settings[ALIAS]
+
+    def copiar(self, origen, destino):
+        # La API de respaldo da una copia consistente aunque la base esté en uso
+        fuente, copia = sqlite3.connect(origen), sqlite3.connect(destino)
+        try:
+            fuente.backup(copia)
+        finally:
+            fuente.close()
+            copia.close()
+
+    def preparar(self, copia, journal_mode, opciones):
+        # journal_mode persiste en el archivo: se fija antes de abrir las conexiones
+        conexion = sqlite3.connect(copia)
+        try:
+            conexion.execute(f'PRAGMA journal_mode = {journal_mode}')
+        finally:
+            conexion.close()
+        connections.settings[ALIAS] = {
+            **connections.settings['default'], 'NAME': str(copia), 'OPTIONS': opciones,
+        }
+
+    def ejecutar(self, options):
+        fin = time.perf_counter() + options['segundos']
+        lecturas, escrituras, bloqueos = [], [], []
+
+        def trabajador(semilla):
+            azar = random.Random(semilla)
+            try:
+                while time.perf_counter() < fin:
+                    escribe = azar.random() < options['escrituras']
+                    inicio = time.perf_counter()
+                    try:
+                        if escribe:
+                            self.escribir(azar)
+                        else:
+                            self.leer(azar)
+                    except OperationalError as error:
+                        if 'locked' not in str(error):
+                            raise
+                        bloqueos.append(error)
+                        continue
+                    (escrituras if escribe else lecturas).append((time.perf_counter() - inicio) * 1000)
+            finally:
+                connections[ALIAS].close()
+
+        hilos = [threading.Thread(target=trabajador, args=(semilla,)) for semilla in range(options['hilos'])]
+        inicio = time.perf_counter()
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        duracion = time.perf_counter() - inicio
+        return {
+            'ops': (len(lecturas) + len(escrituras)) / duracion,
+            'lecturas': lecturas,
+            'escrituras': escrituras,
+            'bloqueos': len(bloqueos),
+        }
+
+    def leer(self, azar):
+        # Una página del listado de aprendices y el conteo de un curso
+        desde = azar.choice(self.aprendices)
+        list(Aprendiz.objects.using(ALIAS).filter(id__gte=desde).order_by('id')[:50])
+        AprendizCurso.objects.using(ALIAS).filter(curso_id=azar.randint(1, 1000)).count()
+
+    def escribir(self, azar):
+        # bulk_create y update() no disparan señales, que escribirían en la base real
+        if azar.random() < 0.5:
+            sufijo = f"{threading.get_ident() % 10 ** 6}{time.perf_counter_ns() % 10 ** 9}"
+            Aprendiz.objects.using(ALIAS).bulk_create([Aprendiz(
+                documento_identidad=f"B{sufijo}"[:20], nombre='Benchmark', apellido='SQLite',
+                fecha_nacimiento='2000-01-01',
+            )])
+            return
+        with transaction.atomic(using=ALIAS):
+            inscripcion_id = azar.choice(self.inscripciones)
+            AprendizCurso.objects.using(ALIAS).filter(pk=inscripcion_id).values_list('nota_final').get()
+            AprendizCurso.objects.using(ALIAS).filter(pk=inscripcion_id).update(
+                nota_final=Decimal(azar.randint(0, 50)) / 10,
+            )
+
+    def imprimir(self, nombre, datos):
+        lecturas, escrituras = datos['lecturas'], datos['escrituras']
+        self.stdout.write(
+            f"{nombre:<14}{datos['ops']:>9.1f}{statistics.median(lecturas or [0]):>10.2f}"
+            f"{percentil(lecturas, 95):>10.2f}{statistics.median(escrituras or [0]):>10.2f}"
+            f"{percentil(escrituras, 95):>10.2f}{datos['bloqueos']:>10}"
+        )
@@ -0,0 +1,57 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from aprendices.importacion import ArchivoInvalido
+from aprendices.models import Curso
+from aprendices.notas import cargar_notas
+
+
+class Command(BaseCommand):
+    help = (
+        "Carga las notas finales de un curso desde un CSV con encabezado (documento_identidad, "
+        "nota_final y, opcionalmente, estado) y muestra las filas cambiadas, sin cambios y "
+        "rechazadas. Los cambios válidos se guardan en una sola transacción."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('codigo', help="Código del curso")
+        parser.add_argument('archivo', help="Ruta del CSV")
+        parser.add_argument('--codificacion', default='utf-8-sig')
+        parser.add_argument('--simular', action='store_true', help="Mostrar los cambios sin guardarlos")
+        parser.add_argument('--reporte', help="CSV donde escribir la diferencia completa")
+
+    def handle(self, *args, **options):
+        curso = Curso.objects.filter(codigo=options['codigo']).only('id').first()
+        if curso is None:
+            raise CommandError(f"No existe un curso con código «{options['codigo']}».")
+        try:
+            with open(options['archivo'], newline='', encoding=options['codificacion']) as archivo:
+                resultado = cargar_notas(curso.pk, archivo, simular=options['simular'])
+        except (OSError, ArchivoInvalido, UnicodeDecodeError) as error:
+            raise CommandError(str(error))
+
+        if options['reporte']:
+            with open(options['reporte'], 'w', newline='', encoding='utf-8') as archivo:
+                reporte = csv.writer(archivo)
+                reporte.writerow(['resultado', 'fila', 'documento_identidad', 'nota_anterior', 'nota_nueva',
+                                  'estado_anterior', 'estado_nuevo', 'errores'])
+                for cambio in resultado.cambiadas:
+                    reporte.writerow(['cambiada', *cambio, ''])
+                for documento in resultado.sin_cambios:
+                    reporte.writerow(['sin cambios', '', documento, '', '', '', '', ''])
+                for fila, documento, mensajes in resultado.rechazadas:
+                    reporte.writerow(['rechazada', fila, documento, '', '', '', '', ' | '.join(mensajes)])
+
+        accion = "por cambiar" if options['simular'] else "actualizadas"
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado.leidas} filas leídas: {len(resultado.cambiadas)} {accion}, "
+            f"{len(resultado.sin_cambios)} sin cambios, {len(resultado.rechazadas)} rechazadas."
+        ))
+        for cambio in resultado.cambiadas:
+            self.stdout.write(
+                f"  fila {cambio.fila} ({cambio.documento}): nota {cambio.nota_anterior} -> {cambio.nota_nueva}, "
+                f"estado {cambio.estado_anterior} -> {cambio.estado_nuevo}"
+            )
+        for fila, documento, mensajes in resultado.rechazadas:
+            self.stdout.write(f"  fila {fila} ({documento}): {'; '.join(mensajes)}")
@@ -0,0 +1,77 @@
+import csv
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+
+from aprendices.choques import todos_los_choques
+from aprendices.horarios import TAMANO_LOTE, describir, reconstruir_ocupaciones, recurso_instructor
+from aprendices.models import Curso, InstructorCurso, Ocupacion
+from instructores.models import Instructor
+
+
+class Command(BaseCommand):
+    help = (
+        "Lista los cursos que chocan en un aula o en un instructor: comparten el recurso, "
+        "sus fechas se cruzan, tienen días en común y sus horas se cruzan. Por defecto solo "
+        "revisa los cursos que terminan desde hoy."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', type=datetime.date.fromisoformat, default=datetime.date.today(),
+                            help="Revisar cursos que terminan desde esta fecha AAAA-MM-DD (por defecto, hoy)")
+        parser.add_argument('--todos', action='store_true', help="Revisar también los cursos ya terminados")
+        parser.add_argument('--reconstruir', action='store_true',
+                            help="Recalcular antes las ocupaciones de todos los cursos (tras bulk_create o update())")
+        parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help="Cursos por transacción al reconstruir")
+        parser.add_argument('--reporte', help="CSV donde escribir todos los choques")
+        parser.add_argument('--mostrar', type=int, default=20, help="Choques a listar en consola")
+
+    def handle(self, *args, **options):
+        if options['reconstruir']:
+            inicio = time.perf_counter()
+            creadas = reconstruir_ocupaciones(Curso, InstructorCurso, Ocupacion, tamano_lote=options['lote'])
+            self.stdout.write(f"{creadas} ocupaciones recalculadas en {time.perf_counter() - inicio:.1f} s")
+
+        inicio = time.perf_counter()
+        # Un par de cursos que choca en varias franjas se informa una vez por recurso
+        choques = {}
+        for anterior, ocupacion in todos_los_choques(None if options['todos'] else options['desde']):
+            primero, segundo = sorted([anterior, ocupacion], key=lambda intervalo: intervalo.curso_id)
+            choques.setdefault((ocupacion.recurso, primero.curso_id, segundo.curso_id), (primero, segundo))
+        duracion = time.perf_counter() - inicio
+
+        cursos = Curso.objects.only('codigo').in_bulk({curso_id for _, a, b in choques for curso_id in (a, b)})
+        prefijo = recurso_instructor('')
+        instructores = Instructor.objects.only('nombre', 'apellido').in_bulk(
+            {int(recurso.removeprefix(prefijo)) for recurso, _, _ in choques if recurso.startswith(prefijo)}
+        )
+
+        def recurso(clave):
+            if clave.startswith(prefijo):
+                instructor = instructores.get(int(clave.removeprefix(prefijo)))
+                return 'instructor', f"{instructor.nombre} {instructor.apellido}" if instructor else clave
+            return 'aula', clave.partition(':')[2]
+
+        filas = []
+        for (clave, _, _), (primero, segundo) in choques.items():
+            tipo, nombre = recurso(clave)
+            filas.append([
+                tipo, nombre, cursos[primero.curso_id].codigo, describir(primero),
+                cursos[segundo.curso_id].codigo, describir(segundo),
+            ])
+
+        if options['reporte']:
+            with open(options['reporte'], 'w', newline='', encoding='utf-8') as archivo:
+                reporte = csv.writer(archivo)
+                reporte.writerow(['tipo', 'recurso', 'curso', 'horario', 'otro_curso', 'otro_horario'])
+                reporte.writerows(filas)
+
+        de_aula = sum(fila[0] == 'aula' for fila in filas)
+        self.stdout.write(self.style.SUCCESS(
+            f"{de_aula} choques de aula y {len(filas) - de_aula} de instructor, encontrados en {duracion:.1f} s."
+        ))
+        for tipo, nombre, curso, horario, otro, otro_horario in filas[:options['mostrar']]:
+            self.stdout.write(f"  {tipo} {nombre}: {curso} ({horario}) con {otro} ({otro_horario})")
+        if len(filas) > options['mostrar']:
+            self.stdout.write(f"  ... {len(filas) - options['mostrar']} choques más.")
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from aprendices.importacion import TAMANO_LOTE, ArchivoInvalido, importar_aprendices
+
+
+class Command(BaseCommand):
+    help = (
+        "Importa aprendices desde un archivo CSV con encabezado (documento_identidad, "
+        "nombre, apellido, programa (nombre o código), telefono, correo, fecha_nacimiento, ciudad). "
+        "El archivo se procesa por lotes sin cargarlo completo en memoria."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help="Ruta del CSV")
+        parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help="Filas por transacción")
+        parser.add_argument('--reporte', help="CSV donde escribir las filas rechazadas")
+        parser.add_argument('--codificacion', default='utf-8-sig')
+        parser.add_argument('--simular', action='store_true', help="Validar sin insertar")
+
+    def handle(self, *args, **options):
+        reporte = open(options['reporte'], 'w', newline='', encoding='utf-8') if options['reporte'] else None
+        try:
+            with open(options['archivo'], newline='', encoding=options['codificacion']) as archivo:
+                resultado = importar_aprendices(
+                    archivo, tamano_lote=options['lote'], reporte=reporte, simular=options['simular'],
+                )
+        except (OSError, ArchivoInvalido, UnicodeDecodeError) as error:
+            raise CommandError(str(error))
+        finally:
+            if reporte is not None:
+                reporte.close()
+
+        accion = "válidas" if options['simular'] else "creadas"
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado.leidas} filas leídas, {resultado.creadas} {accion}, {resultado.rechazadas} rechazadas."
+        ))
+        if resultado.rechazadas and not options['reporte']:
+            for fila, documento, mensajes in resultado.errores:
+                self.stdout.write(f"  fila {fila} ({documento}): {'; '.join(mensajes)}")
+            if resultado.rechazadas > len(resultado.errores):
+                self.stdout.write("  ... use --reporte para obtener la lista completa.")
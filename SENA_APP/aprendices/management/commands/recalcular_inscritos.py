@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from aprendices.contadores import recalcular_inscritos
+
+
+class Command(BaseCommand):
+    help = "Recalcula el contador de aprendices inscritos de cada curso en una sola pasada"
+
+    def add_arguments(self, parser):
+        parser.add_argument('cursos', nargs='*', type=int, help="Ids de cursos (por defecto, todos)")
+
+    def handle(self, *args, **options):
+        actualizados = recalcular_inscritos(options['cursos'] or None)
+        self.stdout.write(self.style.SUCCESS(f"{actualizados} cursos corregidos."))
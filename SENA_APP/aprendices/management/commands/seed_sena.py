@@ -0,0 +1,286 @@
+import datetime
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from aprendices.contadores import recalcular_inscritos
+from aprendices.estadisticas import invalidar_estadisticas
+from aprendices.horarios import reconstruir_ocupaciones
+from aprendices.models import Aprendiz, AprendizCurso, Curso, InstructorCurso, Ocupacion
+from busqueda import indice
+from instructores.models import Instructor
+from programas.models import Programa
+from proyectos.models import Proyecto
+
+NOMBRES = [
+    'Juan', 'María', 'Carlos', 'Ana', 'Luis', 'Laura', 'Andrés', 'Valentina', 'Jorge', 'Camila',
+    'Santiago', 'Daniela', 'Felipe', 'Sofía', 'Miguel', 'Natalia', 'Sebastián', 'Paula', 'Diego',
+    'Isabella', 'Alejandro', 'Mariana', 'Julián', 'Gabriela', 'Óscar', 'Lucía', 'Héctor', 'Ángela',
+]
+APELLIDOS = [
+    'García', 'Rodríguez', 'Martínez', 'López', 'González', 'Hernández', 'Pérez', 'Sánchez',
+    'Ramírez', 'Torres', 'Flórez', 'Rivera', 'Gómez', 'Díaz', 'Moreno', 'Muñoz', 'Rojas', 'Vargas',
+    'Castro', 'Ortiz', 'Jiménez', 'Cárdenas', 'Suárez', 'Castaño', 'Peña', 'Valencia', 'Ospina',
+]
+CIUDADES = [
+    ('Bogotá', 30), ('Medellín', 15), ('Cali', 12), ('Barranquilla', 8), ('Bucaramanga', 6),
+    ('Cartagena', 5), ('Pereira', 4), ('Manizales', 4), ('Ibagué', 3), ('Pasto', 3), ('Neiva', 2),
+]
+AREAS = [
+    'Análisis y Desarrollo de Software', 'Gestión Administrativa', 'Contabilidad y Finanzas',
+    'Electricidad Industrial', 'Mecánica Automotriz', 'Cocina', 'Enfermería', 'Logística',
+    'Diseño Gráfico', 'Redes y Telecomunicaciones', 'Gestión Ambiental', 'Producción Agropecuaria',
+]
+REGIONALES = ['Distrito Capital', 'Antioquia', 'Valle', 'Atlántico', 'Santander', 'Bolívar', 'Risaralda']
+HORARIOS = ['Lunes a Viernes 7:00-13:00', 'Lunes a Viernes 13:00-19:00', 'Lunes a Viernes 18:00-22:00', 'Sábados 8:00-17:00']
+ROLES = ['Instructor Técnico', 'Instructor Transversal', 'Instructor de Inglés', 'Instructor de Emprendimiento']
+PALABRAS = (
+    'formación competencias aprendizaje proyecto desarrollo calidad gestión innovación técnica '
+    'productiva empresa comunidad seguimiento evaluación recursos objetivos impacto sostenible'
+).split()
+
+# (peso, meses) por nivel de formación
+NIVELES = {'AUX': (5, 6), 'OPE': (10, 12), 'TEC': (35, 12), 'TGL': (35, 24), 'ESP': (5, 6), 'COM': (10, 1)}
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera datos sintéticos reproducibles para pruebas de carga. Inserta con "
+        "bulk_create por lotes; debe ejecutarse sobre una base de datos vacía "
+        "(ver `manage.py flush`)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--programas', type=int, default=50)
+        parser.add_argument('--instructores', type=int, default=500)
+        parser.add_argument('--cursos', type=int, default=2000)
+        parser.add_argument('--aprendices', type=int, default=50000)
+        parser.add_argument('--proyectos', type=int, default=1000)
+        parser.add_argument('--semilla', type=int, default=2025, help="La misma semilla produce los mismos datos")
+        parser.add_argument('--lote', type=int, default=5000, help="Filas por bulk_create y por transacción")
+        parser.add_argument('--fecha', type=datetime.date.fromisoformat, default=datetime.date.today(),
+                            help="Fecha de referencia AAAA-MM-DD para estados y fechas (por defecto, hoy)")
+        parser.add_argument('--sin-indice', action='store_true', help="No reconstruir el índice de búsqueda")
+
+    def handle(self, *args, **options):
+        modelos = [Programa, Instructor, Curso, Aprendiz, AprendizCurso, InstructorCurso, Proyecto]
+        if any(modelo.objects.exists() for modelo in modelos):
+            raise CommandError("La base de datos ya tiene datos; ejecute `manage.py flush` antes de sembrar.")
+
+        self.rng = random.Random(options['semilla'])
+        self.lote = options['lote']
+        self.hoy = options['fecha']
+        inicio = time.perf_counter()
+
+        programas = self.paso("programas", self.crear_programas, options['programas'])
+        instructores = self.paso("instructores", self.crear_instructores, options['instructores'])
+        aprendices = self.paso("aprendices", self.crear_aprendices, options['aprendices'], programas)
+        cursos = self.paso("cursos", self.crear_cursos, options['cursos'], programas, instructores)
+        self.paso("inscripciones", self.crear_inscripciones, cursos, aprendices)
+        self.paso("instructores por curso", self.crear_asignaciones, cursos, instructores)
+        # bulk_create no emite las señales que mantienen las ocupaciones
+        self.paso("ocupaciones de aulas e instructores",
+                  lambda: reconstruir_ocupaciones(Curso, InstructorCurso, Ocupacion, tamano_lote=self.lote))
+        self.paso("proyectos", self.crear_proyectos, options['proyectos'])
+
+        recalcular_inscritos()
+        invalidar_estadisticas()
+        if not options['sin_indice'] and indice.disponible():
+            self.paso("índice de búsqueda", lambda: sum(indice.reconstruir(self.lote).values()))
+
+        self.stdout.write(self.style.SUCCESS(f"Datos generados en {time.perf_counter() - inicio:.1f} s"))
+
+    def paso(self, nombre, funcion, *args):
+        inicio = time.perf_counter()
+        resultado = funcion(*args)
+        total = resultado if isinstance(resultado, int) else len(resultado)
+        self.stdout.write(f"  {nombre}: {total} filas en {time.perf_counter() - inicio:.1f} s")
+        return resultado
+
+    def insertar(self, modelo, filas):
+        """Inserta un iterable de instancias por lotes y devuelve los ids creados."""
+        ids, lote = [], []
+        for fila in filas:
+            lote.append(fila)
+            if len(lote) >= self.lote:
+                ids.extend(self._guardar_lote(modelo, lote))
+                lote = []
+        if lote:
+            ids.extend(self._guardar_lote(modelo, lote))
+        return ids
+
+    def _guardar_lote(self, modelo, lote):
+        # bulk_create no pasa por save(), que calcula las claves de búsqueda
+        if hasattr(modelo, 'calcular_claves'):
+            for objeto in lote:
+                objeto.calcular_claves()
+        with transaction.atomic():
+            creados = modelo.objects.bulk_create(lote, batch_size=self.lote)
+        return [objeto.pk for objeto in creados]
+
+    def texto(self, palabras):
+        return ' '.join(self.rng.choices(PALABRAS, k=palabras)).capitalize() + '.'
+
+    def fecha_nacimiento(self, edad_minima, edad_maxima):
+        return self.hoy - datetime.timedelta(days=self.rng.randint(edad_minima * 365, edad_maxima * 365))
+
+    def crear_programas(self, cantidad):
+        niveles = list(NIVELES)
+        pesos = [NIVELES[nivel][0] for nivel in niveles]
+        programas = []
+        for i in range(cantidad):
+            nivel = self.rng.choices(niveles, pesos)[0]
+            meses = NIVELES[nivel][1]
+            programas.append(Programa(
+                codigo=f"{nivel}{i + 1:06d}",
+                nombre=f"{self.rng.choice(AREAS)} {i + 1}",
+                nivel_formacion=nivel,
+                modalidad=self.rng.choices(['PRE', 'VIR', 'MIX'], [60, 25, 15])[0],
+                duracion_meses=meses,
+                duracion_horas=meses * 160,
+                descripcion=self.texto(60),
+                competencias=self.texto(40),
+                perfil_egreso=self.texto(30),
+                requisitos_ingreso=self.texto(15),
+                centro_formacion=f"Centro de {self.rng.choice(AREAS)}",
+                regional=self.rng.choice(REGIONALES),
+                estado=self.rng.choices(['ACT', 'INA', 'SUS', 'CAN'], [85, 8, 4, 3])[0],
+                fecha_creacion=self.hoy - datetime.timedelta(days=self.rng.randint(365, 3650)),
+            ))
+        # bulk_create no pasa por save(), que calcula el extracto
+        for programa in programas:
+            programa.calcular_extracto()
+        ids = self.insertar(Programa, programas)
+        return [(pk, programa.nombre, programa.duracion_meses) for pk, programa in zip(ids, programas)]
+
+    def crear_instructores(self, cantidad):
+        ciudades, pesos = zip(*CIUDADES)
+        return self.insertar(Instructor, (
+            Instructor(
+                documento_identidad=str(70000000 + i),
+                tipo_documento=self.rng.choices(['CC', 'CE', 'PAS'], [95, 4, 1])[0],
+                nombre=self.rng.choice(NOMBRES),
+                apellido=f"{self.rng.choice(APELLIDOS)} {self.rng.choice(APELLIDOS)}",
+                telefono=f"3{self.rng.randint(100000000, 999999999)}",
+                correo=f"instructor{i}@sena.edu.co",
+                fecha_nacimiento=self.fecha_nacimiento(25, 65),
+                ciudad=self.rng.choices(ciudades, pesos)[0],
+                direccion=f"Calle {self.rng.randint(1, 200)} # {self.rng.randint(1, 99)}-{self.rng.randint(1, 99)}",
+                nivel_educativo=self.rng.choices(['TEC', 'TGL', 'PRE', 'ESP', 'MAE', 'DOC'], [5, 15, 35, 25, 17, 3])[0],
+                especialidad=self.rng.choice(AREAS),
+                anos_experiencia=int(self.rng.triangular(1, 35, 8)),
+                activo=self.rng.random() < 0.9,
+                fecha_vinculacion=self.hoy - datetime.timedelta(days=self.rng.randint(30, 7000)),
+            )
+            for i in range(cantidad)
+        ))
+
+    def crear_aprendices(self, cantidad, programas):
+        ciudades, pesos = zip(*CIUDADES)
+        return self.insertar(Aprendiz, (
+            Aprendiz(
+                documento_identidad=str(1000000000 + i),
+                nombre=self.rng.choice(NOMBRES),
+                apellido=f"{self.rng.choice(APELLIDOS)} {self.rng.choice(APELLIDOS)}",
+                telefono=f"3{self.rng.randint(100000000, 999999999)}" if self.rng.random() < 0.9 else None,
+                correo=f"aprendiz{i}@misena.edu.co" if self.rng.random() < 0.85 else None,
+                fecha_nacimiento=self.fecha_nacimiento(16, 45),
+                ciudad=self.rng.choices(ciudades, pesos)[0],
+                programa_id=self.rng.choice(programas)[0] if programas else None,
+            )
+            for i in range(cantidad)
+        ))
+
+    def crear_cursos(self, cantidad, programas, instructores):
+        if not programas or not instructores:
+            return []
+        cursos = []
+        for i in range(cantidad):
+            programa_id, _, meses = self.rng.choice(programas)
+            # Inicios repartidos entre hace tres años y dentro de seis meses
+            fecha_inicio = self.hoy + datetime.timedelta(days=self.rng.randint(-3 * 365, 180))
+            fecha_fin = fecha_inicio + datetime.timedelta(days=max(meses, 1) * 30)
+            if fecha_inicio > self.hoy:
+                estado = 'PRO'
+            elif fecha_fin < self.hoy:
+                estado = 'FIN'
+            else:
+                estado = 'EJE' if (self.hoy - fecha_inicio).days > 30 else 'INI'
+            if self.rng.random() < 0.03:
+                estado = self.rng.choice(['CAN', 'SUS'])
+            cursos.append(Curso(
+                codigo=f"F{2500000 + i}",
+                nombre=f"Ficha {2500000 + i}",
+                programa_id=programa_id,
+                instructor_coordinador_id=self.rng.choice(instructores),
+                fecha_inicio=fecha_inicio,
+                fecha_fin=fecha_fin,
+                horario=self.rng.choice(HORARIOS),
+                aula=f"{self.rng.randint(1, 5)}{self.rng.randint(1, 40):02d}",
+                cupos_maximos=self.rng.choice([25, 30, 35, 40]),
+                estado=estado,
+            ))
+        ids = self.insertar(Curso, cursos)
+        return [(pk, curso.estado, curso.cupos_maximos) for pk, curso in zip(ids, cursos)]
+
+    def crear_inscripciones(self, cursos, aprendices):
+        if not aprendices:
+            return 0
+
+        def filas():
+            for curso_id, estado_curso, cupos in cursos:
+                # Ocupación entre 60 % y 100 %, salvo cursos programados aún con pocas inscripciones
+                ocupacion = self.rng.uniform(0.1, 0.6) if estado_curso == 'PRO' else self.rng.uniform(0.6, 1.0)
+                tamano = min(int(cupos * ocupacion), len(aprendices))
+                for aprendiz_id in self.rng.sample(aprendices, tamano):
+                    yield self.inscripcion(curso_id, estado_curso, aprendiz_id)
+
+        return len(self.insertar(AprendizCurso, filas()))
+
+    def inscripcion(self, curso_id, estado_curso, aprendiz_id):
+        nota = None
+        if estado_curso == 'FIN':
+            estado = self.rng.choices(['GRA', 'DES', 'SUS'], [75, 20, 5])[0]
+            if estado == 'GRA':
+                nota = Decimal(self.rng.randint(30, 50)) / 10
+            elif self.rng.random() < 0.5:
+                nota = Decimal(self.rng.randint(0, 29)) / 10
+        elif estado_curso in Curso.ESTADOS_ACTIVOS:
+            estado = self.rng.choices(['ACT', 'DES', 'SUS'], [88, 9, 3])[0]
+        else:
+            estado = 'INS'
+        return AprendizCurso(aprendiz_id=aprendiz_id, curso_id=curso_id, estado=estado, nota_final=nota)
+
+    def crear_asignaciones(self, cursos, instructores):
+        def filas():
+            for curso_id, _, _ in cursos:
+                for instructor_id in self.rng.sample(instructores, min(self.rng.randint(1, 4), len(instructores))):
+                    yield InstructorCurso(instructor_id=instructor_id, curso_id=curso_id, rol=self.rng.choice(ROLES))
+
+        return len(self.insertar(InstructorCurso, filas()))
+
+    def crear_proyectos(self, cantidad):
+        def filas():
+            for i in range(cantidad):
+                proyecto = Proyecto(
+                    titulo=f"Proyecto {i + 1}: {self.texto(5)}",
+                    descripcion_detallada=self.texto(120),
+                    area_proponente=self.rng.choice(AREAS),
+                    responsable=f"{self.rng.choice(NOMBRES)} {self.rng.choice(APELLIDOS)}",
+                    objetivos_generales=self.texto(40),
+                    objetivos_especificos=self.texto(60),
+                    alcance_limitaciones=self.texto(50),
+                    presupuesto_estimado=Decimal(self.rng.randint(1, 500)) * 1000000,
+                    cronograma_tentativo=self.texto(40),
+                    recursos_necesarios=self.texto(40),
+                    beneficiarios_esperados=self.texto(30),
+                    indicadores_exito=self.texto(30),
+                )
+                # bulk_create no pasa por save(), que calcula el extracto
+                proyecto.calcular_extracto()
+                yield proyecto
+
+        return self.insertar(Proyecto, filas())
@@ -0,0 +1,38 @@
+import csv
+
+from django.core.management.base import BaseCommand
+
+from aprendices.vinculacion import TAMANO_LOTE, vincular_programas
+
+
+class Command(BaseCommand):
+    help = (
+        "Asigna el programa de formación a los aprendices que solo lo tienen como "
+        "texto (programa_texto), comparando nombre y código normalizados. Se puede "
+        "repetir: solo procesa los aprendices aún sin programa."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help="Aprendices por transacción")
+        parser.add_argument('--reporte', help="CSV donde escribir cada aprendiz que no se pudo vincular")
+        parser.add_argument('--mostrar', type=int, default=20, help="Textos sin vincular a listar en consola")
+
+    def handle(self, *args, **options):
+        archivo = open(options['reporte'], 'w', newline='', encoding='utf-8') if options['reporte'] else None
+        try:
+            reporte = None
+            if archivo is not None:
+                reporte = csv.writer(archivo)
+                reporte.writerow(['id', 'documento_identidad', 'programa_texto', 'motivo'])
+            resultado = vincular_programas(tamano_lote=options['lote'], reporte=reporte)
+        finally:
+            if archivo is not None:
+                archivo.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado.vinculados} aprendices vinculados, {resultado.sin_vincular} sin vincular."
+        ))
+        for (texto, motivo), cantidad in resultado.pendientes.most_common(options['mostrar']):
+            self.stdout.write(f"  {cantidad:>7}  {texto!r} ({motivo})")
+        if len(resultado.pendientes) > options['mostrar']:
+            self.stdout.write(f"  ... {len(resultado.pendientes) - options['mostrar']} textos más.")
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aprendices', '0003_aprendiz_programa'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aprendiz',
+            index=models.Index(fields=['apellido', 'nombre', 'id'], name='aprendiz_apellido_nombre_idx'),
+        ),
+    ]
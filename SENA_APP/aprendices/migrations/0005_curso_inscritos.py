@@ -0,0 +1,34 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:42
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def calcular_inscritos(apps, schema_editor):
+    Curso = apps.get_model('aprendices', 'Curso')
+    AprendizCurso = apps.get_model('aprendices', 'AprendizCurso')
+    conteo = (
+        AprendizCurso.objects.filter(curso=OuterRef('pk'))
+        .order_by()
+        .values('curso')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    Curso.objects.update(inscritos=Coalesce(Subquery(conteo), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aprendices', '0004_aprendiz_aprendiz_apellido_nombre_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='curso',
+            name='inscritos',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Aprendices Inscritos'),
+        ),
+        migrations.RunPython(calcular_inscritos, migrations.RunPython.noop),
+    ]
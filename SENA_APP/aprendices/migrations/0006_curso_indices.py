@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aprendices', '0005_curso_inscritos'),
+        ('instructores', '0002_instructor_instructor_apellido_nombre_idx'),
+        ('programas', '0002_programa_programa_nombre_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='curso',
+            index=models.Index(fields=['fecha_inicio', 'id'], name='curso_fecha_inicio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='curso',
+            index=models.Index(fields=['estado', 'fecha_inicio', 'id'], name='curso_estado_fecha_idx'),
+        ),
+    ]
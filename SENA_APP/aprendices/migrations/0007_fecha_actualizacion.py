@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aprendices', '0006_curso_indices'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aprendiz',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='curso',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True, verbose_name='Última Actualización'),
+        ),
+    ]
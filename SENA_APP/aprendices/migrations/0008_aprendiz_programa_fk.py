@@ -0,0 +1,30 @@
+# Generated by Django 5.1.6 on 2026-10-18 12:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aprendices', '0007_fecha_actualizacion'),
+        ('programas', '0003_fecha_actualizacion'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='aprendiz',
+            old_name='programa',
+            new_name='programa_texto',
+        ),
+        migrations.AlterField(
+            model_name='aprendiz',
+            name='programa_texto',
+            field=models.CharField(blank=True, max_length=100, null=True, verbose_name='Programa (texto original)'),
+        ),
+        migrations.AddField(
+            model_name='aprendiz',
+            name='programa',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='aprendices', to='programas.programa', verbose_name='Programa de Formación'),
+        ),
+    ]
@@ -0,0 +1,89 @@
+import re
+import sys
+import unicodedata
+from collections import defaultdict
+
+from django.db import migrations, transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+# Copia de la lógica de aprendices/vinculacion.py al crear esta migración, para
+# que su resultado no cambie si ese módulo cambia después
+TAMANO_LOTE = 2000
+
+
+def clave_programa(texto):
+    texto = unicodedata.normalize('NFKD', re.sub(r'[^\w\s]', ' ', texto or ''))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return re.sub(r'\s+', ' ', texto).strip().lower()
+
+
+def vincular(apps, schema_editor):
+    Aprendiz = apps.get_model('aprendices', 'Aprendiz')
+    Programa = apps.get_model('programas', 'Programa')
+
+    # Clave normalizada del nombre o del código -> ids de los programas que coinciden
+    candidatos = defaultdict(set)
+    for programa_id, codigo, nombre in Programa.objects.values_list('id', 'codigo', 'nombre'):
+        for texto in (nombre, codigo):
+            if clave := clave_programa(texto):
+                candidatos[clave].add(programa_id)
+
+    pendientes = (
+        Aprendiz.objects.filter(programa__isnull=True, programa_texto__isnull=False)
+        .exclude(programa_texto='').order_by('id')
+    )
+    vinculados = sin_vincular = 0
+    ultimo = 0
+    while True:
+        lote = list(pendientes.filter(id__gt=ultimo).values_list('id', 'programa_texto')[:TAMANO_LOTE])
+        if not lote:
+            break
+        ultimo = lote[-1][0]
+
+        por_programa = defaultdict(list)
+        for aprendiz_id, texto in lote:
+            encontrados = candidatos.get(clave_programa(texto), set())
+            # Sin coincidencia o ambiguo (varios programas): queda sin vincular
+            if len(encontrados) == 1:
+                por_programa[next(iter(encontrados))].append(aprendiz_id)
+            else:
+                sin_vincular += 1
+
+        ahora = timezone.now()
+        with transaction.atomic():
+            for programa_id, ids in por_programa.items():
+                vinculados += Aprendiz.objects.filter(id__in=ids).update(
+                    programa_id=programa_id, fecha_actualizacion=ahora,
+                )
+            Programa.objects.filter(pk__in=por_programa).update(fecha_actualizacion=ahora)
+
+    if sin_vincular:
+        sys.stdout.write(
+            f"\n  {vinculados} aprendices vinculados; {sin_vincular} quedaron sin programa. "
+            f"Ver el detalle con: manage.py vincular_programas --reporte sin_vincular.csv\n"
+        )
+
+
+def completar_texto(apps, schema_editor):
+    # Al revertir, el texto vuelve a ser el único dato: se completa con el
+    # nombre del programa en los aprendices creados después de la migración
+    Aprendiz = apps.get_model('aprendices', 'Aprendiz')
+    Programa = apps.get_model('programas', 'Programa')
+    Aprendiz.objects.filter(programa__isnull=False, programa_texto__isnull=True).update(
+        programa_texto=Subquery(Programa.objects.filter(pk=OuterRef('programa_id')).values('nombre')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+    # Sin transacción global: cada lote se confirma por separado y, si la
+    # migración se interrumpe, al repetirla solo se procesan los pendientes
+    atomic = False
+
+    dependencies = [
+        ('aprendices', '0008_aprendiz_programa_fk'),
+    ]
+
+    operations = [
+        migrations.RunPython(vincular, completar_texto),
+    ]
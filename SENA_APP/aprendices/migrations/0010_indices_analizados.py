@@ -0,0 +1,47 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aprendices', '0009_vincular_programas'),
+        ('instructores', '0003_fecha_actualizacion'),
+        ('programas', '0003_fecha_actualizacion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aprendiz',
+            index=models.Index(fields=['ciudad', 'apellido', 'nombre', 'id'], name='aprendiz_ciudad_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aprendiz',
+            index=models.Index(fields=['programa', 'apellido', 'nombre', 'id'], name='aprendiz_programa_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aprendizcurso',
+            index=models.Index(fields=['estado', 'id'], name='inscripcion_estado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aprendizcurso',
+            index=models.Index(fields=['fecha_inscripcion'], name='inscripcion_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='curso',
+            index=models.Index(fields=['programa', 'fecha_inicio', 'id'], name='curso_programa_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='curso',
+            index=models.Index(fields=['instructor_coordinador', 'fecha_inicio', 'id'], name='curso_coordinador_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='instructorcurso',
+            index=models.Index(fields=['rol', 'id'], name='asignacion_rol_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='instructorcurso',
+            index=models.Index(fields=['fecha_asignacion'], name='asignacion_fecha_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aprendices', '0010_indices_analizados'),
+        ('instructores', '0004_claves_busqueda'),
+        ('programas', '0005_completar_extractos'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aprendiz',
+            name='clave_apellido',
+            field=models.CharField(blank=True, editable=False, max_length=201),
+        ),
+        migrations.AddField(
+            model_name='aprendiz',
+            name='clave_nombre',
+            field=models.CharField(blank=True, editable=False, max_length=201),
+        ),
+        migrations.AddField(
+            model_name='curso',
+            name='clave_nombre',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AddIndex(
+            model_name='aprendiz',
+            index=models.Index(fields=['clave_nombre'], name='aprendiz_clave_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aprendiz',
+            index=models.Index(fields=['clave_apellido'], name='aprendiz_clave_apellido_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='curso',
+            index=models.Index(fields=['clave_nombre'], name='curso_clave_nombre_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aprendices', '0012_completar_claves'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Ocupacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recurso', models.CharField(max_length=60)),
+                ('dias', models.PositiveSmallIntegerField()),
+                ('hora_inicio', models.TimeField()),
+                ('hora_fin', models.TimeField()),
+                ('fecha_inicio', models.DateField()),
+                ('fecha_fin', models.DateField()),
+                ('curso', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ocupaciones', to='aprendices.curso')),
+            ],
+            options={
+                'verbose_name': 'Ocupación de horario',
+                'verbose_name_plural': 'Ocupaciones de horario',
+                'indexes': [models.Index(fields=['recurso', 'fecha_fin'], name='ocupacion_recurso_fin_idx')],
+            },
+        ),
+    ]
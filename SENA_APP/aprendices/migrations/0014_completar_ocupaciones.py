@@ -0,0 +1,161 @@
+import re
+import unicodedata
+from collections import defaultdict
+from datetime import time
+
+from django.db import migrations, transaction
+
+# Copia de la lectura de horarios y de la reconstrucción de ocupaciones de
+# aprendices/horarios.py al crear esta migración, para que su resultado no
+# cambie si ese módulo cambia después
+TAMANO_LOTE = 2000
+
+DIAS = ['Lunes', 'Martes', 'Miércoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
+RANGO_DIAS = {'a', 'al', 'hasta'}
+ENLACES = {'y', 'e', 'de', 'del', 'los', 'el', 'dia', 'dias'}
+HORAS = re.compile(
+    r'(\d{1,2})(?:[:h](\d{2}))?\s*(am|pm)?\s*(?:-|a|hasta)\s*(\d{1,2})(?:[:h](\d{2}))?\s*(am|pm)?'
+)
+
+
+class HorarioInvalido(ValueError):
+    pass
+
+
+def normalizar(texto):
+    texto = unicodedata.normalize('NFKD', texto or '')
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return re.sub(r'\s+', ' ', texto).strip().lower()
+
+
+# Nombre, plural y abreviaturas de dos y tres letras
+FORMAS_DIAS = {}
+for numero, nombre in enumerate(DIAS):
+    clave = normalizar(nombre)
+    for forma in (clave, clave + 's', clave[:3], clave[:2]):
+        FORMAS_DIAS.setdefault(forma, numero)
+
+
+def leer_dias(texto):
+    if re.search(r'\d', texto):
+        raise HorarioInvalido
+    mascara = 0
+    anterior = None
+    en_rango = False
+    for palabra in re.findall(r'[a-z]+', texto.replace('-', ' a ')):
+        if palabra in ENLACES:
+            continue
+        if palabra in RANGO_DIAS:
+            if anterior is None:
+                raise HorarioInvalido
+            en_rango = True
+            continue
+        if palabra not in FORMAS_DIAS:
+            raise HorarioInvalido
+        dia = FORMAS_DIAS[palabra]
+        if en_rango:
+            if dia < anterior:
+                raise HorarioInvalido
+            for numero in range(anterior, dia + 1):
+                mascara |= 1 << numero
+            en_rango = False
+        else:
+            mascara |= 1 << dia
+        anterior = dia
+    if en_rango or not mascara:
+        raise HorarioInvalido
+    return mascara
+
+
+def leer_hora(horas, minutos, sufijo):
+    horas, minutos = int(horas), int(minutos or 0)
+    if sufijo:
+        if not 1 <= horas <= 12:
+            raise HorarioInvalido
+        horas = horas % 12 + (12 if sufijo == 'pm' else 0)
+    try:
+        return time(horas, minutos)
+    except ValueError:
+        raise HorarioInvalido from None
+
+
+def leer_horario(texto):
+    """Lista de (días, hora inicial, hora final); HorarioInvalido si no se puede leer."""
+    normalizado = normalizar(texto).replace('.', '').replace('–', '-')
+    franjas = {}
+    posicion = 0
+    for rango in HORAS.finditer(normalizado):
+        dias = leer_dias(normalizado[posicion:rango.start()])
+        inicio = leer_hora(rango[1], rango[2], rango[3] or rango[6])
+        fin = leer_hora(rango[4], rango[5], rango[6])
+        if fin <= inicio:
+            raise HorarioInvalido
+        franjas[inicio, fin] = franjas.get((inicio, fin), 0) | dias
+        posicion = rango.end()
+    if not franjas or re.search(r'\w', normalizado[posicion:]):
+        raise HorarioInvalido
+    return [(dias, inicio, fin) for (inicio, fin), dias in sorted(franjas.items())]
+
+
+def ocupaciones(curso, instructores):
+    """Campos de las filas de Ocupacion del curso en su aula y en sus instructores."""
+    if curso.estado == 'CAN' or not (curso.fecha_inicio and curso.fecha_fin):
+        return []
+    try:
+        franjas = leer_horario(curso.horario)
+    except HorarioInvalido:
+        return []
+    aula = normalizar(curso.aula)
+    recursos = ([f'aula:{aula}'] if aula else []) + [
+        f'instructor:{pk}' for pk in sorted(set(instructores) - {None})
+    ]
+    return [
+        {'recurso': recurso, 'curso_id': curso.pk, 'dias': dias, 'hora_inicio': inicio, 'hora_fin': fin,
+         'fecha_inicio': curso.fecha_inicio, 'fecha_fin': curso.fecha_fin}
+        for recurso in recursos
+        for dias, inicio, fin in franjas
+    ]
+
+
+def completar(apps, schema_editor):
+    Curso = apps.get_model('aprendices', 'Curso')
+    InstructorCurso = apps.get_model('aprendices', 'InstructorCurso')
+    Ocupacion = apps.get_model('aprendices', 'Ocupacion')
+
+    cursos = Curso.objects.order_by('id').only(
+        'estado', 'horario', 'aula', 'fecha_inicio', 'fecha_fin', 'instructor_coordinador',
+    )
+    ultimo = 0
+    while True:
+        lote = list(cursos.filter(id__gt=ultimo)[:TAMANO_LOTE])
+        if not lote:
+            return
+        ultimo = lote[-1].id
+        ids_lote = [curso.id for curso in lote]
+        instructores = defaultdict(list)
+        for curso_id, instructor_id in (
+            InstructorCurso.objects.filter(curso_id__in=ids_lote).values_list('curso_id', 'instructor_id')
+        ):
+            instructores[curso_id].append(instructor_id)
+        filas = [
+            Ocupacion(**campos)
+            for curso in lote
+            for campos in ocupaciones(curso, [curso.instructor_coordinador_id, *instructores[curso.id]])
+        ]
+        with transaction.atomic():
+            Ocupacion.objects.filter(curso_id__in=ids_lote).delete()
+            Ocupacion.objects.bulk_create(filas)
+
+
+class Migration(migrations.Migration):
+    # Sin transacción global: cada lote de cursos se confirma por separado y
+    # repetir la migración recalcula sus ocupaciones sin duplicarlas
+    atomic = False
+
+    dependencies = [
+        ('aprendices', '0013_ocupaciones'),
+    ]
+
+    operations = [
+        migrations.RunPython(completar, migrations.RunPython.noop),
+    ]
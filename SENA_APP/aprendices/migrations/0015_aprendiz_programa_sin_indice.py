@@ -0,0 +1,20 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('aprendices', '0014_completar_ocupaciones'),
+        ('programas', '0005_completar_extractos'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='aprendiz',
+            name='programa',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='aprendices', to='programas.programa', verbose_name='Programa de Formación'),
+        ),
+    ]
@@ -1,5 +1,9 @@
+from django.core.exceptions import ValidationError
 from django.db import models
 
+from busqueda.claves import clave, claves_persona
+from SENA_APP.derivados import campos_a_guardar
+
 # Create your models here.
 class Aprendiz(models.Model):
     documento_identidad = models.CharField(max_length=20, unique=True)
@@ -9,12 +13,33 @@ class Aprendiz(models.Model):
     correo = models.EmailField(null=True)
     fecha_nacimiento = models.DateField()
     ciudad = models.CharField(max_length=100, null=True)
-    programa = models.CharField(max_length=100, null= True)
+    # El índice propio de la llave (programa, rowid) sirve a la API, que pagina
+    # con programa=? ORDER BY id; aprendiz_programa_idx ordena por apellido
+    programa = models.ForeignKey('programas.Programa', on_delete=models.SET_NULL, null=True, blank=True, related_name='aprendices', verbose_name="Programa de Formación")
+    # Texto libre anterior a la llave foránea; se conserva para los aprendices
+    # que `vincular_programas` no pudo asociar a un programa
+    programa_texto = models.CharField(max_length=100, null=True, blank=True, verbose_name="Programa (texto original)")
+    # Nombre normalizado en los dos órdenes para buscar por prefijo en el admin,
+    # calculado en save() (ver busqueda/claves.py)
+    clave_nombre = models.CharField(max_length=201, blank=True, editable=False)
+    clave_apellido = models.CharField(max_length=201, blank=True, editable=False)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    # Campos calculados en save() -> campos de los que se calculan
+    DERIVADOS = {'clave_nombre': ('nombre', 'apellido'), 'clave_apellido': ('nombre', 'apellido')}
 
     class Meta:
         verbose_name = "Aprendiz"
         verbose_name_plural = "Aprendices"
         ordering = ['apellido', 'nombre']
+        indexes = [
+            models.Index(fields=['apellido', 'nombre', 'id'], name='aprendiz_apellido_nombre_idx'),
+            # Filtros por ciudad y por programa del admin, ya en el orden del listado
+            models.Index(fields=['ciudad', 'apellido', 'nombre', 'id'], name='aprendiz_ciudad_idx'),
+            models.Index(fields=['programa', 'apellido', 'nombre', 'id'], name='aprendiz_programa_idx'),
+            models.Index(fields=['clave_nombre'], name='aprendiz_clave_nombre_idx'),
+            models.Index(fields=['clave_apellido'], name='aprendiz_clave_apellido_idx'),
+        ]
 
     def __str__(self):
         return f"{self.nombre} {self.apellido} - {self.documento_identidad}"
@@ -22,6 +47,21 @@ class Aprendiz(models.Model):
     def nombre_completo(self):
         return f"{self.nombre} {self.apellido}"
 
+    def calcular_claves(self):
+        self.clave_nombre, self.clave_apellido = claves_persona(self.nombre, self.apellido)
+
+    def save(self, *args, **kwargs):
+        self.calcular_claves()
+        kwargs['update_fields'] = campos_a_guardar(kwargs.get('update_fields'), self.DERIVADOS)
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        # Programa al cargarse, para marcar también el anterior si cambia
+        instancia._programa_id_original = instancia.__dict__.get('programa_id')
+        return instancia
+
 
 class Curso(models.Model):
     ESTADO_CHOICES = [
@@ -32,6 +72,7 @@ class Curso(models.Model):
         ('CAN', 'Cancelado'),
         ('SUS', 'Suspendido'),
     ]
+    ESTADOS_ACTIVOS = ['INI', 'EJE']
 
     codigo = models.CharField(max_length=30,unique=True,verbose_name="Código del Curso")
     nombre = models.CharField(max_length=200, verbose_name="Nombre del Curso")
@@ -44,24 +85,62 @@ class Curso(models.Model):
     horario = models.CharField(max_length=100, verbose_name="Horario")
     aula = models.CharField(max_length=50, verbose_name="Aula/Ambiente")
     cupos_maximos = models.PositiveIntegerField(verbose_name="Cupos Máximos")
+    inscritos = models.PositiveIntegerField(default=0, editable=False, verbose_name="Aprendices Inscritos")
     estado = models.CharField(max_length=3, choices=ESTADO_CHOICES, default='PRO', verbose_name="Estado del Curso")
     observaciones = models.TextField(blank=True, null=True, verbose_name="Observaciones")
+    # Nombre normalizado para buscar por prefijo en el admin, calculado en save()
+    clave_nombre = models.CharField(max_length=200, blank=True, editable=False)
     fecha_registro = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Registro")
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name="Última Actualización")
+
+    # Campos calculados en save() -> campos de los que se calculan
+    DERIVADOS = {'clave_nombre': ('nombre',)}
 
     class Meta:
         verbose_name = "Curso"
         verbose_name_plural = "Cursos"
         ordering = ['-fecha_inicio']
+        indexes = [
+            models.Index(fields=['fecha_inicio', 'id'], name='curso_fecha_inicio_idx'),
+            models.Index(fields=['estado', 'fecha_inicio', 'id'], name='curso_estado_fecha_idx'),
+            # Cursos de un programa o de un coordinador por fecha (detalles y API)
+            models.Index(fields=['programa', 'fecha_inicio', 'id'], name='curso_programa_fecha_idx'),
+            models.Index(fields=['instructor_coordinador', 'fecha_inicio', 'id'], name='curso_coordinador_fecha_idx'),
+            models.Index(fields=['clave_nombre'], name='curso_clave_nombre_idx'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        # Programa y coordinador al cargarse, para marcar también los anteriores si cambian
+        instancia._programa_id_original = instancia.__dict__.get('programa_id')
+        instancia._coordinador_id_original = instancia.__dict__.get('instructor_coordinador_id')
+        return instancia
+
+    def calcular_claves(self):
+        self.clave_nombre = clave(self.nombre)
+
+    def save(self, *args, **kwargs):
+        self.calcular_claves()
+        kwargs['update_fields'] = campos_a_guardar(kwargs.get('update_fields'), self.DERIVADOS)
+        # `inscritos` lo mantienen las señales con UPDATE atómicos: una instancia
+        # cargada antes de una inscripción no debe sobrescribirlo con su valor viejo
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            kwargs['update_fields'] = [
+                campo.name for campo in self._meta.concrete_fields
+                if not campo.primary_key and campo.name != 'inscritos'
+            ]
+        super().save(*args, **kwargs)
+
     def cupos_disponibles(self):
-        return self.cupos_maximos - self.aprendices.count()
+        return self.cupos_maximos - self.inscritos
 
     def porcentaje_ocupacion(self):
         if self.cupos_maximos > 0:
-            return (self.aprendices.count() / self.cupos_maximos) * 100
+            return (self.inscritos / self.cupos_maximos) * 100
         return 0
 
 
@@ -75,6 +154,11 @@ class InstructorCurso(models.Model):
         verbose_name = "Instructor por Curso"
         verbose_name_plural = "Instructores por Curso"
         unique_together = ['instructor', 'curso']
+        # Filtros del admin, que lista por id descendente
+        indexes = [
+            models.Index(fields=['rol', 'id'], name='asignacion_rol_idx'),
+            models.Index(fields=['fecha_asignacion'], name='asignacion_fecha_idx'),
+        ]
 
     def __str__(self):
         return f"{self.instructor} - {self.curso} ({self.rol})"
@@ -100,6 +184,59 @@ class AprendizCurso(models.Model):
         verbose_name = "Aprendiz por Curso"
         verbose_name_plural = "Aprendices por Curso"
         unique_together = ['aprendiz', 'curso']
+        # Filtros del admin, que lista por id descendente
+        indexes = [
+            models.Index(fields=['estado', 'id'], name='inscripcion_estado_idx'),
+            models.Index(fields=['fecha_inscripcion'], name='inscripcion_fecha_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.aprendiz} - {self.curso} ({self.estado})"
+
+    def clean(self):
+        # Cupo de las inscripciones hechas con formularios (el admin, que guarda
+        # en una transacción); inscribir_aprendices verifica el suyo con el
+        # curso bloqueado y las señales de post_save mueven el contador
+        if self.curso_id is None or self.curso_id == getattr(self, '_curso_id_original', None):
+            return
+        curso = Curso.objects.only('codigo', 'cupos_maximos', 'inscritos').get(pk=self.curso_id)
+        if curso.inscritos >= curso.cupos_maximos:
+            raise ValidationError(
+                f"El curso {curso.codigo} no tiene cupos disponibles "
+                f"({curso.inscritos} inscritos de {curso.cupos_maximos})."
+            )
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        # Curso al que pertenecía al cargarse, para mover el contador si cambia
+        instancia._curso_id_original = instancia.__dict__.get('curso_id')
+        return instancia
+
+class Ocupacion(models.Model):
+    """
+    Franja de horario que un curso ocupa en un recurso (su aula o uno de sus
+    instructores) entre sus fechas de inicio y fin. La mantienen las señales
+    de Curso e InstructorCurso; ver aprendices/horarios.py.
+    """
+    curso = models.ForeignKey(Curso, on_delete=models.CASCADE, related_name='ocupaciones')
+    # 'aula:<aula normalizada>' o 'instructor:<id>'
+    recurso = models.CharField(max_length=60)
+    # Días de la semana como bits: lunes = 1, martes = 2, ..., domingo = 64
+    dias = models.PositiveSmallIntegerField()
+    hora_inicio = models.TimeField()
+    hora_fin = models.TimeField()
+    fecha_inicio = models.DateField()
+    fecha_fin = models.DateField()
+
+    class Meta:
+        verbose_name = "Ocupación de horario"
+        verbose_name_plural = "Ocupaciones de horario"
+        indexes = [
+            # Ocupaciones de un recurso que terminan después de una fecha: las
+            # únicas que pueden chocar con un curso que empieza ese día
+            models.Index(fields=['recurso', 'fecha_fin'], name='ocupacion_recurso_fin_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.aprendiz} - {self.curso} ({self.estado})"
\ No newline at end of file
+        return f"{self.curso_id} en {self.recurso}"
@@ -0,0 +1,162 @@
+"""
+Carga de notas finales de un curso desde CSV.
+
+El archivo trae documento_identidad, nota_final y, opcionalmente, estado
+(código como GRA o nombre como Graduado), separados por coma o por punto y
+coma; la nota admite coma decimal. Una celda vacía deja el valor actual.
+Cada nota se valida con el campo del modelo, así que se aplican los mismos
+límites de dígitos y decimales (max_digits=3, decimal_places=1), más el rango
+de la escala entre NOTA_MINIMA y NOTA_MAXIMA.
+
+Las inscripciones del curso se buscan con una sola consulta `IN` por
+documento. Las filas válidas se guardan con un único `bulk_update`, en la
+misma transacción en que se leyeron, y las inválidas se informan sin impedir
+las demás. El resultado es la diferencia: filas cambiadas (con el valor
+anterior y el nuevo), sin cambios y rechazadas. Con `simular=True` se calcula
+la misma diferencia sin guardar.
+
+Un archivo es de un solo curso (unas decenas de filas), así que se lee
+completo. `bulk_update` no emite señales: las marcas de actualización del
+curso y de los aprendices se actualizan aquí.
+"""
+import csv
+import itertools
+from collections import namedtuple
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from busqueda.normalizacion import normalizar_texto
+
+from .estados import NOTA_APROBATORIA
+from .importacion import ArchivoInvalido
+from .models import Aprendiz, AprendizCurso, Curso
+from .signals import tocar
+
+NOTA_MINIMA = Decimal('0.0')
+NOTA_MAXIMA = Decimal('5.0')
+
+# Código o nombre normalizado del estado -> código
+ESTADOS = {
+    normalizar_texto(texto): codigo
+    for codigo, nombre in AprendizCurso.ESTADO_CHOICES
+    for texto in (codigo, nombre)
+}
+
+Cambio = namedtuple('Cambio', 'fila documento nota_anterior nota_nueva estado_anterior estado_nuevo')
+
+
+@dataclass
+class ResultadoNotas:
+    cambiadas: list = field(default_factory=list)
+    sin_cambios: list = field(default_factory=list)
+    # (fila, documento, mensajes)
+    rechazadas: list = field(default_factory=list)
+
+    @property
+    def leidas(self):
+        return len(self.cambiadas) + len(self.sin_cambios) + len(self.rechazadas)
+
+
+def _campo_nota():
+    return AprendizCurso._meta.get_field('nota_final').formfield(min_value=NOTA_MINIMA, max_value=NOTA_MAXIMA)
+
+
+def _leer_fila(fila, campo_nota):
+    """Devuelve (nota o None, estado o None, mensajes de error)."""
+    mensajes = []
+    nota = None
+    texto = (fila.get('nota_final') or '').strip().replace(',', '.')
+    if texto:
+        # "4.50" es 4.5: el validador de decimales cuenta los ceros a la derecha
+        if '.' in texto:
+            texto = texto.rstrip('0').rstrip('.')
+        try:
+            nota = campo_nota.clean(texto)
+        except ValidationError as error:
+            mensajes.extend(f"nota_final: {mensaje}" for mensaje in error.messages)
+    estado = None
+    texto = (fila.get('estado') or '').strip()
+    if texto:
+        estado = ESTADOS.get(normalizar_texto(texto))
+        if estado is None:
+            opciones = ', '.join(codigo for codigo, _ in AprendizCurso.ESTADO_CHOICES)
+            mensajes.append(f"estado: «{texto}» no es un estado válido ({opciones}).")
+    return nota, estado, mensajes
+
+
+def cargar_notas(curso_id, lineas, simular=False):
+    """
+    Aplica las notas y estados de un iterable de líneas CSV con encabezado a
+    las inscripciones del curso. Lanza `Curso.DoesNotExist` si el curso no
+    existe y `ArchivoInvalido` si faltan columnas.
+    """
+    lineas = iter(lineas)
+    encabezado = next(lineas, '')
+    # Las hojas de cálculo con coma decimal ("4,5") exportan separado por punto y coma
+    separador = ';' if encabezado.count(';') > encabezado.count(',') else ','
+    lector = csv.DictReader(itertools.chain([encabezado], lineas), delimiter=separador)
+    faltantes = {'documento_identidad', 'nota_final'} - set(lector.fieldnames or [])
+    if faltantes:
+        raise ArchivoInvalido(f"Faltan columnas obligatorias: {', '.join(sorted(faltantes))}")
+
+    resultado = ResultadoNotas()
+    campo_nota = _campo_nota()
+    filas = []
+    vistos = set()
+    # La fila 1 es el encabezado
+    for numero, fila in enumerate(lector, start=2):
+        documento = (fila.get('documento_identidad') or '').strip()
+        nota, estado, mensajes = _leer_fila(fila, campo_nota)
+        if not documento:
+            mensajes.insert(0, "documento_identidad: Este campo es obligatorio.")
+        elif documento in vistos:
+            mensajes.insert(0, "Documento repetido en el archivo.")
+        vistos.add(documento)
+        if mensajes:
+            resultado.rechazadas.append((numero, documento, mensajes))
+        else:
+            filas.append((numero, documento, nota, estado))
+
+    with transaction.atomic():
+        curso = Curso.objects.only('id').get(pk=curso_id)
+        inscripciones = {
+            inscripcion.aprendiz.documento_identidad: inscripcion
+            for inscripcion in AprendizCurso.objects.select_for_update(of=('self',))
+            .filter(curso_id=curso.pk, aprendiz__documento_identidad__in=[documento for _, documento, _, _ in filas])
+            .select_related('aprendiz')
+            .only('estado', 'nota_final', 'aprendiz__documento_identidad')
+        }
+
+        cambiadas = []
+        for numero, documento, nota, estado in filas:
+            inscripcion = inscripciones.get(documento)
+            if inscripcion is None:
+                resultado.rechazadas.append((numero, documento, ["El aprendiz no está inscrito en el curso."]))
+                continue
+            nota_nueva = inscripcion.nota_final if nota is None else nota
+            estado_nuevo = estado or inscripcion.estado
+            if estado_nuevo == 'GRA' and (nota_nueva is None or nota_nueva < NOTA_APROBATORIA):
+                resultado.rechazadas.append(
+                    (numero, documento, [f"estado: GRA requiere una nota final de al menos {NOTA_APROBATORIA}."])
+                )
+                continue
+            if nota_nueva == inscripcion.nota_final and estado_nuevo == inscripcion.estado:
+                resultado.sin_cambios.append(documento)
+                continue
+            resultado.cambiadas.append(
+                Cambio(numero, documento, inscripcion.nota_final, nota_nueva, inscripcion.estado, estado_nuevo)
+            )
+            inscripcion.nota_final, inscripcion.estado = nota_nueva, estado_nuevo
+            cambiadas.append(inscripcion)
+
+        if cambiadas and not simular:
+            AprendizCurso.objects.bulk_update(cambiadas, ['nota_final', 'estado'])
+            # Lo que harían las señales de AprendizCurso
+            tocar(Curso.objects.filter(pk=curso.pk))
+            tocar(Aprendiz.objects.filter(pk__in=[inscripcion.aprendiz_id for inscripcion in cambiadas]))
+
+    resultado.rechazadas.sort()
+    return resultado
@@ -0,0 +1,162 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from instructores.models import Instructor
+from programas.models import Programa
+from proyectos.models import Proyecto
+from SENA_APP import fragmentos
+
+from .choques import actualizar_ocupaciones
+from .contadores import restar_inscritos, sumar_inscritos
+from .estadisticas import invalidar_estadisticas
+from .horarios import recurso_instructor
+from .models import Aprendiz, AprendizCurso, Curso, InstructorCurso, Ocupacion
+
+
+# Marcas de actualización para las validaciones HTTP (ETag / Last-Modified) de
+# las páginas de detalle. Cada modelo tiene `fecha_actualizacion` con auto_now;
+# además se marcan los objetos cuya página muestra datos del que cambió (una
+# inscripción marca su curso y su aprendiz, por ejemplo). Se usa `update()`,
+# que no emite señales, así que no hay cascadas.
+def tocar(queryset):
+    queryset.update(fecha_actualizacion=timezone.now())
+
+
+@receiver(post_save, sender=AprendizCurso)
+def actualizar_inscritos(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    curso_anterior = getattr(instance, '_curso_id_original', None)
+    if created:
+        sumar_inscritos(instance.curso_id)
+    elif curso_anterior is not None and curso_anterior != instance.curso_id:
+        restar_inscritos(curso_anterior)
+        sumar_inscritos(instance.curso_id)
+    tocar(Curso.objects.filter(pk__in={instance.curso_id, curso_anterior} - {None}))
+    tocar(Aprendiz.objects.filter(pk=instance.aprendiz_id))
+    instance._curso_id_original = instance.curso_id
+
+
+@receiver(post_delete, sender=AprendizCurso)
+def descontar_inscrito(sender, instance, **kwargs):
+    restar_inscritos(instance.curso_id)
+    tocar(Curso.objects.filter(pk=instance.curso_id))
+    tocar(Aprendiz.objects.filter(pk=instance.aprendiz_id))
+
+
+@receiver(post_save, sender=Aprendiz)
+@receiver(post_save, sender=Instructor)
+@receiver(post_save, sender=Programa)
+@receiver(post_save, sender=Curso)
+@receiver(post_delete, sender=Aprendiz)
+@receiver(post_delete, sender=Instructor)
+@receiver(post_delete, sender=Programa)
+@receiver(post_delete, sender=Curso)
+def refrescar_estadisticas(sender, **kwargs):
+    invalidar_estadisticas()
+
+
+@receiver(post_save, sender=InstructorCurso)
+@receiver(post_delete, sender=InstructorCurso)
+def tocar_por_asignacion(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    tocar(Curso.objects.filter(pk=instance.curso_id))
+    tocar(Instructor.objects.filter(pk=instance.instructor_id))
+
+
+@receiver(post_save, sender=Aprendiz)
+def tocar_cursos_del_aprendiz(sender, instance, created, raw=False, **kwargs):
+    # detalle_curso lista los nombres de los inscritos
+    if raw or created:
+        return
+    tocar(Curso.objects.filter(aprendizcurso__aprendiz_id=instance.pk))
+
+
+@receiver(post_save, sender=Aprendiz)
+@receiver(post_delete, sender=Aprendiz)
+def tocar_programa_del_aprendiz(sender, instance, raw=False, **kwargs):
+    # detalle_programa muestra cuántos aprendices tiene
+    if raw:
+        return
+    programas = {instance.programa_id, getattr(instance, '_programa_id_original', None)} - {None}
+    tocar(Programa.objects.filter(pk__in=programas))
+    instance._programa_id_original = instance.programa_id
+
+
+@receiver(post_save, sender=Programa)
+@receiver(pre_delete, sender=Programa)
+def tocar_aprendices_del_programa(sender, instance, raw=False, **kwargs):
+    # lista_aprendices y detalle_aprendiz muestran datos del programa; al
+    # borrarlo se marcan antes de que SET_NULL les quite la llave foránea
+    if raw or kwargs.get('created'):
+        return
+    tocar(Aprendiz.objects.filter(programa_id=instance.pk))
+
+
+@receiver(post_save, sender=Instructor)
+def tocar_cursos_del_instructor(sender, instance, created, raw=False, **kwargs):
+    # detalle_curso y detalle_aprendiz muestran al coordinador y a los instructores
+    if raw or created:
+        return
+    tocar(Curso.objects.filter(instructor_coordinador_id=instance.pk))
+    tocar(Curso.objects.filter(instructorcurso__instructor_id=instance.pk))
+
+
+@receiver(post_save, sender=Curso)
+@receiver(post_delete, sender=Curso)
+def tocar_por_curso(sender, instance, raw=False, **kwargs):
+    # detalle_programa y detalle_instructor listan sus cursos
+    if raw:
+        return
+    programas = {instance.programa_id, getattr(instance, '_programa_id_original', None)} - {None}
+    coordinadores = {
+        instance.instructor_coordinador_id, getattr(instance, '_coordinador_id_original', None),
+    } - {None}
+    tocar(Programa.objects.filter(pk__in=programas))
+    tocar(Instructor.objects.filter(pk__in=coordinadores) | Instructor.objects.filter(instructorcurso__curso_id=instance.pk))
+    instance._programa_id_original = instance.programa_id
+    instance._coordinador_id_original = instance.instructor_coordinador_id
+
+
+# Ocupaciones de aula e instructores para detectar choques de horario (ver
+# aprendices/horarios.py). Al borrar un curso, las suyas se van en cascada.
+@receiver(post_save, sender=Curso)
+def ocupar_por_curso(sender, instance, raw=False, **kwargs):
+    # Pueden haber cambiado el aula, el horario, las fechas, el estado o el coordinador
+    if not raw:
+        actualizar_ocupaciones(instance.pk)
+
+
+@receiver(post_save, sender=InstructorCurso)
+def ocupar_por_asignacion(sender, instance, raw=False, **kwargs):
+    if not raw:
+        actualizar_ocupaciones(instance.curso_id)
+
+
+@receiver(post_delete, sender=InstructorCurso)
+def liberar_por_asignacion(sender, instance, origin=None, **kwargs):
+    # Solo si se borró la asignación: en el borrado en cascada de un curso o de
+    # un instructor, recalcular recrearía filas que el borrado ya no ve
+    modelo_origen = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if modelo_origen is InstructorCurso:
+        actualizar_ocupaciones(instance.curso_id)
+
+
+@receiver(post_delete, sender=Instructor)
+def liberar_instructor(sender, instance, **kwargs):
+    Ocupacion.objects.filter(recurso=recurso_instructor(instance.pk)).delete()
+
+
+@receiver(post_save, sender=Aprendiz)
+@receiver(post_save, sender=Programa)
+@receiver(post_save, sender=Proyecto)
+@receiver(post_delete, sender=Aprendiz)
+@receiver(post_delete, sender=Programa)
+@receiver(post_delete, sender=Proyecto)
+def invalidar_fila(sender, instance, raw=False, **kwargs):
+    # Filas cacheadas de lista_aprendices, lista_programas y lista_proyectos
+    if not raw:
+        fragmentos.invalidar(instance)
@@ -0,0 +1,38 @@
+from django import template
+
+from SENA_APP import fragmentos
+
+register = template.Library()
+
+
+class FilaCacheadaNode(template.Node):
+
+    def __init__(self, nodelist, nombre, objeto):
+        self.nodelist = nodelist
+        self.nombre = nombre
+        self.objeto = objeto
+
+    def render(self, context):
+        nombre = self.nombre.resolve(context)
+        objeto = self.objeto.resolve(context)
+        return fragmentos.obtener(nombre, objeto, lambda: self.nodelist.render(context))
+
+
+@register.tag
+def fila_cacheada(parser, token):
+    """
+    Guarda en caché el HTML de una fila mientras el objeto no cambie:
+
+        {% load fragmentos %}
+        {% for aprendiz in lista_aprendices %}
+            {% fila_cacheada 'lista_aprendices' aprendiz %} ... {% endfila_cacheada %}
+        {% endfor %}
+
+    El contenido solo debe depender del objeto (ver SENA_APP/fragmentos.py).
+    """
+    bits = token.split_contents()
+    if len(bits) != 3:
+        raise template.TemplateSyntaxError(f"'{bits[0]}' recibe un nombre de fragmento y un objeto")
+    nodelist = parser.parse(('endfila_cacheada',))
+    parser.delete_first_token()
+    return FilaCacheadaNode(nodelist, parser.compile_filter(bits[1]), parser.compile_filter(bits[2]))
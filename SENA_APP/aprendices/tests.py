@@ -1,3 +1,489 @@
-from django.test import TestCase
+import datetime
+from datetime import time
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.db import connection
+from django.forms.models import model_to_dict, modelform_factory
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from busqueda import indice
+from SENA_APP.pruebas import (
+    PresupuestoConsultasMixin, crear_aprendiz, crear_curso, crear_instructor, crear_programa,
+)
+
+from .admin import CiudadFilter
+from .choques import todos_los_choques
+from .management.commands.analizar_indices import proponer
+from .estadisticas import CLAVE_CACHE, obtener_estadisticas
+from .estados import avanzar_estados
+from .importacion import ArchivoInvalido, importar_aprendices
+from .inscripcion import POR_ID, inscribir_aprendices
+from .notas import cargar_notas
+from .vinculacion import vincular_programas
+from .forms import CursoAdminForm
+from .horarios import Franja, HorarioInvalido, leer_horario
+from .models import Aprendiz, AprendizCurso, Curso, InstructorCurso, Ocupacion
+
+
+@override_settings(CONSULTAS_EN_PARALELO=False)
+class PresupuestoConsultasTests(PresupuestoConsultasMixin, TestCase):
+
+    def test_inicio(self):
+        def preparar(cantidad):
+            for _ in range(cantidad):
+                AprendizCurso.objects.create(aprendiz=crear_aprendiz(), curso=crear_curso())
+
+        self.assertConsultasConstantes('aprendices:inicio', preparar)
+
+    def test_lista_aprendices(self):
+        def preparar(cantidad):
+            for _ in range(cantidad):
+                crear_aprendiz(programa=crear_programa())
+
+        self.assertConsultasConstantes('aprendices:lista_aprendices', preparar)
+
+    def test_lista_cursos(self):
+        def preparar(cantidad):
+            for _ in range(cantidad):
+                crear_curso()
+
+        self.assertConsultasConstantes('aprendices:lista_cursos', preparar)
+
+    def test_detalle_curso(self):
+        def preparar(cantidad):
+            curso = crear_curso(cupos_maximos=cantidad)
+            for _ in range(cantidad):
+                AprendizCurso.objects.create(aprendiz=crear_aprendiz(), curso=curso)
+                InstructorCurso.objects.create(instructor=crear_instructor(), curso=curso, rol="Instructor técnico")
+            return [curso.pk]
+
+        self.assertConsultasConstantes('aprendices:detalle_curso', preparar)
+
+    def test_detalle_aprendiz(self):
+        def preparar(cantidad):
+            aprendiz = crear_aprendiz(programa=crear_programa())
+            for _ in range(cantidad):
+                AprendizCurso.objects.create(aprendiz=aprendiz, curso=crear_curso())
+            return [aprendiz.pk]
+
+        self.assertConsultasConstantes('aprendices:detalle_aprendiz', preparar)
+
+
+class CamposDerivadosTests(TestCase):
+
+    def test_save_con_update_fields_recalcula_las_claves(self):
+        aprendiz = crear_aprendiz(nombre="María", apellido="Núñez")
+        aprendiz.nombre = "Ángela"
+        aprendiz.save(update_fields=['nombre'])
+        aprendiz = Aprendiz.objects.get(pk=aprendiz.pk)
+        self.assertEqual((aprendiz.clave_nombre, aprendiz.clave_apellido), ("angela nunez", "nunez angela"))
+
+    def test_save_de_otros_campos_no_escribe_las_claves(self):
+        aprendiz = crear_aprendiz(nombre="María", apellido="Núñez")
+        Aprendiz.objects.filter(pk=aprendiz.pk).update(clave_nombre="sin recalcular")
+        aprendiz.ciudad = "Cali"
+        aprendiz.save(update_fields=['ciudad'])
+        self.assertEqual(Aprendiz.objects.get(pk=aprendiz.pk).clave_nombre, "sin recalcular")
+
+
+LUNES_A_VIERNES = 0b0011111
+
+
+class LeerHorarioTests(SimpleTestCase):
+
+    def test_formas_aceptadas(self):
+        casos = {
+            "Lunes a Viernes 7:00-13:00": [Franja(LUNES_A_VIERNES, time(7), time(13))],
+            "lun-vie 7-13": [Franja(LUNES_A_VIERNES, time(7), time(13))],
+            "Sábados 8:00 a 12:00": [Franja(0b0100000, time(8), time(12))],
+            "Lunes, Miércoles y Viernes 6 pm - 10 pm": [Franja(0b0010101, time(18), time(22))],
+            "Martes 2-5pm": [Franja(0b0000010, time(14), time(17))],
+        }
+        for texto, franjas in casos.items():
+            with self.subTest(texto=texto):
+                self.assertEqual(leer_horario(texto), franjas)
+
+    def test_varias_franjas(self):
+        self.assertEqual(
+            leer_horario("Lunes a Viernes 18:00-22:00; Sábados 8:00-12:00"),
+            [Franja(0b0100000, time(8), time(12)), Franja(LUNES_A_VIERNES, time(18), time(22))],
+        )
+
+    def test_textos_invalidos(self):
+        for texto in ["Jornada mañana", "Lunes", "Viernes a Lunes 7:00-9:00", "Lunes 13:00-7:00", "Lunes 25:00-26:00"]:
+            with self.subTest(texto=texto):
+                with self.assertRaises(HorarioInvalido):
+                    leer_horario(texto)
+
+
+# Los campos de CursoAdmin: las relaciones muchos a muchos se editan en los inlines
+CursoForm = modelform_factory(Curso, form=CursoAdminForm, exclude=['instructores', 'aprendices'])
+
+
+class ChoquesHorarioTests(TestCase):
+
+    def datos_formulario(self, curso, **cambios):
+        datos = model_to_dict(curso, fields=CursoForm.base_fields)
+        datos.update(cambios)
+        return datos
+
+    def test_ocupaciones_del_curso(self):
+        curso = crear_curso()
+        InstructorCurso.objects.create(instructor=crear_instructor(), curso=curso, rol="Instructor técnico")
+        # Aula, coordinador e instructor asignado
+        self.assertEqual(Ocupacion.objects.filter(curso=curso).count(), 3)
+        Curso.objects.get(pk=curso.pk).delete()
+        self.assertFalse(Ocupacion.objects.exists())
+
+    def test_formulario_rechaza_aula_ocupada(self):
+        crear_curso(aula="101", horario="Lunes a Viernes 7:00-13:00")
+        curso = crear_curso(aula="201", horario="Lunes a Viernes 7:00-13:00")
+        form = CursoForm(self.datos_formulario(curso, aula="101", horario="Miércoles 12:00-14:00"), instance=curso)
+        self.assertFalse(form.is_valid())
+        self.assertIn('aula', form.errors)
+
+    def test_formulario_acepta_franjas_contiguas(self):
+        crear_curso(aula="101", horario="Lunes a Viernes 7:00-13:00")
+        curso = crear_curso(aula="201")
+        form = CursoForm(self.datos_formulario(curso, aula="101", horario="Lunes a Viernes 13:00-18:00"), instance=curso)
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_horario_anterior_se_conserva_si_no_se_edita(self):
+        curso = crear_curso()
+        Curso.objects.filter(pk=curso.pk).update(horario="Jornada mañana")
+        curso.refresh_from_db()
+        form = CursoForm(self.datos_formulario(curso, nombre="Curso renombrado"), instance=curso)
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        self.assertFalse(Ocupacion.objects.filter(curso=curso).exists())
+
+        form = CursoForm(self.datos_formulario(curso, horario="Jornada tarde"), instance=curso)
+        self.assertFalse(form.is_valid())
+        self.assertIn('horario', form.errors)
+
+    def test_todos_los_choques(self):
+        instructor = crear_instructor()
+        primero = crear_curso(instructor_coordinador=instructor)
+        segundo = crear_curso(
+            instructor_coordinador=instructor, horario="Lunes 10:00-12:00",
+            fecha_inicio=datetime.date(2025, 6, 1), fecha_fin=datetime.date(2025, 12, 1),
+        )
+        crear_curso(
+            instructor_coordinador=instructor, horario="Sábados 8:00-12:00",
+            fecha_inicio=datetime.date(2025, 6, 1), fecha_fin=datetime.date(2025, 12, 1),
+        )
+        pares = {(anterior.curso_id, ocupacion.curso_id) for anterior, ocupacion in todos_los_choques()}
+        self.assertEqual(pares, {(primero.pk, segundo.pk)})
+
+
+class EstadisticasTests(TestCase):
+
+    def setUp(self):
+        caches['compartida'].delete(CLAVE_CACHE)
+
+    def test_las_senales_invalidan_la_cache_compartida(self):
+        self.assertEqual(obtener_estadisticas()['total_aprendices'], 0)
+        # Otro proceso con la misma configuración ve la instantánea y su borrado
+        otro_proceso = caches.create_connection('compartida')
+        self.assertIsNotNone(otro_proceso.get(CLAVE_CACHE))
+        crear_aprendiz()
+        self.assertIsNone(otro_proceso.get(CLAVE_CACHE))
+        self.assertEqual(obtener_estadisticas()['total_aprendices'], 1)
+
+
+class ImportacionTests(TestCase):
+    ENCABEZADO = "documento_identidad,nombre,apellido,programa,telefono,correo,fecha_nacimiento,ciudad"
+
+    def setUp(self):
+        self.programa = crear_programa(codigo='228106', nombre="Análisis y Desarrollo de Software")
+
+    def importar(self, *filas, **opciones):
+        return importar_aprendices([self.ENCABEZADO, *filas], **opciones)
+
+    def test_crea_las_filas_validas_y_rechaza_las_demas(self):
+        crear_aprendiz(documento_identidad='1000000001')
+        resultado = self.importar(
+            "1000000002,Ana,Ruiz,228106,3001234567,ana@correo.co,2001-05-04,Cali",
+            "1000000003,Luis,Mora,analisis y desarrollo de software,,,2000-01-31,",
+            "10000000A4,Eva,Paz,228106,,,2000-01-01,",
+            "1000000005,Juan,Gil,999999,,,2000-01-01,",
+            "1000000001,Ya,Existe,228106,,,2000-01-01,",
+            "1000000002,Otra,Vez,228106,,,2000-01-01,",
+            tamano_lote=2,
+        )
+        self.assertEqual((resultado.leidas, resultado.creadas, resultado.rechazadas), (6, 2, 4))
+        self.assertEqual([fila for fila, _, _ in resultado.errores], [4, 5, 6, 7])
+        creados = Aprendiz.objects.filter(documento_identidad__in=['1000000002', '1000000003'])
+        self.assertEqual({aprendiz.programa_id for aprendiz in creados}, {self.programa.pk})
+        self.assertEqual(creados.get(documento_identidad='1000000003').clave_apellido, "mora luis")
+
+    def test_los_errores_no_pasan_de_una_fila_a_otra(self):
+        resultado = self.importar(
+            "1000000002,Ana,Ruiz,228106,3001234567,ana@correo.co,2001-05-04,Cali",
+            "1000000003,,,228106,,,,",
+            "1000000004,Eva,Paz,228106,,,2000-01-01,",
+        )
+        self.assertEqual(resultado.creadas, 2)
+        fila, documento, mensajes = resultado.errores[0]
+        self.assertEqual((fila, documento), (3, '1000000003'))
+        self.assertTrue(any(mensaje.startswith('fecha_nacimiento:') for mensaje in mensajes))
+        self.assertFalse(Aprendiz.objects.filter(documento_identidad='1000000003').exists())
+
+    def test_simular_no_crea_nada(self):
+        resultado = self.importar("1000000002,Ana,Ruiz,228106,,,2001-05-04,", simular=True)
+        self.assertEqual(resultado.creadas, 1)
+        self.assertFalse(Aprendiz.objects.exists())
+
+    def test_faltan_columnas(self):
+        with self.assertRaises(ArchivoInvalido):
+            importar_aprendices(["documento_identidad,nombre", "1,Ana"])
+
+
+class AprendizAdminTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(get_user_model().objects.create_superuser('admin', password=None))
+        for ciudad in ['Cali', 'Bogotá', 'Cali', None]:
+            crear_aprendiz(ciudad=ciudad)
+
+    def test_filtro_de_ciudad(self):
+        url = reverse('admin:aprendices_aprendiz_changelist')
+        respuesta = self.client.get(url)
+        filtro = next(f for f in respuesta.context['cl'].filter_specs if f.parameter_name == 'ciudad')
+        self.assertEqual([valor for valor, _ in filtro.lookup_choices], ['Bogotá', 'Cali'])
+
+        respuesta = self.client.get(url, {'ciudad': 'Cali'})
+        self.assertEqual(respuesta.context['cl'].result_count, 2)
+
+    def test_las_ciudades_se_leen_en_una_consulta(self):
+        filtro = CiudadFilter(None, {}, Aprendiz, None)
+        cache.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual([valor for valor, _ in filtro.lookups(None, None)], ['Bogotá', 'Cali'])
+
+    def test_las_ciudades_se_reutilizan_de_la_cache(self):
+        url = reverse('admin:aprendices_aprendiz_changelist')
+        self.client.get(url)
+        crear_aprendiz(ciudad='Medellín')
+        respuesta = self.client.get(url)
+        filtro = next(f for f in respuesta.context['cl'].filter_specs if f.parameter_name == 'ciudad')
+        self.assertNotIn('Medellín', [valor for valor, _ in filtro.lookup_choices])
+
+
+class CupoTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(get_user_model().objects.create_superuser('admin', password=None))
+        self.curso = crear_curso(cupos_maximos=2)
+        self.aprendices = [crear_aprendiz() for _ in range(3)]
+
+    def inscritos(self, curso):
+        curso.refresh_from_db(fields=['inscritos'])
+        return curso.inscritos
+
+    def agregar_en_admin(self, aprendiz, curso):
+        return self.client.post(reverse('admin:aprendices_aprendizcurso_add'), {
+            'aprendiz': aprendiz.pk, 'curso': curso.pk, 'estado': 'INS', 'nota_final': '', 'observaciones': '',
+        })
+
+    def test_el_servicio_no_inscribe_un_grupo_que_no_cabe(self):
+        resultado = inscribir_aprendices(self.curso.pk, [a.pk for a in self.aprendices], por=POR_ID)
+        self.assertTrue(resultado.sin_cupo)
+        self.assertEqual(resultado.cupos_disponibles, 2)
+        self.assertFalse(AprendizCurso.objects.exists())
+
+        resultado = inscribir_aprendices(self.curso.pk, [a.pk for a in self.aprendices[:2]], por=POR_ID)
+        self.assertEqual(resultado.inscritos, 2)
+        self.assertEqual(self.inscritos(self.curso), 2)
+
+    def test_el_admin_respeta_el_cupo_y_mueve_el_contador(self):
+        for aprendiz in self.aprendices[:2]:
+            self.assertEqual(self.agregar_en_admin(aprendiz, self.curso).status_code, 302)
+        self.assertEqual(self.inscritos(self.curso), 2)
+
+        respuesta = self.agregar_en_admin(self.aprendices[2], self.curso)
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertIn("no tiene cupos disponibles", str(respuesta.context['adminform'].form.non_field_errors()))
+        self.assertEqual(AprendizCurso.objects.count(), 2)
+        self.assertEqual(self.inscritos(self.curso), 2)
+
+    def test_el_admin_no_mueve_una_inscripcion_a_un_curso_lleno(self):
+        otro = crear_curso(cupos_maximos=1)
+        inscribir_aprendices(self.curso.pk, [self.aprendices[0].pk], por=POR_ID)
+        inscribir_aprendices(otro.pk, [self.aprendices[1].pk], por=POR_ID)
+        inscripcion = AprendizCurso.objects.get(aprendiz=self.aprendices[0])
+        url = reverse('admin:aprendices_aprendizcurso_change', args=[inscripcion.pk])
+        datos = {'aprendiz': self.aprendices[0].pk, 'estado': 'ACT', 'nota_final': '', 'observaciones': ''}
+
+        respuesta = self.client.post(url, {**datos, 'curso': otro.pk})
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(AprendizCurso.objects.get(pk=inscripcion.pk).curso_id, self.curso.pk)
+
+        # Editar sin cambiar de curso no consume cupo aunque el curso esté lleno
+        self.curso.cupos_maximos = 1
+        self.curso.save(update_fields=['cupos_maximos'])
+        self.assertEqual(self.client.post(url, {**datos, 'curso': self.curso.pk}).status_code, 302)
+        self.assertEqual(AprendizCurso.objects.get(pk=inscripcion.pk).estado, 'ACT')
+
+
+class AvanzarEstadosTests(TestCase):
+    HOY = datetime.date(2025, 4, 15)
+
+    def setUp(self):
+        def curso(estado, inicio, fin):
+            return crear_curso(estado=estado, fecha_inicio=inicio, fecha_fin=fin)
+
+        dia = datetime.timedelta(days=1)
+        self.terminado = curso('EJE', self.HOY - 120 * dia, self.HOY - dia)
+        self.en_ejecucion = curso('INI', self.HOY - 40 * dia, self.HOY + 60 * dia)
+        self.iniciado = curso('PRO', self.HOY - 5 * dia, self.HOY + 90 * dia)
+        self.futuro = curso('PRO', self.HOY + dia, self.HOY + 90 * dia)
+        self.cancelado = curso('CAN', self.HOY - 120 * dia, self.HOY - dia)
+
+        def inscribir(curso, estado='INS', nota=None):
+            return AprendizCurso.objects.create(aprendiz=crear_aprendiz(), curso=curso, estado=estado, nota_final=nota)
+
+        self.aprobada = inscribir(self.terminado, 'ACT', Decimal('4.0'))
+        self.sin_nota = inscribir(self.terminado, 'INS', Decimal('2.5'))
+        self.activa = inscribir(self.iniciado)
+        self.por_empezar = inscribir(self.futuro)
+
+    def estados(self):
+        return (
+            {curso.pk: curso.estado for curso in Curso.objects.all()},
+            {inscripcion.pk: inscripcion.estado for inscripcion in AprendizCurso.objects.all()},
+        )
+
+    def test_transiciones(self):
+        resultado = avanzar_estados(self.HOY, tamano_lote=1)
+        cursos, inscripciones = self.estados()
+        self.assertEqual(cursos, {
+            self.terminado.pk: 'FIN', self.en_ejecucion.pk: 'EJE', self.iniciado.pk: 'INI',
+            self.futuro.pk: 'PRO', self.cancelado.pk: 'CAN',
+        })
+        self.assertEqual(inscripciones, {
+            self.aprobada.pk: 'GRA', self.sin_nota.pk: 'ACT', self.activa.pk: 'ACT', self.por_empezar.pk: 'INS',
+        })
+        self.assertEqual(resultado.total, 6)
+        self.assertEqual(resultado.pendientes_de_nota, 1)
+
+    def test_simular_cuenta_lo_mismo_sin_cambiar_nada(self):
+        antes = self.estados()
+        simulado = avanzar_estados(self.HOY, simular=True)
+        self.assertEqual(self.estados(), antes)
+        ejecutado = avanzar_estados(self.HOY)
+        self.assertEqual(simulado.cambios, ejecutado.cambios)
+        self.assertEqual(simulado.pendientes_de_nota, ejecutado.pendientes_de_nota)
+
+    def test_repetir_no_cambia_nada(self):
+        avanzar_estados(self.HOY)
+        despues = self.estados()
+        self.assertEqual(avanzar_estados(self.HOY).total, 0)
+        self.assertEqual(self.estados(), despues)
+
+
+class CargarNotasTests(TestCase):
+
+    def setUp(self):
+        self.curso = crear_curso()
+        for documento, nota in [('1000000001', None), ('1000000002', Decimal('3.5')), ('1000000003', None)]:
+            AprendizCurso.objects.create(
+                aprendiz=crear_aprendiz(documento_identidad=documento), curso=self.curso, nota_final=nota,
+            )
+        crear_aprendiz(documento_identidad='1000000009')
+
+    def guardadas(self):
+        return {
+            inscripcion.aprendiz.documento_identidad: (inscripcion.nota_final, inscripcion.estado)
+            for inscripcion in AprendizCurso.objects.filter(curso=self.curso).select_related('aprendiz')
+        }
+
+    def test_cambiadas_sin_cambios_y_rechazadas(self):
+        resultado = cargar_notas(self.curso.pk, [
+            "documento_identidad,nota_final,estado",
+            "1000000001,4.50,Graduado",
+            "1000000002,3.5,",
+            "1000000003,2.0,GRA",
+            "1000000009,4.0,",
+            "1000000001,3.0,",
+            ",4.0,",
+            "1000000004,7,XYZ",
+        ])
+        self.assertEqual([(c.documento, c.nota_nueva, c.estado_nuevo) for c in resultado.cambiadas],
+                         [('1000000001', Decimal('4.5'), 'GRA')])
+        self.assertEqual(resultado.sin_cambios, ['1000000002'])
+        self.assertEqual([fila for fila, _, _ in resultado.rechazadas], [4, 5, 6, 7, 8])
+        self.assertEqual(len(resultado.rechazadas[-1][2]), 2)
+        self.assertEqual(self.guardadas(), {
+            '1000000001': (Decimal('4.5'), 'GRA'),
+            '1000000002': (Decimal('3.5'), 'INS'),
+            '1000000003': (None, 'INS'),
+        })
+
+    def test_punto_y_coma_con_coma_decimal(self):
+        resultado = cargar_notas(self.curso.pk, [
+            "documento_identidad;nota_final",
+            "1000000001;4,2",
+            "1000000003;3",
+        ])
+        self.assertEqual(len(resultado.cambiadas), 2)
+        self.assertEqual(self.guardadas()['1000000001'], (Decimal('4.2'), 'INS'))
+        self.assertEqual(self.guardadas()['1000000003'], (Decimal('3'), 'INS'))
+
+    def test_simular_no_guarda(self):
+        antes = self.guardadas()
+        resultado = cargar_notas(self.curso.pk, ["documento_identidad,nota_final", "1000000001,4.0"], simular=True)
+        self.assertEqual(len(resultado.cambiadas), 1)
+        self.assertEqual(self.guardadas(), antes)
+
+    def test_faltan_columnas(self):
+        with self.assertRaises(ArchivoInvalido):
+            cargar_notas(self.curso.pk, ["documento_identidad", "1000000001"])
+
+
+class VincularProgramasTests(TestCase):
+
+    def test_vincula_y_reindexa_a_los_aprendices(self):
+        programa = crear_programa(codigo='228106', nombre="Gestión Agropecuaria")
+        crear_programa(codigo='228107', nombre="Gestión Agropecuaria ")
+        vinculado = crear_aprendiz(programa_texto="228106")
+        ambiguo = crear_aprendiz(programa_texto="gestion agropecuaria")
+
+        resultado = vincular_programas(tamano_lote=1)
+        self.assertEqual((resultado.vinculados, resultado.sin_vincular), (1, 1))
+        vinculado.refresh_from_db()
+        ambiguo.refresh_from_db()
+        self.assertEqual((vinculado.programa_id, ambiguo.programa_id), (programa.pk, None))
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT contenido FROM {indice.TABLA} WHERE rowid = %s',
+                           [indice._rowid('aprendiz', vinculado.pk)])
+            self.assertIn("Gestión Agropecuaria", cursor.fetchone()[0])
+
+
+class ProponerIndiceTests(SimpleTestCase):
+    SELECT = 'SELECT "t"."id" FROM "t" WHERE '
+
+    def test_ramas_unidas_con_or_no_proponen_un_indice_compuesto(self):
+        columnas, motivo = proponer(
+            self.SELECT + '(("t"."a" >= %s AND "t"."a" < %s) OR ("t"."b" >= %s AND "t"."b" < %s)) '
+            'ORDER BY "t"."c" ASC, "t"."id" ASC LIMIT 20', 't', 'id',
+        )
+        self.assertIsNone(columnas)
+        self.assertIn("OR", motivo)
+
+    def test_las_condiciones_fuera_del_or_si_proponen(self):
+        columnas, _ = proponer(
+            self.SELECT + '("t"."estado" = %s AND ("t"."a" = %s OR "t"."b" = %s)) ORDER BY "t"."id" ASC', 't', 'id',
+        )
+        self.assertEqual(columnas, ['estado', 'id'])
+
+    def test_between_no_se_parte(self):
+        columnas, _ = proponer(
+            self.SELECT + '"t"."estado" = %s AND "t"."fecha" BETWEEN %s AND %s ORDER BY "t"."id" ASC', 't', 'id',
+        )
+        self.assertEqual(columnas, ['estado', 'fecha'])
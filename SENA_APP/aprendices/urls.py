@@ -10,5 +10,6 @@ urlpatterns = [
     path('lista_cursos/', views.lista_cursos, name='lista_cursos'),
     path('lista_cursos/curso/<int:curso_id>/', views.detalle_curso, name='detalle_curso'),
     path('aprendices/aprendiz/<int:aprendiz_id>/', views.detalle_aprendiz, name='detalle_aprendiz'),
+    path('exportar/<slug:recurso>.<slug:formato>', views.exportar, name='exportar'),
     path('aprendices/agregar_aprendiz/',  AprendizFormView.as_view(), name='agregar_aprendiz'),
 ]
\ No newline at end of file
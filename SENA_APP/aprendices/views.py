@@ -1,64 +1,110 @@
-from django.http import HttpResponse
+import logging
+
+from asgiref.sync import sync_to_async
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.template import loader
 from django.contrib import messages
 from django.urls import reverse_lazy
 
-from .models import Aprendiz, Curso
+from django.db.models import Max, Prefetch
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Aprendiz, AprendizCurso, Curso, InstructorCurso
+from .estadisticas import aobtener_estadisticas
+from .exportacion import EXPORTACIONES, FORMATOS, filas
 from django.shortcuts import get_object_or_404
-from instructores.models import Instructor
-from programas.models import Programa
 
 from aprendices.forms import AprendizForm
 from django.views import generic
+from SENA_APP.asincrono import en_paralelo
+from SENA_APP.condicional import detalle_condicional
+from SENA_APP.paginacion import paginar, total_aproximado
+
+logger = logging.getLogger(__name__)
 
 # Create your views here.
 
+# Columnas que usan las plantillas; cada vista carga solo lo que muestra y sus
+# relaciones en un número fijo de consultas, sin importar cuántas filas haya.
+CAMPOS_PROGRAMA_STR = ('programa__codigo', 'programa__nombre')
+# Textos largos del programa; el detalle del aprendiz muestra solo el extracto
+TEXTOS_PROGRAMA = (
+    'programa__descripcion', 'programa__competencias', 'programa__perfil_egreso', 'programa__requisitos_ingreso',
+)
+
+CAMPOS_COORDINADOR_STR = (
+    'instructor_coordinador__nombre',
+    'instructor_coordinador__apellido',
+    'instructor_coordinador__especialidad',
+)
+
 def aprendices(request):
-    lista_aprendices = Aprendiz.objects.all().order_by('apellido', 'nombre')
+    aprendices = Aprendiz.objects.select_related('programa').only(
+        'documento_identidad', 'nombre', 'apellido', 'telefono', 'correo', 'fecha_nacimiento', 'ciudad',
+        'fecha_actualizacion', 'programa__nombre',
+    )
+    pagina = paginar(request, aprendices, ['apellido', 'nombre', 'id'])
     template = loader.get_template('lista_aprendices.html')
     
     context = {
-        'lista_aprendices': lista_aprendices,
-        'total_aprendices': lista_aprendices.count(),
+        'lista_aprendices': pagina.objetos,
+        'pagina': pagina,
+        'total_aprendices': total_aproximado(Aprendiz.objects.all(), 'aprendices'),
     }
     return HttpResponse(template.render(context, request))
 
-def inicio(request):
-    # Estadísticas generales
-    total_aprendices = Aprendiz.objects.count()
-    total_instructores = Instructor.objects.count() 
-    total_programas = Programa.objects.count()
-    total_cursos = Curso.objects.count()
-    cursos_activos = Curso.objects.filter(estado__in=['INI', 'EJE']).count()
+async def inicio(request):
+    # Estadísticas generales (cacheadas, ver aprendices/estadisticas.py)
     template = loader.get_template('inicio.html')
     
-    context = {
-        'total_aprendices': total_aprendices,
-        'total_cursos': total_cursos,
-        'cursos_activos': cursos_activos,
-        'total_instructores': total_instructores,
-        'total_programas': total_programas,
-    }
+    context = await aobtener_estadisticas()
     
-    return HttpResponse(template.render(context, request))
+    return HttpResponse(await sync_to_async(template.render)(context, request))
 
 
 def lista_cursos(request):
-    cursos = Curso.objects.all().order_by('-fecha_inicio')
+    cursos = Curso.objects.select_related('programa', 'instructor_coordinador').only(
+        'codigo', 'nombre', 'fecha_inicio', 'fecha_fin', 'horario', 'estado',
+        *CAMPOS_PROGRAMA_STR, *CAMPOS_COORDINADOR_STR,
+    )
+    pagina = paginar(request, cursos, ['-fecha_inicio', '-id'])
     template = loader.get_template('lista_cursos.html')
     
     context = {
-        'lista_cursos': cursos,
-        'total_cursos': cursos.count(),
+        'lista_cursos': pagina.objetos,
+        'pagina': pagina,
+        'total_cursos': total_aproximado(Curso.objects.all(), 'cursos'),
         'titulo': 'Lista de Cursos'
     }
     
     return HttpResponse(template.render(context, request))
 
-def detalle_curso(request, curso_id):
-    curso = get_object_or_404(Curso, id=curso_id)
-    aprendices_curso = curso.aprendizcurso_set.all()
-    instructores_curso = curso.instructorcurso_set.all()
+def marca_curso(curso_id):
+    # Las inscripciones, asignaciones y cambios de aprendices o instructores
+    # marcan el curso (aprendices/signals.py); el programa se consulta aquí
+    return Curso.objects.filter(pk=curso_id).annotate(
+        marca=Greatest('fecha_actualizacion', 'programa__fecha_actualizacion'),
+    ).values_list('marca', flat=True).first()
+
+
+@detalle_condicional(marca_curso)
+async def detalle_curso(request, curso_id):
+    # 3 consultas independientes (el curso con sus FK, los inscritos y los
+    # instructores) que se ejecutan a la vez, ver SENA_APP/asincrono.py
+    curso, aprendices_curso, instructores_curso = await en_paralelo(
+        lambda: Curso.objects.select_related('programa', 'instructor_coordinador').filter(id=curso_id).first(),
+        lambda: list(AprendizCurso.objects.filter(curso_id=curso_id).select_related('aprendiz').only(
+            'estado', 'curso', 'aprendiz__nombre', 'aprendiz__apellido', 'aprendiz__documento_identidad',
+        )),
+        lambda: list(InstructorCurso.objects.filter(curso_id=curso_id).select_related('instructor').only(
+            'rol', 'curso', 'instructor__nombre', 'instructor__apellido', 'instructor__especialidad',
+        )),
+    )
+    if curso is None:
+        raise Http404("No existe el curso")
+    # Lo que hacía prefetch_related: __str__ de cada fila usa su curso
+    for relacion in (*aprendices_curso, *instructores_curso):
+        relacion.curso = curso
     template = loader.get_template('detalle_curso.html')
     
     context = {
@@ -67,10 +113,25 @@ def detalle_curso(request, curso_id):
         'instructores_curso': instructores_curso,
     }
     
-    return HttpResponse(template.render(context, request))
+    return HttpResponse(await sync_to_async(template.render)(context, request))
+
+def marca_aprendiz(aprendiz_id):
+    # La página lista sus cursos, así que cuenta el más reciente de ellos
+    return Aprendiz.objects.filter(pk=aprendiz_id).annotate(
+        marca=Greatest('fecha_actualizacion', Coalesce(Max('cursos__fecha_actualizacion'), 'fecha_actualizacion')),
+    ).values_list('marca', flat=True).first()
 
+
+@detalle_condicional(marca_aprendiz)
 def detalle_aprendiz(request, aprendiz_id):
-    aprendiz = get_object_or_404(Aprendiz, id=aprendiz_id) #Datos
+    # Los cursos se precargan para que cursos.exists/count/all no consulten de nuevo
+    cursos = Curso.objects.select_related('instructor_coordinador').only(
+        'codigo', 'nombre', 'estado', 'fecha_inicio', 'fecha_fin', *CAMPOS_COORDINADOR_STR,
+    )
+    aprendiz = get_object_or_404(
+        Aprendiz.objects.select_related('programa').defer(*TEXTOS_PROGRAMA).prefetch_related(Prefetch('cursos', queryset=cursos)),
+        id=aprendiz_id,
+    ) #Datos
     template = loader.get_template('detalle_aprendiz.html') #Template
     
     context = {
@@ -79,45 +140,33 @@ def detalle_aprendiz(request, aprendiz_id):
     
     return HttpResponse(template.render(context, request))
 
+def exportar(request, recurso, formato):
+    # Descarga en streaming; ver aprendices/exportacion.py
+    if recurso not in EXPORTACIONES or formato not in FORMATOS:
+        raise Http404("Exportación no disponible")
+    generar, tipo_contenido = FORMATOS[formato]
+    response = StreamingHttpResponse(generar(filas(recurso, request.GET)), content_type=tipo_contenido)
+    sufijo = f"_curso_{request.GET['curso']}" if recurso == 'inscripciones' and request.GET.get('curso', '').isdigit() else ''
+    response['Content-Disposition'] = f'attachment; filename="{recurso}{sufijo}.{formato}"'
+    return response
+
+
 class AprendizFormView(generic.FormView):
     template_name = "agregar_aprendiz.html"
     form_class = AprendizForm
     success_url = reverse_lazy('aprendices:lista_aprendices')  # Usar reverse_lazy para mejor práctica
     
-    def post(self, request, *args, **kwargs):
-        print("=== POST REQUEST RECIBIDO PARA APRENDIZ ===")
-        print(f"POST data: {request.POST}")
-        return super().post(request, *args, **kwargs)
-
     def form_valid(self, form):
-        print("=== FORMULARIO DE APRENDIZ VÁLIDO ===")
-        print(f"Cleaned data: {form.cleaned_data}")
-        
         try:
-            # El método save() ya está definido en tu AprendizForm
             form.save()
-            print("=== APRENDIZ GUARDADO EXITOSAMENTE ===")
-            
-            # Verificar que se guardó
-            ultimo_aprendiz = Aprendiz.objects.last()
-            print(f"Último aprendiz guardado: {ultimo_aprendiz.nombre} {ultimo_aprendiz.apellido}")
-            
-            messages.success(self.request, 'Aprendiz agregado exitosamente.')
-            return super().form_valid(form)
         except Exception as e:
-            print(f"=== ERROR AL GUARDAR APRENDIZ ===")
-            print(f"Error: {str(e)}")
-            
-            import traceback
-            print(f"Traceback completo: {traceback.format_exc()}")
-            
+            logger.exception("Error al guardar el aprendiz")
             messages.error(self.request, f'Error al guardar el aprendiz: {str(e)}')
             return self.form_invalid(form)
+        messages.success(self.request, 'Aprendiz agregado exitosamente.')
+        return super().form_valid(form)
     
     def form_invalid(self, form):
-        print("=== FORMULARIO DE APRENDIZ INVÁLIDO ===")
-        print(f"Errores del formulario: {form.errors}")
-        print(f"Errores no de campo: {form.non_field_errors()}")
-        
+        logger.info("Formulario de aprendiz inválido: %s", form.errors.as_json())
         messages.error(self.request, 'Por favor, corrija los errores en el formulario.')
         return super().form_invalid(form)
\ No newline at end of file
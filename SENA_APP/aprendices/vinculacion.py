@@ -0,0 +1,117 @@
+"""
+Vinculación del programa de los aprendices escrito como texto libre con
+`programas.Programa`.
+
+El texto se compara normalizado (sin tildes, mayúsculas, signos ni espacios
+repetidos) contra el nombre y el código de cada programa. Si un texto
+coincide con más de un programa se considera ambiguo y no se vincula.
+
+`vincular_programas` (el comando del mismo nombre) recorre por lotes de id
+solo los aprendices con texto y sin programa, con una transacción por lote:
+si se interrumpe, la siguiente ejecución continúa con los que faltan. Los
+aprendices se vinculan con `update()`, que no emite señales, así que cada
+lote se reindexa en la búsqueda (el documento incluye el nombre del
+programa). La migración 0009 tiene su propia copia de esta lógica.
+"""
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.utils import timezone
+
+from busqueda import indice
+from busqueda.normalizacion import normalizar_texto
+from programas.models import Programa
+
+from .models import Aprendiz
+
+TAMANO_LOTE = 2000
+
+SIN_COINCIDENCIA = 'sin coincidencia'
+AMBIGUO = 'ambiguo'
+
+
+def clave_programa(texto):
+    return normalizar_texto(re.sub(r'[^\w\s]', ' ', texto or ''))
+
+
+class MapaProgramas:
+    """Índice en memoria de programas por nombre y código normalizados."""
+
+    def __init__(self, programas):
+        candidatos = defaultdict(dict)
+        for programa in programas:
+            for texto in (programa.nombre, programa.codigo):
+                if clave := clave_programa(texto):
+                    candidatos[clave][programa.pk] = programa
+        self.programas = {clave: list(encontrados.values()) for clave, encontrados in candidatos.items()}
+
+    @classmethod
+    def desde_modelo(cls, modelo):
+        return cls(modelo.objects.only('codigo', 'nombre'))
+
+    def buscar(self, texto):
+        """Devuelve (programa, None) o (None, motivo)."""
+        encontrados = self.programas.get(clave_programa(texto), [])
+        if len(encontrados) == 1:
+            return encontrados[0], None
+        return None, AMBIGUO if encontrados else SIN_COINCIDENCIA
+
+
+@dataclass
+class ResultadoVinculacion:
+    vinculados: int = 0
+    # (texto original, motivo) -> aprendices
+    pendientes: Counter = field(default_factory=Counter)
+
+    @property
+    def sin_vincular(self):
+        return sum(self.pendientes.values())
+
+
+def vincular_programas(tamano_lote=TAMANO_LOTE, reporte=None):
+    """
+    Asigna `programa` a partir de `programa_texto` en los aprendices que aún
+    no lo tienen. `reporte`, si se indica, es un `csv.writer` que recibe
+    (id, documento, texto, motivo) por cada aprendiz que no se pudo vincular.
+    """
+    mapa = MapaProgramas.desde_modelo(Programa)
+    resultado = ResultadoVinculacion()
+    pendientes = (
+        Aprendiz.objects.filter(programa__isnull=True, programa_texto__isnull=False)
+        .exclude(programa_texto='').order_by('id')
+    )
+    ultimo = 0
+    while True:
+        lote = list(pendientes.filter(id__gt=ultimo).values_list('id', 'documento_identidad', 'programa_texto')[:tamano_lote])
+        if not lote:
+            break
+        ultimo = lote[-1][0]
+
+        por_programa = defaultdict(list)
+        for aprendiz_id, documento, texto in lote:
+            programa, motivo = mapa.buscar(texto)
+            if programa is not None:
+                por_programa[programa.pk].append(aprendiz_id)
+                continue
+            resultado.pendientes[texto, motivo] += 1
+            if reporte is not None:
+                reporte.writerow([aprendiz_id, documento, texto, motivo])
+
+        # Un UPDATE por programa presente en el lote, no uno por aprendiz;
+        # la marca de actualización renueva las filas cacheadas del listado
+        ahora = timezone.now()
+        with transaction.atomic():
+            for programa_id, ids in por_programa.items():
+                resultado.vinculados += Aprendiz.objects.filter(id__in=ids).update(
+                    programa_id=programa_id, fecha_actualizacion=ahora,
+                )
+            Programa.objects.filter(pk__in=por_programa).update(fecha_actualizacion=ahora)
+            if por_programa and indice.disponible():
+                vinculados = [aprendiz_id for ids in por_programa.values() for aprendiz_id in ids]
+                indice.indexar_lote(
+                    Aprendiz.objects.filter(id__in=vinculados).select_related('programa')
+                    .only('documento_identidad', 'nombre', 'apellido', 'ciudad', 'correo', 'programa__nombre')
+                )
+    return resultado
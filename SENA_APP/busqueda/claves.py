@@ -0,0 +1,78 @@
+"""
+Claves de búsqueda normalizadas para el admin.
+
+`search_fields` de Django busca con `icontains`, que en SQLite es
+`LIKE '%x%'`: recorre la tabla completa (y las relacionadas, a través de
+joins) en cada búsqueda. En su lugar, Aprendiz, Instructor y Curso guardan en
+save() su nombre normalizado con `normalizar_texto` (minúsculas, sin tildes)
+en columnas indexadas, y `BusquedaPorClaveMixin` busca:
+
+1. `=campo`: coincidencia exacta por un índice único (documento, código).
+   Si hay resultados, son la respuesta.
+2. `^campo`: prefijo sobre una clave normalizada, como un rango
+   `clave >= x AND clave < x + U+10FFFF`, que SQLite resuelve con el índice
+   (su LIKE ignora mayúsculas y no puede usarlo).
+
+Los campos de otro modelo (`aprendiz__clave_nombre`) se buscan con una
+subconsulta `aprendiz_id IN (SELECT id ... WHERE <rango>)`, que también usa
+el índice de cada tabla en lugar de un join sobre toda la relación.
+
+Las claves son campos derivados (ver SENA_APP/derivados.py). `bulk_create`
+y `update()` no pasan por save(): quien cree o renombre objetos así debe
+llamar a `calcular_claves()`.
+"""
+from django.db.models import Q
+
+from .normalizacion import normalizar_texto
+
+# Mayor que cualquier carácter: todo texto que empiece por x queda antes de x + FIN
+FIN = '\U0010ffff'
+
+
+def clave(*partes):
+    return normalizar_texto(' '.join(parte for parte in partes if parte))
+
+
+def claves_persona(nombre, apellido):
+    """(clave_nombre, clave_apellido): para buscar por el nombre o por el apellido."""
+    return clave(nombre, apellido), clave(apellido, nombre)
+
+
+def filtro_prefijo(campo, prefijo):
+    return Q(**{f'{campo}__gte': prefijo, f'{campo}__lt': prefijo + FIN})
+
+
+class BusquedaPorClaveMixin:
+    """
+    `get_search_results` para ModelAdmin con `search_fields` de la forma
+    '=campo' (exacto, por índice único) y '^campo' (prefijo de una clave
+    normalizada). Ver el docstring del módulo.
+    """
+
+    def _condicion(self, ruta, condicion):
+        # 'aprendiz__clave_nombre' -> aprendiz_id IN (SELECT id FROM aprendiz WHERE ...)
+        relacion, _, campo = ruta.rpartition('__')
+        if not relacion:
+            return condicion(campo)
+        relacionado = self.model._meta.get_field(relacion).related_model
+        return Q(**{f'{relacion}__in': relacionado._default_manager.filter(condicion(campo)).values('pk')})
+
+    def get_search_results(self, request, queryset, search_term):
+        termino = search_term.strip()
+        if not termino:
+            return queryset, False
+        search_fields = self.get_search_fields(request)
+
+        exactos = Q()
+        for ruta in (campo[1:] for campo in search_fields if campo.startswith('=')):
+            exactos |= self._condicion(ruta, lambda campo: Q(**{campo: termino}))
+        if exactos and queryset.filter(exactos).exists():
+            return queryset.filter(exactos), False
+
+        prefijo = normalizar_texto(termino)
+        prefijos = Q()
+        for ruta in (campo[1:] for campo in search_fields if campo.startswith('^')):
+            prefijos |= self._condicion(ruta, lambda campo: filtro_prefijo(campo, prefijo))
+        if not prefijo or not prefijos:
+            return queryset.none(), False
+        return queryset.filter(prefijos), False
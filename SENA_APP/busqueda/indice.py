@@ -0,0 +1,177 @@
+"""
+Índice de búsqueda de texto completo sobre SQLite FTS5.
+
+Cada objeto indexado ocupa una fila de la tabla virtual `busqueda_documento`
+cuyo rowid se deriva del tipo y del id del objeto, de modo que actualizar o
+borrar una entrada es una búsqueda por clave primaria. El tokenizador
+`unicode61 remove_diacritics 2` hace que las consultas ignoren tildes.
+"""
+from django.db import connection, transaction
+from django.urls import reverse
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from aprendices.models import Aprendiz
+from instructores.models import Instructor
+from programas.models import Programa
+from proyectos.models import Proyecto
+
+from .normalizacion import normalizar_texto
+
+TABLA = 'busqueda_documento'
+
+# Marcadores de control para el resaltado; se cambian por <mark> después de
+# escapar el fragmento, así el texto indexado nunca se interpreta como HTML.
+INICIO_MARCA = '\x02'
+FIN_MARCA = '\x03'
+
+
+def _unir(*partes):
+    return ' '.join(str(parte) for parte in partes if parte)
+
+
+# tipo -> (código para el rowid, modelo, título, contenido, nombre de URL)
+TIPOS = {
+    'aprendiz': (
+        1, Aprendiz,
+        lambda a: _unir(a.nombre, a.apellido),
+        lambda a: _unir(a.documento_identidad, a.programa and a.programa.nombre, a.ciudad, a.correo),
+        'aprendices:detalle_aprendiz',
+    ),
+    'instructor': (
+        2, Instructor,
+        lambda i: _unir(i.nombre, i.apellido),
+        lambda i: _unir(i.documento_identidad, i.especialidad, i.ciudad, i.correo),
+        'instructores:detalle_instructor',
+    ),
+    'programa': (
+        3, Programa,
+        lambda p: _unir(p.codigo, p.nombre),
+        lambda p: _unir(p.descripcion, p.competencias, p.centro_formacion, p.regional),
+        'programas:detalle_programa',
+    ),
+    'proyecto': (
+        4, Proyecto,
+        lambda p: p.titulo,
+        lambda p: _unir(p.area_proponente, p.responsable, p.descripcion_detallada, p.objetivos_generales),
+        'proyectos:detalle_proyecto',
+    ),
+}
+
+# Relaciones que usa el contenido de cada tipo; reconstruir() las trae en la misma consulta
+RELACIONES = {'aprendiz': ['programa']}
+
+TIPO_POR_MODELO = {datos[1]: tipo for tipo, datos in TIPOS.items()}
+TIPO_POR_CODIGO = {datos[0]: tipo for tipo, datos in TIPOS.items()}
+FACTOR_ROWID = 8
+
+
+def disponible():
+    return connection.vendor == 'sqlite'
+
+
+def _rowid(tipo, objeto_id):
+    return objeto_id * FACTOR_ROWID + TIPOS[tipo][0]
+
+
+def _fila(tipo, objeto):
+    _, _, titulo, contenido, _ = TIPOS[tipo]
+    return (_rowid(tipo, objeto.pk), titulo(objeto), contenido(objeto))
+
+
+def indexar(objeto):
+    tipo = TIPO_POR_MODELO[type(objeto)]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT OR REPLACE INTO {TABLA} (rowid, titulo, contenido) VALUES (%s, %s, %s)',
+            _fila(tipo, objeto),
+        )
+
+
+def indexar_lote(objetos):
+    """Indexa varios objetos del mismo modelo; para cargas con bulk_create, que no emite señales."""
+    filas = [_fila(TIPO_POR_MODELO[type(objeto)], objeto) for objeto in objetos]
+    if not filas:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f'INSERT OR REPLACE INTO {TABLA} (rowid, titulo, contenido) VALUES (%s, %s, %s)', filas)
+
+
+def eliminar(objeto):
+    tipo = TIPO_POR_MODELO[type(objeto)]
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLA} WHERE rowid = %s', [_rowid(tipo, objeto.pk)])
+
+
+def reconstruir(tamano_lote=2000):
+    """Vacía el índice y lo vuelve a llenar recorriendo cada modelo por lotes."""
+    totales = {}
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {TABLA}')
+        for tipo, (_, modelo, _, _, _) in TIPOS.items():
+            lote = []
+            totales[tipo] = 0
+            objetos = modelo.objects.order_by().select_related(*RELACIONES.get(tipo, ()))
+            for objeto in objetos.iterator(chunk_size=tamano_lote):
+                lote.append(_fila(tipo, objeto))
+                if len(lote) >= tamano_lote:
+                    cursor.executemany(f'INSERT INTO {TABLA} (rowid, titulo, contenido) VALUES (%s, %s, %s)', lote)
+                    totales[tipo] += len(lote)
+                    lote = []
+            if lote:
+                cursor.executemany(f'INSERT INTO {TABLA} (rowid, titulo, contenido) VALUES (%s, %s, %s)', lote)
+                totales[tipo] += len(lote)
+        cursor.execute(f"INSERT INTO {TABLA} ({TABLA}) VALUES ('optimize')")
+    return totales
+
+
+def _resaltar(fragmento):
+    return mark_safe(
+        escape(fragmento).replace(INICIO_MARCA, '<mark>').replace(FIN_MARCA, '</mark>')
+    )
+
+
+def construir_consulta(texto):
+    """
+    Convierte el texto del usuario en una expresión FTS5 segura: cada palabra
+    se cita (para neutralizar la sintaxis de FTS) y se busca como prefijo.
+    """
+    palabras = normalizar_texto(texto).replace('"', ' ').split()
+    return ' AND '.join(f'"{palabra}"*' for palabra in palabras)
+
+
+def buscar(texto, pagina=1, por_pagina=20):
+    """
+    Devuelve (resultados, hay_mas) ordenados por relevancia (bm25, el título
+    pesa más que el contenido).
+    """
+    consulta = construir_consulta(texto)
+    if not consulta:
+        return [], False
+
+    desplazamiento = (pagina - 1) * por_pagina
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT rowid, titulo, snippet({TABLA}, 1, %s, %s, '…', 12)
+            FROM {TABLA}
+            WHERE {TABLA} MATCH %s
+            ORDER BY bm25({TABLA}, 10.0, 1.0)
+            LIMIT %s OFFSET %s
+            """,
+            [INICIO_MARCA, FIN_MARCA, consulta, por_pagina + 1, desplazamiento],
+        )
+        filas = cursor.fetchall()
+
+    resultados = []
+    for rowid, titulo, fragmento in filas[:por_pagina]:
+        tipo = TIPO_POR_CODIGO[rowid % FACTOR_ROWID]
+        objeto_id = rowid // FACTOR_ROWID
+        resultados.append({
+            'tipo': tipo,
+            'id': objeto_id,
+            'titulo': titulo,
+            'fragmento': _resaltar(fragmento),
+            'url': reverse(TIPOS[tipo][4], args=[objeto_id]),
+        })
+    return resultados, len(filas) > por_pagina
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from busqueda import indice
+
+
+class Command(BaseCommand):
+    help = "Reconstruye desde cero el índice de búsqueda de texto completo"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=2000, help="Filas insertadas por lote")
+
+    def handle(self, *args, **options):
+        if not indice.disponible():
+            raise CommandError("La búsqueda de texto completo requiere SQLite con FTS5.")
+
+        totales = indice.reconstruir(tamano_lote=options['lote'])
+        for tipo, total in totales.items():
+            self.stdout.write(f"{tipo}: {total} documentos indexados")
+        self.stdout.write(self.style.SUCCESS("Índice reconstruido."))
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def crear_indice(apps, schema_editor):
+    # FTS5 solo existe en SQLite; en otros motores la búsqueda queda deshabilitada
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS busqueda_documento "
+        "USING fts5(titulo, contenido, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+
+
+def eliminar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute("DROP TABLE IF EXISTS busqueda_documento")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, eliminar_indice),
+    ]
@@ -0,0 +1,14 @@
+import re
+import unicodedata
+
+
+def normalizar_texto(texto):
+    """
+    Pasa a minúsculas, elimina tildes y diéresis y colapsa espacios, para que
+    "José Pérez" y "jose perez" se comparen igual.
+    """
+    if not texto:
+        return ''
+    descompuesto = unicodedata.normalize('NFKD', str(texto))
+    sin_tildes = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    return re.sub(r'\s+', ' ', sin_tildes).strip().lower()
@@ -0,0 +1,57 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from aprendices.models import Aprendiz
+from programas.models import Programa
+
+from . import indice
+
+
+@receiver(post_save)
+def actualizar_indice(sender, instance, raw=False, **kwargs):
+    if raw or sender not in indice.TIPO_POR_MODELO or not indice.disponible():
+        return
+    indice.indexar(instance)
+
+
+@receiver(post_delete)
+def quitar_del_indice(sender, instance, **kwargs):
+    if sender not in indice.TIPO_POR_MODELO or not indice.disponible():
+        return
+    indice.eliminar(instance)
+
+
+@receiver(post_save, sender=Programa)
+def reindexar_aprendices_del_programa(sender, instance, created, raw=False, **kwargs):
+    # El contenido indexado de cada aprendiz incluye el nombre de su programa
+    if raw or created or not indice.disponible():
+        return
+    if instance.nombre == getattr(instance, '_nombre_original', None):
+        return
+    aprendices = list(Aprendiz.objects.filter(programa=instance).only(
+        'documento_identidad', 'nombre', 'apellido', 'ciudad', 'correo', 'programa',
+    ))
+    for aprendiz in aprendices:
+        aprendiz.programa = instance
+    indice.indexar_lote(aprendices)
+    instance._nombre_original = instance.nombre
+
+
+@receiver(pre_delete, sender=Programa)
+def recordar_aprendices_del_programa(sender, instance, **kwargs):
+    # SET_NULL vacía Aprendiz.programa con update(), que no emite señales: se
+    # guardan los ids antes para reindexarlos sin el nombre del programa
+    if indice.disponible():
+        instance._aprendices_a_reindexar = list(
+            Aprendiz.objects.filter(programa=instance).values_list('pk', flat=True)
+        )
+
+
+@receiver(post_delete, sender=Programa)
+def reindexar_aprendices_sin_programa(sender, instance, **kwargs):
+    ids = getattr(instance, '_aprendices_a_reindexar', None)
+    if not ids:
+        return
+    indice.indexar_lote(Aprendiz.objects.filter(pk__in=ids).only(
+        'documento_identidad', 'nombre', 'apellido', 'ciudad', 'correo', 'programa',
+    ))
@@ -0,0 +1,27 @@
+from django.http import HttpResponse
+from django.template import loader
+
+from . import indice
+
+
+def buscar(request):
+    consulta = request.GET.get('q', '').strip()
+    try:
+        pagina = max(int(request.GET.get('pagina', 1)), 1)
+    except ValueError:
+        pagina = 1
+
+    resultados, hay_mas = [], False
+    if consulta and indice.disponible():
+        resultados, hay_mas = indice.buscar(consulta, pagina)
+
+    template = loader.get_template('buscar.html')
+    context = {
+        'consulta': consulta,
+        'resultados': resultados,
+        'pagina': pagina,
+        'pagina_anterior': pagina - 1 if pagina > 1 else None,
+        'pagina_siguiente': pagina + 1 if hay_mas else None,
+        'busqueda_disponible': indice.disponible(),
+    }
+    return HttpResponse(template.render(context, request))
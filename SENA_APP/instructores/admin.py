@@ -1,5 +1,13 @@
 from django.contrib import admin
+
+from busqueda.claves import BusquedaPorClaveMixin
+
 from .models import Instructor
 
 # Register your models here.
-admin.site.register(Instructor)
\ No newline at end of file
+@admin.register(Instructor)
+class InstructorAdmin(BusquedaPorClaveMixin, admin.ModelAdmin):
+    # search_fields habilita el buscador (autocomplete) en los formularios de
+    # cursos; '=' exacto por índice único, '^' prefijo de la clave normalizada
+    search_fields = ['=documento_identidad', '^clave_nombre', '^clave_apellido']
+    ordering = ['apellido', 'nombre', 'id']
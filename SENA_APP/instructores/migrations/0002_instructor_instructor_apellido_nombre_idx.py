@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('instructores', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='instructor',
+            index=models.Index(fields=['apellido', 'nombre', 'id'], name='instructor_apellido_nombre_idx'),
+        ),
+    ]
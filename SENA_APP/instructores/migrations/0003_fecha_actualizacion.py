@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('instructores', '0002_instructor_instructor_apellido_nombre_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='instructor',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
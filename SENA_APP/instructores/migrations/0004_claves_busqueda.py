@@ -0,0 +1,31 @@
+# Generated by Django 5.1.6 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('instructores', '0003_fecha_actualizacion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='instructor',
+            name='clave_apellido',
+            field=models.CharField(blank=True, editable=False, max_length=201),
+        ),
+        migrations.AddField(
+            model_name='instructor',
+            name='clave_nombre',
+            field=models.CharField(blank=True, editable=False, max_length=201),
+        ),
+        migrations.AddIndex(
+            model_name='instructor',
+            index=models.Index(fields=['clave_nombre'], name='instructor_clave_nombre_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='instructor',
+            index=models.Index(fields=['clave_apellido'], name='instructor_clave_apellido_idx'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+import re
+import unicodedata
+
+from django.db import migrations, transaction
+
+# Copia de la normalización de busqueda/ y del recorrido por lotes de
+# SENA_APP/derivados.py al crear esta migración, para que su resultado no
+# cambie si esos módulos cambian después
+TAMANO_LOTE = 2000
+
+
+def clave(*partes):
+    texto = unicodedata.normalize('NFKD', ' '.join(parte for parte in partes if parte))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return re.sub(r'\s+', ' ', texto).strip().lower()
+
+
+def completar_claves(modelo, derivados, calcular):
+    """
+    Recalcula los campos de `derivados` ({campo: campos de origen}) por lotes
+    de id; solo escribe las filas que cambian.
+    """
+    destinos = list(derivados)
+    origenes = {origen for campos in derivados.values() for origen in campos}
+    ultimo = 0
+    while True:
+        lote = list(modelo.objects.filter(id__gt=ultimo).order_by('id').only(*origenes, *destinos)[:TAMANO_LOTE])
+        if not lote:
+            return
+        ultimo = lote[-1].id
+        cambiados = []
+        for objeto in lote:
+            anteriores = [getattr(objeto, destino) for destino in destinos]
+            calcular(objeto)
+            if [getattr(objeto, destino) for destino in destinos] != anteriores:
+                cambiados.append(objeto)
+        with transaction.atomic():
+            modelo.objects.bulk_update(cambiados, destinos)
+
+
+PERSONA = {'clave_nombre': ('nombre', 'apellido'), 'clave_apellido': ('nombre', 'apellido')}
+
+
+def persona(objeto):
+    objeto.clave_nombre = clave(objeto.nombre, objeto.apellido)
+    objeto.clave_apellido = clave(objeto.apellido, objeto.nombre)
+
+
+def completar(apps, schema_editor):
+    completar_claves(apps.get_model('instructores', 'Instructor'), PERSONA, persona)
+
+
+class Migration(migrations.Migration):
+    # Sin transacción global: cada lote se confirma por separado y, si la
+    # migración se interrumpe, al repetirla solo se escriben las filas pendientes
+    atomic = False
+
+    dependencies = [
+        ('instructores', '0004_claves_busqueda'),
+    ]
+
+    operations = [
+        migrations.RunPython(completar, migrations.RunPython.noop),
+    ]
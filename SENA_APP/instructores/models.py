@@ -1,5 +1,8 @@
 from django.db import models
 
+from busqueda.claves import claves_persona
+from SENA_APP.derivados import campos_a_guardar
+
 # Create your models here.
 class Instructor(models.Model):
     TIPO_DOCUMENTO_CHOICES = [
@@ -32,10 +35,33 @@ class Instructor(models.Model):
     anos_experiencia = models.PositiveIntegerField()
     activo = models.BooleanField(default=True)
     fecha_vinculacion = models.DateField()
+    # Nombre normalizado en los dos órdenes para buscar por prefijo en el admin,
+    # calculado en save() (ver busqueda/claves.py)
+    clave_nombre = models.CharField(max_length=201, blank=True, editable=False)
+    clave_apellido = models.CharField(max_length=201, blank=True, editable=False)
     fecha_registro = models.DateTimeField(auto_now_add=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    # Campos calculados en save() -> campos de los que se calculan
+    DERIVADOS = {'clave_nombre': ('nombre', 'apellido'), 'clave_apellido': ('nombre', 'apellido')}
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['apellido', 'nombre', 'id'], name='instructor_apellido_nombre_idx'),
+            models.Index(fields=['clave_nombre'], name='instructor_clave_nombre_idx'),
+            models.Index(fields=['clave_apellido'], name='instructor_clave_apellido_idx'),
+        ]
     
     def __str__(self):
         return f"{self.nombre} {self.apellido} - {self.especialidad}"
     
     def nombre_completo(self):
-        return f"{self.nombre} {self.apellido}"
\ No newline at end of file
+        return f"{self.nombre} {self.apellido}"
+
+    def calcular_claves(self):
+        self.clave_nombre, self.clave_apellido = claves_persona(self.nombre, self.apellido)
+
+    def save(self, *args, **kwargs):
+        self.calcular_claves()
+        kwargs['update_fields'] = campos_a_guardar(kwargs.get('update_fields'), self.DERIVADOS)
+        super().save(*args, **kwargs)
\ No newline at end of file
@@ -1,3 +1,24 @@
 from django.test import TestCase
 
-# Create your tests here.
+from aprendices.models import InstructorCurso
+from SENA_APP.pruebas import PresupuestoConsultasMixin, crear_curso, crear_instructor
+
+
+class PresupuestoConsultasTests(PresupuestoConsultasMixin, TestCase):
+
+    def test_lista_instructores(self):
+        def preparar(cantidad):
+            for _ in range(cantidad):
+                crear_instructor()
+
+        self.assertConsultasConstantes('instructores:lista_instructores', preparar)
+
+    def test_detalle_instructor(self):
+        def preparar(cantidad):
+            instructor = crear_instructor()
+            for _ in range(cantidad):
+                crear_curso(instructor_coordinador=instructor)
+                InstructorCurso.objects.create(instructor=instructor, curso=crear_curso(), rol="Instructor técnico")
+            return [instructor.pk]
+
+        self.assertConsultasConstantes('instructores:detalle_instructor', preparar)
@@ -7,25 +7,33 @@ from instructores.forms import InstructorForm
 from django.views import generic
 from django.contrib import messages
 from django.views.generic import FormView
+from SENA_APP.condicional import detalle_condicional
+from SENA_APP.paginacion import paginar, total_aproximado
 
 
 
 # Create your views here.
 
 def instructores(request):
-    lista_instructores = Instructor.objects.all().order_by('apellido', 'nombre')
+    pagina = paginar(request, Instructor.objects.all(), ['apellido', 'nombre', 'id'])
     template = loader.get_template('lista_instructores.html')
     context = {
-    'lista_instructores': lista_instructores,
-    'total_instructores': lista_instructores.count(),
+    'lista_instructores': pagina.objetos,
+    'pagina': pagina,
+    'total_instructores': total_aproximado(Instructor.objects.all(), 'instructores'),
     }
     
     return HttpResponse(template.render(context, request))
 
+def marca_instructor(instructor_id):
+    return Instructor.objects.filter(pk=instructor_id).values_list('fecha_actualizacion', flat=True).first()
+
+
+@detalle_condicional(marca_instructor)
 def detalle_instructor(request, instructor_id):
     instructor = get_object_or_404(Instructor, id=instructor_id)
-    cursos_coordinados = instructor.cursos_coordinados.all()
-    cursos_impartidos = instructor.cursos_impartidos.all()
+    cursos_coordinados = instructor.cursos_coordinados.only('codigo', 'nombre', 'fecha_inicio', 'fecha_fin', 'instructor_coordinador')
+    cursos_impartidos = instructor.cursos_impartidos.only('codigo', 'nombre', 'fecha_inicio', 'fecha_fin')
     template = loader.get_template('detalle_instructor.html')
     
     context = {
@@ -2,4 +2,8 @@ from django.contrib import admin
 from .models import Programa
 
 # Register your models here.
-admin.site.register(Programa)
\ No newline at end of file
+@admin.register(Programa)
+class ProgramaAdmin(admin.ModelAdmin):
+    # search_fields habilita el buscador (autocomplete) en los formularios de cursos
+    search_fields = ['codigo', 'nombre']
+    ordering = ['nombre', 'id']
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('programas', '0003_fecha_actualizacion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='programa',
+            name='descripcion_extracto',
+            field=models.CharField(blank=True, editable=False, max_length=200, verbose_name='Extracto de la descripción'),
+        ),
+    ]
@@ -1,5 +1,8 @@
 from django.db import models
 
+from SENA_APP.derivados import campos_a_guardar
+from SENA_APP.extractos import LONGITUD_EXTRACTO, extracto
+
 class Programa(models.Model):
     NIVEL_FORMACION_CHOICES = [
         ('AUX', 'Auxiliar'),
@@ -30,6 +33,8 @@ class Programa(models.Model):
     duracion_meses = models.PositiveIntegerField(verbose_name="Duración en Meses")
     duracion_horas = models.PositiveIntegerField(verbose_name="Duración en Horas")
     descripcion = models.TextField(verbose_name="Descripción del Programa")
+    # Comienzo de la descripción para el listado, calculado en save()
+    descripcion_extracto = models.CharField(max_length=LONGITUD_EXTRACTO, blank=True, editable=False, verbose_name="Extracto de la descripción")
     competencias = models.TextField(verbose_name="Competencias a Desarrollar")
     perfil_egreso = models.TextField(verbose_name="Perfil de Egreso")
     requisitos_ingreso = models.TextField(verbose_name="Requisitos de Ingreso")
@@ -38,15 +43,37 @@ class Programa(models.Model):
     estado = models.CharField(max_length=3,choices=ESTADO_CHOICES, default='ACT', verbose_name="Estado")
     fecha_creacion = models.DateField(verbose_name="Fecha de Creación del Programa")
     fecha_registro = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Registro")
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name="Última Actualización")
+
+    # Campos calculados en save() -> campos de los que se calculan
+    DERIVADOS = {'descripcion_extracto': ('descripcion',)}
 
     class Meta:
         verbose_name = "Programa de Formación"
         verbose_name_plural = "Programas de Formación"
         ordering = ['nombre']
+        indexes = [
+            models.Index(fields=['nombre', 'id'], name='programa_nombre_idx'),
+        ]
 
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        # Nombre al cargarse: el índice de búsqueda de sus aprendices solo se rehace si cambia
+        instancia._nombre_original = instancia.__dict__.get('nombre')
+        return instancia
+
+    def calcular_extracto(self):
+        self.descripcion_extracto = extracto(self.descripcion)
+
+    def save(self, *args, **kwargs):
+        self.calcular_extracto()
+        kwargs['update_fields'] = campos_a_guardar(kwargs.get('update_fields'), self.DERIVADOS)
+        super().save(*args, **kwargs)
+
     def get_duracion_completa(self):
         return f"{self.duracion_meses} meses ({self.duracion_horas} horas)"
 
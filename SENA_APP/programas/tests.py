@@ -1,3 +1,44 @@
+from django.db import connection
 from django.test import TestCase
 
-# Create your tests here.
+from busqueda import indice
+from SENA_APP.pruebas import PresupuestoConsultasMixin, crear_aprendiz, crear_curso, crear_programa
+
+
+class PresupuestoConsultasTests(PresupuestoConsultasMixin, TestCase):
+
+    def test_lista_programas(self):
+        def preparar(cantidad):
+            for _ in range(cantidad):
+                crear_programa()
+
+        self.assertConsultasConstantes('programas:lista_programas', preparar)
+
+    def test_detalle_programa(self):
+        def preparar(cantidad):
+            programa = crear_programa()
+            for _ in range(cantidad):
+                crear_curso(programa=programa)
+                crear_aprendiz(programa=programa)
+            return [programa.pk]
+
+        self.assertConsultasConstantes('programas:detalle_programa', preparar)
+
+
+class IndiceBusquedaTests(TestCase):
+
+    def contenido(self, aprendiz):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT contenido FROM {indice.TABLA} WHERE rowid = %s',
+                           [indice._rowid('aprendiz', aprendiz.pk)])
+            return cursor.fetchone()[0]
+
+    def test_borrar_el_programa_lo_quita_del_contenido_de_sus_aprendices(self):
+        programa = crear_programa(nombre="Gestión Agropecuaria")
+        aprendiz = crear_aprendiz(programa=programa)
+        self.assertIn("Gestión Agropecuaria", self.contenido(aprendiz))
+
+        programa.delete()
+        aprendiz.refresh_from_db()
+        self.assertIsNone(aprendiz.programa_id)
+        self.assertNotIn("Gestión Agropecuaria", self.contenido(aprendiz))
@@ -1,3 +1,5 @@
+import logging
+
 from django.http import HttpResponse
 from django.template import loader
 from django.shortcuts import get_object_or_404
@@ -6,27 +8,46 @@ from django.urls import reverse_lazy
 from django.views.generic import FormView
 from .models import Programa
 from .forms import ProgramaForm
+from SENA_APP.condicional import detalle_condicional
+from SENA_APP.paginacion import paginar, total_aproximado
+
+logger = logging.getLogger(__name__)
+
+# Columnas que muestra el listado (fecha_actualizacion: versión de la fila
+# cacheada); los textos largos solo se cargan en el detalle
+CAMPOS_LISTA = (
+    'codigo', 'nombre', 'descripcion_extracto', 'nivel_formacion', 'modalidad', 'duracion_meses',
+    'duracion_horas', 'centro_formacion', 'regional', 'fecha_actualizacion',
+)
 
 
 # Create your views here.
 
 def programas(request):
-    lista_programas = Programa.objects.all()
+    pagina = paginar(request, Programa.objects.only(*CAMPOS_LISTA), ['nombre', 'id'])
     template = loader.get_template('lista_programas.html')
     context = {
-    'lista_programas': lista_programas,
-    'total_programas': lista_programas.count(),
+    'lista_programas': pagina.objetos,
+    'pagina': pagina,
+    'total_programas': total_aproximado(Programa.objects.all(), 'programas'),
     }
     return HttpResponse(template.render(context, request))
 
+def marca_programa(programa_id):
+    return Programa.objects.filter(pk=programa_id).values_list('fecha_actualizacion', flat=True).first()
+
+
+@detalle_condicional(marca_programa)
 def detalle_programa(request, programa_id):
     programa = get_object_or_404(Programa, id=programa_id)
-    cursos = programa.curso_set.all().order_by('-fecha_inicio')
+    cursos = programa.curso_set.only('codigo', 'nombre', 'fecha_inicio', 'programa').order_by('-fecha_inicio')
     template = loader.get_template('detalle_programa.html')
     
     context = {
         'programa': programa,
         'cursos': cursos,
+        # Conteo sobre el índice de aprendices.programa_id
+        'total_aprendices': programa.aprendices.count(),
     }
     
     return HttpResponse(template.render(context, request))
@@ -41,46 +62,19 @@ class AgregarProgramaView(FormView):
         context['title'] = 'Agregar Programa de Formación'
         return context
     
-    def post(self, request, *args, **kwargs):
-        print("=== POST REQUEST RECIBIDO ===")
-        print(f"POST data: {request.POST}")
-        print(f"FILES data: {request.FILES}")
-        return super().post(request, *args, **kwargs)
-    
     def form_valid(self, form):
-        print("=== FORMULARIO VÁLIDO ===")
-        print(f"Cleaned data: {form.cleaned_data}")
-        
         try:
-            # Intentar guardar
             programa = form.save()
-            print(f"=== PROGRAMA GUARDADO EXITOSAMENTE ===")
-            print(f"ID del programa: {programa.id}")
-            print(f"Nombre del programa: {programa.nombre}")
-            
-            messages.success(self.request, 'Programa agregado exitosamente.')
-            return super().form_valid(form)
         except Exception as e:
-            print(f"=== ERROR AL GUARDAR ===")
-            print(f"Error: {str(e)}")
-            print(f"Tipo de error: {type(e)}")
-            
-            # Agregar más detalles del error
-            import traceback
-            print(f"Traceback completo: {traceback.format_exc()}")
-            
+            logger.exception("Error al guardar el programa")
             messages.error(self.request, f'Error al guardar el programa: {str(e)}')
             return self.form_invalid(form)
+        logger.info("Programa %s creado: %s", programa.pk, programa.nombre)
+        messages.success(self.request, 'Programa agregado exitosamente.')
+        return super().form_valid(form)
     
     def form_invalid(self, form):
-        print("=== FORMULARIO INVÁLIDO ===")
-        print(f"Errores del formulario: {form.errors}")
-        print(f"Errores no de campo: {form.non_field_errors()}")
-        
-        # Mostrar qué campos tienen errores
-        for field, errors in form.errors.items():
-            print(f"Campo '{field}': {errors}")
-        
+        logger.info("Formulario de programa inválido: %s", form.errors.as_json())
         messages.error(self.request, 'Por favor, corrija los errores en el formulario.')
         return super().form_invalid(form)
 
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('proyectos', '0002_alter_proyecto_presupuesto_estimado'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='proyecto',
+            index=models.Index(fields=['-fecha_creacion', '-id'], name='proyecto_fecha_creacion_idx'),
+        ),
+    ]
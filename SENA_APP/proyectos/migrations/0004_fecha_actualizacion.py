@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('proyectos', '0003_proyecto_proyecto_fecha_creacion_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proyecto',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True, verbose_name='Última Actualización'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations, transaction
+from django.utils.text import Truncator
+
+# Copia de SENA_APP/extractos.py y del recorrido por lotes de
+# SENA_APP/derivados.py al crear esta migración, para que su resultado no
+# cambie si esos módulos cambian después
+TAMANO_LOTE = 2000
+LONGITUD_EXTRACTO = 200
+
+
+def completar_extractos(modelo, origen):
+    """Recalcula descripcion_extracto por lotes de id; solo escribe las filas que cambian."""
+    ultimo = 0
+    while True:
+        lote = list(modelo.objects.filter(id__gt=ultimo).order_by('id').only(origen, 'descripcion_extracto')[:TAMANO_LOTE])
+        if not lote:
+            return
+        ultimo = lote[-1].id
+        cambiados = []
+        for objeto in lote:
+            extracto = Truncator(getattr(objeto, origen) or '').chars(LONGITUD_EXTRACTO)
+            if extracto != objeto.descripcion_extracto:
+                objeto.descripcion_extracto = extracto
+                cambiados.append(objeto)
+        with transaction.atomic():
+            modelo.objects.bulk_update(cambiados, ['descripcion_extracto'])
+
+
+def completar(apps, schema_editor):
+    completar_extractos(apps.get_model('proyectos', 'Proyecto'), 'descripcion_detallada')
+
+
+class Migration(migrations.Migration):
+    # Sin transacción global: cada lote se confirma por separado y, si la
+    # migración se interrumpe, al repetirla solo se escriben las filas pendientes
+    atomic = False
+
+    dependencies = [
+        ('proyectos', '0005_descripcion_extracto'),
+    ]
+
+    operations = [
+        migrations.RunPython(completar, migrations.RunPython.noop),
+    ]
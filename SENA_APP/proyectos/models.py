@@ -1,8 +1,13 @@
 from django.db import models
 
+from SENA_APP.derivados import campos_a_guardar
+from SENA_APP.extractos import LONGITUD_EXTRACTO, extracto
+
 class Proyecto(models.Model):
     titulo = models.CharField(max_length=255, verbose_name="Título del Proyecto")
     descripcion_detallada = models.TextField(verbose_name="Descripción detallada")
+    # Comienzo de la descripción para el listado, calculado en save()
+    descripcion_extracto = models.CharField(max_length=LONGITUD_EXTRACTO, blank=True, editable=False, verbose_name="Extracto de la descripción")
     area_proponente = models.CharField(max_length=255, verbose_name="Área proponente")
     responsable = models.CharField(max_length=255, verbose_name="Responsable del proyecto")
     objetivos_generales = models.TextField(verbose_name="Objetivos generales")
@@ -14,11 +19,26 @@ class Proyecto(models.Model):
     beneficiarios_esperados = models.TextField(verbose_name="Beneficiarios esperados")
     indicadores_exito = models.TextField(verbose_name="Indicadores de éxito")
     fecha_creacion = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Creación")
+    fecha_actualizacion = models.DateTimeField(auto_now=True, verbose_name="Última Actualización")
+
+    # Campos calculados en save() -> campos de los que se calculan
+    DERIVADOS = {'descripcion_extracto': ('descripcion_detallada',)}
 
     class Meta:
         verbose_name = "Proyecto"
         verbose_name_plural = "Proyectos"
         ordering = ['-fecha_creacion']
+        indexes = [
+            models.Index(fields=['-fecha_creacion', '-id'], name='proyecto_fecha_creacion_idx'),
+        ]
 
     def __str__(self):
         return self.titulo
+
+    def calcular_extracto(self):
+        self.descripcion_extracto = extracto(self.descripcion_detallada)
+
+    def save(self, *args, **kwargs):
+        self.calcular_extracto()
+        kwargs['update_fields'] = campos_a_guardar(kwargs.get('update_fields'), self.DERIVADOS)
+        super().save(*args, **kwargs)
@@ -1,3 +1,112 @@
-from django.test import TestCase
+import datetime
+from decimal import Decimal
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from SENA_APP.paginacion import paginar_queryset
+from SENA_APP.pruebas import PresupuestoConsultasMixin, crear_proyecto
+
+from .models import Proyecto
+
+ORDEN = ['-fecha_creacion', '-id']
+
+
+def crear_proyectos(cantidad):
+    """
+    Proyectos cuyas fechas de creación difieren solo en microsegundos (varios
+    en el mismo milisegundo), donde un cursor recortado salta o repite filas.
+    """
+    proyectos = Proyecto.objects.bulk_create(
+        Proyecto(
+            titulo=f"Proyecto {numero}", descripcion_detallada="Descripción", area_proponente="Área",
+            responsable="Responsable", objetivos_generales="-", objetivos_especificos="-",
+            alcance_limitaciones="-", presupuesto_estimado=Decimal('1000.00'), cronograma_tentativo="-",
+            recursos_necesarios="-", beneficiarios_esperados="-", indicadores_exito="-",
+        )
+        for numero in range(cantidad)
+    )
+    base = timezone.now().replace(microsecond=0)
+    for numero, proyecto in enumerate(proyectos):
+        proyecto.fecha_creacion = base + datetime.timedelta(microseconds=numero * 137)
+    Proyecto.objects.bulk_update(proyectos, ['fecha_creacion'])
+    return list(Proyecto.objects.order_by(*ORDEN).values_list('pk', flat=True))
+
+
+class PaginacionCursorTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.esperados = crear_proyectos(120)
+
+    def recorrer(self, pedir_pagina):
+        """
+        Recorre hacia adelante hasta la última página y luego hacia atrás
+        hasta la primera. `pedir_pagina(despues, antes)` devuelve
+        (ids, cursor_anterior, cursor_siguiente).
+        """
+        adelante, paginas = [], []
+        ids, anterior, siguiente = pedir_pagina(None, None)
+        # Un cursor mal codificado puede repetir páginas sin fin
+        limite = len(self.esperados) + 1
+        while len(paginas) < limite:
+            adelante.extend(ids)
+            paginas.append(ids)
+            if siguiente is None:
+                break
+            ids, anterior, siguiente = pedir_pagina(siguiente, None)
+
+        atras = [ids]
+        while anterior is not None and len(atras) < limite:
+            ids, anterior, _ = pedir_pagina(None, anterior)
+            atras.append(ids)
+        atras.reverse()
+        return adelante, paginas, atras
+
+    def assertRecorridoCompleto(self, pedir_pagina):
+        adelante, paginas, atras = self.recorrer(pedir_pagina)
+        self.assertEqual(adelante, self.esperados)
+        self.assertEqual(atras, paginas)
+
+    def test_paginar_queryset_con_microsegundos(self):
+        def pedir_pagina(despues, antes):
+            pagina = paginar_queryset(Proyecto.objects.all(), ORDEN, despues=despues, antes=antes, por_pagina=7)
+            return [proyecto.pk for proyecto in pagina], pagina.cursor_anterior, pagina.cursor_siguiente
+
+        self.assertRecorridoCompleto(pedir_pagina)
+
+    @override_settings(PAGINACION_POR_PAGINA=7)
+    def test_lista_proyectos(self):
+        def pedir_pagina(despues, antes):
+            parametros = {'despues': despues} if despues else {'antes': antes} if antes else {}
+            pagina = self.client.get(reverse('proyectos:lista_proyectos'), parametros).context['pagina']
+            return [proyecto.pk for proyecto in pagina], pagina.cursor_anterior, pagina.cursor_siguiente
+
+        self.assertRecorridoCompleto(pedir_pagina)
+
+    def test_api_proyectos(self):
+        def pedir_pagina(despues, antes):
+            url = despues or antes or f"{reverse('api:lista', args=['proyectos'])}?limite=7&fields=id"
+            datos = self.client.get(url).json()
+            return [fila['id'] for fila in datos['resultados']], datos['anterior'], datos['siguiente']
+
+        self.assertRecorridoCompleto(pedir_pagina)
+
+
+class PresupuestoConsultasTests(PresupuestoConsultasMixin, TestCase):
+
+    def test_lista_proyectos(self):
+        def preparar(cantidad):
+            for _ in range(cantidad):
+                crear_proyecto()
+
+        self.assertConsultasConstantes('proyectos:lista_proyectos', preparar)
+
+    def test_detalle_proyecto(self):
+        def preparar(cantidad):
+            for _ in range(cantidad - 1):
+                crear_proyecto()
+            return [crear_proyecto().pk]
+
+        self.assertConsultasConstantes('proyectos:detalle_proyecto', preparar)
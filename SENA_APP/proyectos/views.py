@@ -6,18 +6,33 @@ from django.urls import reverse_lazy
 from django.views.generic import FormView
 from .models import Proyecto
 from .forms import ProyectoForm
+from SENA_APP.condicional import detalle_condicional
+from SENA_APP.paginacion import paginar, total_aproximado
+
+# Columnas que muestra el listado (fecha_actualizacion: versión de la fila
+# cacheada); los textos largos solo se cargan en el detalle
+CAMPOS_LISTA = (
+    'titulo', 'descripcion_extracto', 'area_proponente', 'responsable', 'presupuesto_estimado',
+    'fecha_creacion', 'fecha_actualizacion',
+)
 
 # Create your views here.
 
 def lista_proyectos(request):
-    lista_proyectos = Proyecto.objects.all()
+    pagina = paginar(request, Proyecto.objects.only(*CAMPOS_LISTA), ['-fecha_creacion', '-id'])
     template = loader.get_template('proyectos/lista_proyectos.html')
     context = {
-        'lista_proyectos': lista_proyectos,
-        'total_proyectos': lista_proyectos.count(),
+        'lista_proyectos': pagina.objetos,
+        'pagina': pagina,
+        'total_proyectos': total_aproximado(Proyecto.objects.all(), 'proyectos'),
     }
     return HttpResponse(template.render(context, request))
 
+def marca_proyecto(proyecto_id):
+    return Proyecto.objects.filter(pk=proyecto_id).values_list('fecha_actualizacion', flat=True).first()
+
+
+@detalle_condicional(marca_proyecto)
 def detalle_proyecto(request, proyecto_id):
     proyecto = get_object_or_404(Proyecto, id=proyecto_id)
     template = loader.get_template('proyectos/detalle_proyecto.html')